@@ -1,68 +1,627 @@
-from fastapi import APIRouter, Request
+import asyncio
+import base64
+import binascii
+import functools
+import hashlib
+import os
+import secrets
+import tempfile
+import time
+from fastapi import APIRouter, Request, Response, WebSocket
+from starlette.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
-from app.models import VoiceAnalysisRequest, VoiceAnalysisResponse
-from app.services.integrated_service import integrated_service
+from app.models import (
+    VoiceAnalysisRequest,
+    VoiceAnalysisResponse,
+    BatchVoiceAnalysisRequest,
+    BatchVoiceAnalysisResponse
+)
+from app.services.integrated_service import (
+    analyze_audio_bytes_job,
+    analyze_audio_file_job,
+    analyze_audio_job,
+    analyze_batch_job
+)
+from app.services.analysis_executor import analysis_executor, QueueFullError
+from app.services.analysis_tiers import FULL, tier_selector
+from app.services.result_cache import result_cache, audio_digest, digest_base64, make_cache_key
+from app.services.feature_store import feature_store
+from app.services.live_scorer import LiveVoiceScorer
+from app.services.cascade_service import cascade_service
+from app.services.metrics import metrics
+from app.services.single_flight import single_flight
+from app.services.mp3_header import base64_payload_size, sniff_mp3_base64, sniff_mp3_bytes, sniff_mp3_file
+from app.services.request_body import RequestBodyError, decode_audio_base64, read_voice_request
+from app.services.multipart_upload import iter_multipart_file
 from app.config import settings
 
 router = APIRouter()
 
 SUPPORTED_LANGUAGES = ["Tamil", "English", "Hindi", "Malayalam", "Telugu"]
+RAW_AUDIO_TYPES = ("audio/mpeg", "audio/mp3", "application/octet-stream")
+# JSON / multipart framing and form fields allowed on top of the audio limit
+BODY_OVERHEAD_BYTES = 64 * 1024
 
-@router.post("/api/voice-detection", response_model=VoiceAnalysisResponse)
+
+class UploadTooLargeError(Exception):
+    pass
+
+
+# Open /api/voice-detection/live connections
+_live_sessions = 0
+
+
+def _error(status_code: int, message: str, headers: dict = None) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        headers=headers,
+        content={
+            "status": "error",
+            "message": message
+        }
+    )
+
+
+def _valid_api_key(api_key) -> bool:
+    return bool(api_key) and secrets.compare_digest(api_key.encode(), settings.API_KEY.encode())
+
+
+def _check_api_key(request: Request):
+    """401 response unless the x-api-key header carries the API key; None when it does."""
+    if not _valid_api_key(request.headers.get("x-api-key")):
+        return _error(401, "Invalid API key or malformed request")
+    return None
+
+
+def _busy() -> JSONResponse:
+    return _error(
+        503,
+        "Server is busy, please retry later",
+        headers={"Retry-After": str(settings.ANALYSIS_RETRY_AFTER)}
+    )
+
+
+def _admission_check(size: int, sniff):
+    """
+    Admission control from the MP3 headers, before any decoding:
+    (reason, status code, message) for payloads over MAX_AUDIO_BYTES /
+    MAX_AUDIO_SECONDS or (with REJECT_NON_MP3) not MPEG audio at all; None
+    to go ahead. sniff() returns mp3_header.sniff_mp3's result.
+    """
+    if settings.MAX_AUDIO_BYTES and size > settings.MAX_AUDIO_BYTES:
+        return "size", 413, f"Audio exceeds {settings.MAX_AUDIO_BYTES} bytes"
+    header = sniff()
+    if header is None:
+        if settings.REJECT_NON_MP3:
+            return "not_mp3", 415, "Audio is not MPEG audio (mp3)"
+        return None
+    if settings.MAX_AUDIO_SECONDS and header["duration_us"] > settings.MAX_AUDIO_SECONDS * 1_000_000:
+        return "duration", 413, f"Audio exceeds {settings.MAX_AUDIO_SECONDS:g} seconds"
+    return None
+
+
+def _admission_error(size: int, sniff):
+    """_admission_check as an error response (None to go ahead); rejections are counted."""
+    rejection = _admission_check(size, sniff)
+    if rejection is None:
+        return None
+    reason, status_code, message = rejection
+    metrics.inc("echotrace_admission_rejected_total", reason=reason)
+    return _error(status_code, message)
+
+
+def _batch_admission(audio_base64: str):
+    """
+    _admission_check for one batch item, straight from its base64 payload
+    (only the header quartets are decoded): (error message or None to go
+    ahead, sniffed header or None). Rejections are counted as for single
+    requests.
+    """
+    try:
+        header = sniff_mp3_base64(audio_base64)
+        size = base64_payload_size(audio_base64)
+    except ValueError:
+        # Not plain unwrapped base64: decode it to read the headers
+        try:
+            audio = base64.b64decode(audio_base64)
+        except (binascii.Error, ValueError):
+            return None, None  # undecodable: the worker answers with the safe fallback
+        header, size = sniff_mp3_bytes(audio), len(audio)
+    rejection = _admission_check(size, lambda: header)
+    if rejection is None:
+        return None, header
+    reason, _, message = rejection
+    metrics.inc("echotrace_admission_rejected_total", reason=reason)
+    return message, header
+
+
+def _is_long(header) -> bool:
+    """Whether the sniffed header puts the clip in long-recording mode (audio_analyzer)."""
+    return header is not None and header["duration_us"] > settings.LONG_AUDIO_MIN_SEC * 1_000_000
+
+
+async def _remember(digest: str, cache_key: str, language: str, job: dict):
+    """Cache the answer and store the feature vector of a successful analysis."""
+    # Safe-fallback answers (features is None) are never cached, nor are the
+    # cheaper answers of a degraded tier: the next request may get a full one
+    if digest is None or job["features"] is None or job.get("analysis_tier", FULL) != FULL:
+        return
+    # A cascade escalation that got no answer in time is worth retrying later
+    if job.get("tier") != "local_fallback":
+        result_cache.set(cache_key, job["result"])
+    # Byte-entropy pseudo-features of undecodable clips are not acoustic features:
+    # they would skew a rescore of the corpus
+    if feature_store is not None and job.get("decoder") != "lightweight":
+        # A full buffer is written to disk inside append: keep it off the event loop
+        await run_in_threadpool(feature_store.append, digest, language, job["features"])
+
+
+def _validate_fields(body: VoiceAnalysisRequest):
+    """Returns an error message, or None if the request fields are valid."""
+    empty = not body.audioBase64 or len(body.audioBase64.strip()) == 0
+    return _field_error(body.language, body.audioFormat, empty)
+
+
+def _field_error(language: str, audio_format: str, audio_empty: bool):
+    # Validate language
+    if language not in SUPPORTED_LANGUAGES:
+        return f"Unsupported language. Use one of: {', '.join(SUPPORTED_LANGUAGES)}"
+
+    # Validate audio format
+    if audio_format.lower() != "mp3":
+        return "Audio format must be mp3"
+
+    # Validate audioBase64 not empty
+    if audio_empty:
+        return "audioBase64 cannot be empty"
+
+    return None
+
+
+@router.post(
+    "/api/voice-detection",
+    response_model=VoiceAnalysisResponse,
+    response_model_exclude_none=True,
+    # The body is parsed by hand (request_body), so document it explicitly
+    openapi_extra={"requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": VoiceAnalysisRequest.model_json_schema()}}
+    }}
+)
 async def voice_detection(
     request: Request,
-    body: VoiceAnalysisRequest
+    response: Response
 ):
     """
     Integrated EchoTrace Detection
     Person 2 (audio) → Person 1 (classification) → Person 3 (API)
     """
-    # Validate API key
-    api_key = request.headers.get("x-api-key")
-    if not api_key or api_key != settings.API_KEY:
-        return JSONResponse(
-            status_code=401,
-            content={
-                "status": "error",
-                "message": "Invalid API key or malformed request"
-            }
-        )
+    denied = _check_api_key(request)
+    if denied is not None:
+        return denied
 
-    # Validate language
-    if body.language not in SUPPORTED_LANGUAGES:
-        return JSONResponse(
-            status_code=400,
-            content={
-                "status": "error",
-                "message": f"Unsupported language. Use one of: {', '.join(SUPPORTED_LANGUAGES)}"
-            }
-        )
+    # A body that cannot fit MAX_AUDIO_BYTES of base64 is refused unread
+    try:
+        raw = await _read_json_body(request)
+    except UploadTooLargeError:
+        metrics.inc("echotrace_admission_rejected_total", reason="size")
+        return _error(413, f"Audio exceeds {settings.MAX_AUDIO_BYTES} bytes")
 
-    # Validate audio format
-    if body.audioFormat.lower() != "mp3":
-        return JSONResponse(
-            status_code=400,
-            content={
-                "status": "error",
-                "message": "Audio format must be mp3"
-            }
+    # One pass over the raw body: audioBase64 is located in place, sniffed
+    # from its header quartets, then decoded once; the decoded bytes feed
+    # the digest and the analysis
+    try:
+        body = read_voice_request(raw)
+    except RequestBodyError as e:
+        return _error(422, str(e))
+    language = body["language"]
+
+    message = _field_error(language, body["audioFormat"], False)
+    if message:
+        return _error(400, message)
+
+    # Header sniff: oversized or non-audio payloads stop here, before the decode
+    try:
+        header = sniff_mp3_base64(body["audioBase64"])
+        rejection = _admission_error(base64_payload_size(body["audioBase64"]), lambda: header)
+        sniffed = True
+    except ValueError:
+        rejection, sniffed = None, False  # wrapped base64: sniffed once decoded
+    if rejection is not None:
+        return rejection
+
+    try:
+        audio = decode_audio_base64(body["audioBase64"])
+    except RequestBodyError as e:
+        return _error(422, str(e))
+    if len(audio) == 0:
+        return _error(400, _field_error(language, body["audioFormat"], True))
+    if not sniffed:
+        rejection = _admission_error(len(audio), lambda: sniff_mp3_bytes(audio))
+        if rejection is not None:
+            return rejection
+
+    # Identical audio + language was already analyzed by this pipeline version
+    digest = audio_digest(audio)
+    cache_key = make_cache_key(digest, language)
+    if cache_key is not None:
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            response.headers["X-Analysis-Tier"] = FULL
+            return VoiceAnalysisResponse(**cached, analysisTier=FULL)
+
+    # Call integrated service (Person 2 → Person 1) in the analysis process pool;
+    # in cascade mode ambiguous verdicts are escalated to Gemini
+    async def analyze():
+        # Cheaper analysis while the pool is backed up or slow (analysis_tiers)
+        tier = tier_selector.choose(analysis_executor.queue_depth)
+        started = time.perf_counter()
+        if settings.DETECTION_MODE == "cascade":
+            job = await cascade_service.analyze(audio, language, body["audioFormat"], tier=tier)
+        else:
+            job_fn = analyze_audio_bytes_job if tier == FULL else functools.partial(analyze_audio_bytes_job, tier=tier)
+            job = await analysis_executor.submit_tier(
+                tier,
+                job_fn,
+                audio,
+                language,
+                body["audioFormat"]
+            )
+        # Local analysis time only (no Gemini wait), and only for the full tier:
+        # the cheaper tiers would drag the mean down and flip the tier back and forth
+        local_seconds = job.pop("local_seconds", None) or time.perf_counter() - started
+        if tier == FULL:
+            tier_selector.observe(local_seconds)
+        job.setdefault("analysis_tier", tier)
+        # Once per analysis, however many callers share it
+        metrics.record_job(job)
+        await _remember(digest, cache_key, language, job)
+        return job
+
+    # A retry of a payload that is still being analyzed joins that analysis
+    try:
+        job = await single_flight.run(cache_key, analyze)
+    except QueueFullError:
+        return _busy()
+
+    if job.get("tier"):
+        response.headers["X-Detection-Tier"] = job["tier"]
+    response.headers["X-Analysis-Tier"] = job["analysis_tier"]
+    # Which decoder handled the clip (soundfile / librosa / pydub / lightweight)
+    if job.get("decoder"):
+        response.headers["X-Audio-Decoder"] = job["decoder"]
+    return VoiceAnalysisResponse(**job["result"], analysisTier=job["analysis_tier"])
+
+
+async def _read_json_body(request: Request) -> bytes:
+    """
+    The request body, capped at what MAX_AUDIO_BYTES of base64 plus
+    BODY_OVERHEAD_BYTES can take (no cap when MAX_AUDIO_BYTES is 0).
+    Raises UploadTooLargeError from Content-Length, or as soon as the
+    streamed body passes the cap.
+    """
+    if not settings.MAX_AUDIO_BYTES:
+        return await request.body()
+    limit = -(-settings.MAX_AUDIO_BYTES // 3) * 4 + BODY_OVERHEAD_BYTES
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise UploadTooLargeError()
+    return b"".join([chunk async for chunk in _limit_body(request.stream(), limit)])
+
+
+async def _spool_upload(chunks, spool, hasher):
+    """
+    Copy upload chunks to disk as they arrive, hashing them (in the
+    threadpool, off the event loop); enforces STREAM_MAX_BYTES.
+    """
+    def write(chunk):
+        hasher.update(chunk)
+        spool.write(chunk)
+
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if size > settings.STREAM_MAX_BYTES:
+            raise UploadTooLargeError()
+        await run_in_threadpool(write, chunk)
+    return size
+
+
+async def _limit_body(chunks, max_bytes: int):
+    """Pass raw body chunks through, raising UploadTooLargeError past max_bytes."""
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLargeError()
+        yield chunk
+
+
+def _stream_field_error(language: str, audio_format: str):
+    if language not in SUPPORTED_LANGUAGES:
+        return f"Unsupported language. Use one of: {', '.join(SUPPORTED_LANGUAGES)}"
+    if (audio_format or "").lower() != "mp3":
+        return "Audio format must be mp3"
+    return None
+
+
+@router.post("/api/voice-detection/stream", response_model=VoiceAnalysisResponse, response_model_exclude_none=True)
+async def voice_detection_stream(
+    request: Request,
+    response: Response,
+    language: str = None,
+    audioFormat: str = "mp3"
+):
+    """
+    Streaming EchoTrace Detection
+    Raw audio/mpeg body (language / audioFormat as query parameters) or a
+    multipart form with an "audio" file field. The body is spooled to disk
+    as it arrives (the size limit applies while it streams, in both forms)
+    and decoded + featurized block by block, so neither the request nor
+    the analysis holds the whole clip in memory.
+    """
+    denied = _check_api_key(request)
+    if denied is not None:
+        return denied
+
+    content_type = request.headers.get("content-type", "")
+    fields = None
+    if content_type.split(";")[0].strip().lower() == "multipart/form-data":
+        # Form fields may follow the file part: checked once the upload is spooled
+        fields = {"language": language, "audioFormat": audioFormat}
+        body = _limit_body(request.stream(), settings.STREAM_MAX_BYTES + BODY_OVERHEAD_BYTES)
+        chunks = iter_multipart_file(body, content_type, "audio", fields)
+    elif content_type.split(";")[0].strip().lower() in RAW_AUDIO_TYPES:
+        message = _stream_field_error(language, audioFormat)
+        if message:
+            return _error(400, message)
+        chunks = request.stream()
+    else:
+        return _error(415, "Send audio/mpeg or multipart/form-data")
+
+    # libsndfile needs a seekable source, so the body goes to a temp file
+    hasher = hashlib.blake2b(digest_size=20)
+    spool = tempfile.NamedTemporaryFile(prefix="echotrace-", suffix=".mp3", delete=False)
+    try:
+        try:
+            with spool:
+                size = await _spool_upload(chunks, spool, hasher)
+        except UploadTooLargeError:
+            return _error(413, f"Audio exceeds {settings.STREAM_MAX_BYTES} bytes")
+        except RequestBodyError as e:
+            return _error(400, str(e))
+        if fields is not None:
+            language, audioFormat = fields["language"], fields["audioFormat"]
+            message = _stream_field_error(language, audioFormat)
+            if message:
+                return _error(400, message)
+        if size == 0:
+            return _error(400, "Audio body cannot be empty")
+        rejection = _admission_error(size, lambda: sniff_mp3_file(spool.name))
+        if rejection is not None:
+            return rejection
+
+        digest = hasher.hexdigest()
+        cache_key = make_cache_key(digest, language)
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            response.headers["X-Analysis-Tier"] = FULL
+            return VoiceAnalysisResponse(**cached, analysisTier=FULL)
+
+        try:
+            job = await analysis_executor.submit(analyze_audio_file_job, spool.name, language, audioFormat)
+        except QueueFullError:
+            return _busy()
+    finally:
+        os.unlink(spool.name)
+
+    metrics.record_job(job)
+    await _remember(digest, cache_key, language, job)
+
+    # Uploads are always analyzed at full quality
+    tier = job.get("analysis_tier", FULL)
+    response.headers["X-Analysis-Tier"] = tier
+    if job.get("decoder"):
+        response.headers["X-Audio-Decoder"] = job["decoder"]
+    return VoiceAnalysisResponse(**job["result"], analysisTier=tier)
+
+
+@router.websocket("/api/voice-detection/live")
+async def voice_detection_live(
+    websocket: WebSocket,
+    language: str = None,
+    sampleRate: int = 16000
+):
+    """
+    Live-call EchoTrace Detection
+    Binary messages carry little-endian int16 mono PCM at sampleRate; a
+    verdict (VoiceAnalysisResponse fields + secondsAnalyzed / final) is sent
+    every LIVE_VERDICT_SECONDS of audio. Send the text message "end" to get
+    the final verdict. The API key goes in x-api-key or ?apiKey= (browsers
+    cannot set WebSocket headers).
+    """
+    global _live_sessions
+
+    if not _valid_api_key(websocket.headers.get("x-api-key") or websocket.query_params.get("apiKey")):
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    if _live_sessions >= settings.LIVE_MAX_SESSIONS:
+        await websocket.send_json({"status": "error", "message": "Server is busy, please retry later"})
+        await websocket.close(code=1013)
+        return
+    if language not in SUPPORTED_LANGUAGES or not 8000 <= sampleRate <= 192000:
+        await websocket.send_json({
+            "status": "error",
+            "message": f"Use language one of: {', '.join(SUPPORTED_LANGUAGES)} and sampleRate 8000-192000"
+        })
+        await websocket.close(code=1008)
+        return
+
+    scorer = LiveVoiceScorer(
+        language,
+        sample_rate=sampleRate,
+        verdict_every_sec=settings.LIVE_VERDICT_SECONDS,
+        block_frames=settings.LIVE_BLOCK_FRAMES
+    )
+    _live_sessions += 1
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes"):
+                # Feature work runs off the event loop; numpy releases the GIL
+                for verdict in await run_in_threadpool(scorer.feed, message["bytes"]):
+                    await websocket.send_json(verdict)
+            elif message.get("text", "").strip().lower() == "end":
+                final = await run_in_threadpool(scorer.finish)
+                await websocket.send_json(
+                    final or {"status": "error", "message": "No audio received"}
+                )
+                await websocket.close()
+                return
+    finally:
+        _live_sessions -= 1
+
+
+@router.post(
+    "/api/voice-detection/batch",
+    response_model=BatchVoiceAnalysisResponse,
+    response_model_exclude_none=True
+)
+async def voice_detection_batch(
+    request: Request,
+    body: BatchVoiceAnalysisRequest
+):
+    """
+    Batch EchoTrace Detection
+    Valid clips are sharded across the analysis workers; each shard is
+    decoded, featurized in length buckets and classified in one vectorized
+    call. Clips whose header puts them over LONG_AUDIO_MIN_SEC skip the
+    shards and go to the long-recording path as jobs of their own. Results
+    come back in request order with a per-item status.
+    """
+    denied = _check_api_key(request)
+    if denied is not None:
+        return denied
+
+    if not body.items:
+        return _error(400, "items cannot be empty")
+    if len(body.items) > settings.BATCH_MAX_ITEMS:
+        return _error(400, f"Too many items. Maximum per batch is {settings.BATCH_MAX_ITEMS}")
+
+    results = [None] * len(body.items)
+    digests = {}
+    cache_keys = {}
+    pending = []
+    long_clips = []
+    for index, item in enumerate(body.items):
+        # Same field checks and header admission as a single request, per clip
+        message = _validate_fields(item)
+        header = None
+        if not message:
+            message, header = _batch_admission(item.audioBase64)
+        if message:
+            results[index] = {"index": index, "status": "error", "message": message}
+            continue
+
+        digests[index] = digest_base64(item.audioBase64)
+        cache_keys[index] = (
+            make_cache_key(digests[index], item.language) if digests[index] is not None else None
         )
+        cached = result_cache.get(cache_keys[index]) if cache_keys[index] is not None else None
+        if cached is not None:
+            results[index] = {"index": index, **cached}
+        elif _is_long(header):
+            # Decoding a long recording whole inside a shard would stall its batch
+            long_clips.append(index)
+        else:
+            pending.append(index)
 
-    # Validate audioBase64 not empty
-    if not body.audioBase64 or len(body.audioBase64.strip()) == 0:
-        return JSONResponse(
-            status_code=400,
-            content={
-                "status": "error",
-                "message": "audioBase64 cannot be empty"
-            }
+    if pending or long_clips:
+        free_slots = analysis_executor.free_slots
+        if free_slots == 0:
+            return _busy()
+
+        # Payload size is a cheap duration proxy: contiguous shards of the
+        # size-sorted list give each worker clips of similar length to batch.
+        pending.sort(key=lambda i: len(body.items[i].audioBase64))
+        n_shards = min(len(pending), analysis_executor.max_workers, free_slots)
+        shards = [
+            pending[k * len(pending) // n_shards:(k + 1) * len(pending) // n_shards]
+            for k in range(n_shards)
+        ] + [[index] for index in long_clips]
+
+        shard_results = await asyncio.gather(
+            *(
+                analysis_executor.submit(
+                    analyze_batch_job,
+                    [(body.items[i].audioBase64, body.items[i].language, body.items[i].audioFormat)
+                     for i in shard]
+                )
+                for shard in shards[:n_shards]
+            ),
+            *(
+                analysis_executor.submit(
+                    analyze_audio_job,
+                    body.items[index].audioBase64, body.items[index].language, body.items[index].audioFormat
+                )
+                for index in long_clips
+            ),
+            return_exceptions=True
         )
 
-    # Call integrated service (Person 2 → Person 1)
-    result = integrated_service.analyze_audio_integrated(
-        audio_base64=body.audioBase64,
-        language=body.language,
-        audio_format=body.audioFormat
-    )
+        for shard, outcome in zip(shards, shard_results):
+            if isinstance(outcome, Exception):
+                message = (
+                    "Server is busy, please retry later"
+                    if isinstance(outcome, QueueFullError)
+                    else f"Analysis error: {str(outcome)}"
+                )
+                entries = [
+                    {"result": {"status": "error", "message": message}, "features": None, "decoder": None}
+                ] * len(shard)
+            elif "items" not in outcome:
+                # A long recording's own analyze_audio_job
+                metrics.record_job(outcome, source="batch")
+                entries = [outcome]
+            else:
+                # Stage timings once per shard, decoder and fallback counters per clip
+                metrics.record_timings(outcome["timings"])
+                entries = outcome["items"]
+                for entry in entries:
+                    metrics.record_job(entry, source="batch")
+            for index, entry in zip(shard, entries):
+                results[index] = {"index": index, **entry["result"]}
+                await _remember(digests[index], cache_keys[index], body.items[index].language, entry)
+
+    return BatchVoiceAnalysisResponse(status="success", results=results)
+
+
+@router.get("/api/cache/stats")
+def cache_stats(request: Request):
+    """Result cache hit/miss counters and size, plus in-flight request coalescing."""
+    denied = _check_api_key(request)
+    if denied is not None:
+        return denied
+    return {**result_cache.stats(), "single_flight": single_flight.stats()}
+
+
+@router.get("/api/cascade/stats")
+def cascade_stats(request: Request):
+    """Cascade escalation rate and per-tier latency."""
+    denied = _check_api_key(request)
+    if denied is not None:
+        return denied
+    return cascade_service.stats.snapshot()
+
 
-    return VoiceAnalysisResponse(**result)
+@router.get("/api/analysis/tiers")
+def analysis_tier_stats(request: Request):
+    """Load-adaptive quality tiers chosen so far and the recent analysis latency they react to."""
+    denied = _check_api_key(request)
+    if denied is not None:
+        return denied
+    return tier_selector.stats()
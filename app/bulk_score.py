@@ -0,0 +1,253 @@
+"""
+Offline bulk scoring of archived audio files, without the HTTP API.
+
+    python -m app.bulk_score <dir | manifest.txt | manifest.csv> --output results.jsonl
+        [--language English] [--pattern *.mp3] [--workers N] [--chunk-size 16]
+
+Inputs: a directory (walked recursively for --pattern) or a manifest with
+one `path` or `path,language` per line (relative paths are relative to the
+manifest). Each file is memory-mapped in a worker process and run through
+the same pipeline as the API (analyze_audio + classify_voice). Files are
+sent to the pool in chunks of --chunk-size, and rows are appended to the
+output (.jsonl or .csv) as chunks finish.
+
+Resumable: paths already scored in the output are skipped, so an
+interrupted run continues where it stopped; "error" and "fallback" rows
+(the safe fallback answered) are retried and appended again. Results are
+looked up in and written to the server's result cache under the local
+detection mode (RESULT_CACHE_BACKEND=sqlite shares them with a running
+API in local mode; the default in-memory cache only de-duplicates within
+a worker).
+"""
+import argparse
+import csv
+import fnmatch
+import json
+import mmap
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from app.config import settings
+
+OUTPUT_FIELDS = (
+    "path", "status", "language", "classification", "confidenceScore",
+    "explanation", "duration_seconds", "decoder", "cached", "message"
+)
+PROGRESS_EVERY_SEC = 2.0
+# Rows a resumed run scores again
+RETRY_STATUSES = ("error", "fallback")
+
+# Per-worker result cache, built on first use in each process
+_cache = None
+
+
+def _worker_cache():
+    global _cache
+    if _cache is None:
+        from app.services.result_cache import create_result_cache
+        _cache = create_result_cache()
+    return _cache
+
+
+def iter_inputs(source: str, language: str, pattern: str = "*.mp3"):
+    """(path, language) pairs from a directory walk or a manifest, in a stable order."""
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(fnmatch.filter(files, pattern)):
+                yield os.path.join(root, name), language
+        return
+
+    base = os.path.dirname(os.path.abspath(source))
+    with open(source, newline="") as f:
+        for row in csv.reader(f):
+            if not row or not row[0].strip() or row[0].startswith("#"):
+                continue
+            path = row[0].strip()
+            if not os.path.isabs(path):
+                path = os.path.join(base, path)
+            yield path, (row[1].strip() if len(row) > 1 and row[1].strip() else language)
+
+
+def score_file(path: str, language: str) -> dict:
+    """One output row for one file (runs in a worker)."""
+    from app.services.integrated_service import integrated_service
+    from app.services.result_cache import audio_digest, make_cache_key
+
+    row = {"path": path, "language": language}
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError("Empty file")
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            with memoryview(mapped) as view:
+                cache = _worker_cache()
+                # Always the local pipeline: never stored as a cascade answer
+                cache_key = make_cache_key(audio_digest(view), language, mode="local")
+                result = cache.get(cache_key)
+                row["cached"] = result is not None
+                if result is None:
+                    job = integrated_service.analyze_audio_bytes_detailed(view, language)
+                    result = job["result"]
+                    if job["features"] is None:
+                        message = "Audio could not be analyzed; fixed fallback verdict"
+                        row.update({"status": "fallback", "message": message})
+                    else:
+                        cache.set(cache_key, result)
+                        row["duration_seconds"] = job["features"].get("duration_seconds")
+                        row["decoder"] = job["decoder"]
+        finally:
+            mapped.close()
+    except Exception as e:
+        # One unreadable or undecodable file must not abort the whole run
+        return {**row, "status": "error", "message": str(e) or type(e).__name__}
+
+    row.setdefault("status", result["status"])
+    row.update({k: result[k] for k in ("language", "classification", "confidenceScore", "explanation")})
+    return row
+
+
+def score_chunk(items) -> list:
+    return [score_file(path, language) for path, language in items]
+
+
+def completed_paths(output: str) -> set:
+    """Paths already scored by a previous (possibly interrupted) run; RETRY_STATUSES rows don't count."""
+    if not os.path.exists(output):
+        return set()
+    done = set()
+    with open(output, newline="") as f:
+        if output.endswith(".csv"):
+            rows = csv.DictReader(f)
+        else:
+            rows = []
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue  # torn last line of an interrupted run
+        done.update(row["path"] for row in rows if row.get("path") and row.get("status") not in RETRY_STATUSES)
+    return done
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+class ResultWriter:
+    """Appends rows to JSONL or CSV, flushed per chunk so progress survives a crash."""
+
+    def __init__(self, output: str):
+        self.csv = output.endswith(".csv")
+        new_file = not os.path.exists(output) or os.path.getsize(output) == 0
+        self._file = open(output, "a", newline="")
+        if not new_file and not _ends_with_newline(output):
+            self._file.write("\n")  # terminate a line torn by an interrupted run
+        if self.csv:
+            self._writer = csv.DictWriter(self._file, fieldnames=OUTPUT_FIELDS, extrasaction="ignore")
+            if new_file:
+                self._writer.writeheader()
+
+    def write(self, rows):
+        for row in rows:
+            if self.csv:
+                self._writer.writerow(row)
+            else:
+                self._file.write(json.dumps(row) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class Progress:
+    """files/sec and audio-seconds/sec, printed to stderr at most every PROGRESS_EVERY_SEC."""
+
+    def __init__(self, total: int, stream=sys.stderr):
+        self.total = total
+        self.stream = stream
+        self.files = 0
+        self.audio_seconds = 0.0
+        self.cached = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+        self._printed = 0.0
+
+    def update(self, rows):
+        for row in rows:
+            self.files += 1
+            self.audio_seconds += row.get("duration_seconds") or 0.0
+            self.cached += int(bool(row.get("cached")))
+            self.errors += int(row["status"] in RETRY_STATUSES)
+        now = time.perf_counter()
+        if now - self._printed >= PROGRESS_EVERY_SEC:
+            self._printed = now
+            self.stream.write(self.line() + "\n")
+            self.stream.flush()
+
+    def line(self) -> str:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return (
+            f"[bulk] {self.files}/{self.total} files  {self.files / elapsed:.1f} files/s  "
+            f"{self.audio_seconds / elapsed:.1f} audio-s/s  cached {self.cached}  errors {self.errors}"
+        )
+
+
+def run(source: str, output: str, language: str = "English", pattern: str = "*.mp3",
+        workers: int = None, chunk_size: int = 16) -> Progress:
+    done = completed_paths(output)
+    todo = [item for item in iter_inputs(source, language, pattern) if item[0] not in done]
+    chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+    workers = workers or settings.ANALYSIS_WORKERS or os.cpu_count() or 1
+
+    progress = Progress(len(todo))
+    if done:
+        sys.stderr.write(f"[bulk] resuming: {len(done)} files already in {output}\n")
+    writer = ResultWriter(output)
+    try:
+        from app.services.analysis_executor import warm_up_worker
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=warm_up_worker) as pool:
+            # At most two chunks per worker in flight: bounded memory for any input size
+            pending = set()
+            queue = iter(chunks)
+            for chunk in queue:
+                pending.add(pool.submit(score_chunk, chunk))
+                if len(pending) >= 2 * workers:
+                    break
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    rows = future.result()
+                    writer.write(rows)
+                    progress.update(rows)
+                    chunk = next(queue, None)
+                    if chunk is not None:
+                        pending.add(pool.submit(score_chunk, chunk))
+    finally:
+        writer.close()
+    return progress
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("source", help="Directory to walk, or a manifest of paths")
+    parser.add_argument("--output", required=True, help="Results file (.jsonl or .csv), appended to")
+    parser.add_argument("--language", default="English", help="Language for files without one in the manifest")
+    parser.add_argument("--pattern", default="*.mp3", help="File pattern when walking a directory")
+    parser.add_argument("--workers", type=int, help="Worker processes (default ANALYSIS_WORKERS / CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=16, help="Files per work unit")
+    args = parser.parse_args(argv)
+
+    progress = run(args.source, args.output, args.language, args.pattern, args.workers, args.chunk_size)
+    print(progress.line())
+    return 1 if progress.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
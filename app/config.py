@@ -6,6 +6,102 @@ load_dotenv()
 class Settings:
     API_KEY: str = os.getenv("API_KEY", "your-secret-api-key-here")
     GEMINI_API_KEY: str = os.getenv("GEMINI_API_KEY")
+
+    # Gemini client: per-call deadline, in-flight cap, hedge delay (0 = off), circuit breaker
+    GEMINI_TIMEOUT: float = float(os.getenv("GEMINI_TIMEOUT", "8"))
+    GEMINI_MAX_CONCURRENCY: int = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+    GEMINI_HEDGE_AFTER: float = float(os.getenv("GEMINI_HEDGE_AFTER", "0"))
+    GEMINI_BREAKER_WINDOW: int = int(os.getenv("GEMINI_BREAKER_WINDOW", "20"))
+    GEMINI_BREAKER_ERROR_RATE: float = float(os.getenv("GEMINI_BREAKER_ERROR_RATE", "0.5"))
+    GEMINI_BREAKER_COOLDOWN: float = float(os.getenv("GEMINI_BREAKER_COOLDOWN", "30"))
+
+    # Pitch estimator backend: pyin (default) / pyin_speech / yin
+    PITCH_BACKEND: str = os.getenv("PITCH_BACKEND", "pyin")
+
+    # Voice-activity gating: pitch, onset strength and MFCC run on voiced frames only
+    # (RMS threshold, 0 = the pause feature's silence threshold; hangover after speech in ms;
+    # optional zero-crossing-rate cap, 0 = off)
+    VAD_ENABLED: bool = os.getenv("VAD_ENABLED", "true").lower() == "true"
+    VAD_RMS_THRESHOLD: float = float(os.getenv("VAD_RMS_THRESHOLD", "0"))
+    VAD_HANGOVER_MS: float = float(os.getenv("VAD_HANGOVER_MS", "200"))
+    VAD_ZCR_MAX: float = float(os.getenv("VAD_ZCR_MAX", "0"))
+
+    # Load-adaptive quality tiers (analysis_tiers.py): queue depth / mean recent analysis
+    # latency (ms, over the last ANALYSIS_TIER_WINDOW) at which requests are served by the
+    # reduced or minimal tier (0 = trigger off, the default: degradation is opt-in);
+    # what the reduced tier analyzes
+    ANALYSIS_TIER_REDUCED_QUEUE: int = int(os.getenv("ANALYSIS_TIER_REDUCED_QUEUE", "0"))
+    ANALYSIS_TIER_MINIMAL_QUEUE: int = int(os.getenv("ANALYSIS_TIER_MINIMAL_QUEUE", "0"))
+    ANALYSIS_TIER_REDUCED_MS: float = float(os.getenv("ANALYSIS_TIER_REDUCED_MS", "0"))
+    ANALYSIS_TIER_MINIMAL_MS: float = float(os.getenv("ANALYSIS_TIER_MINIMAL_MS", "0"))
+    ANALYSIS_TIER_WINDOW: int = int(os.getenv("ANALYSIS_TIER_WINDOW", "20"))
+    REDUCED_TIER_SECONDS: float = float(os.getenv("REDUCED_TIER_SECONDS", "10"))
+    REDUCED_TIER_PITCH_BACKEND: str = os.getenv("REDUCED_TIER_PITCH_BACKEND", "yin")
+
+    # Analysis process pool (0 workers = one per CPU core)
+    ANALYSIS_WORKERS: int = int(os.getenv("ANALYSIS_WORKERS", "0"))
+    ANALYSIS_QUEUE_SIZE: int = int(os.getenv("ANALYSIS_QUEUE_SIZE", "32"))
+    ANALYSIS_RETRY_AFTER: int = int(os.getenv("ANALYSIS_RETRY_AFTER", "2"))
+    # Pre-JIT librosa's numba kernels in each worker and in the API process at startup
+    ANALYSIS_WARMUP: bool = os.getenv("ANALYSIS_WARMUP", "true").lower() == "true"
+
+    # Result cache: memory / sqlite / none
+    RESULT_CACHE_BACKEND: str = os.getenv("RESULT_CACHE_BACKEND", "memory")
+    RESULT_CACHE_PATH: str = os.getenv("RESULT_CACHE_PATH", "cache/results.sqlite3")
+    RESULT_CACHE_MAX_ENTRIES: int = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "10000"))
+    RESULT_CACHE_MAX_BYTES: int = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+    RESULT_CACHE_TTL: float = float(os.getenv("RESULT_CACHE_TTL", "86400"))
+
+    # Feature store (re-scoring without re-extraction)
+    FEATURE_STORE_ENABLED: bool = os.getenv("FEATURE_STORE_ENABLED", "false").lower() == "true"
+    FEATURE_STORE_DIR: str = os.getenv("FEATURE_STORE_DIR", "cache/features")
+    FEATURE_STORE_FLUSH_ROWS: int = int(os.getenv("FEATURE_STORE_FLUSH_ROWS", "256"))
+
+    # Detection mode for /api/voice-detection: local (rules only) or cascade
+    # (rules first, Gemini only for ambiguous clips within the budget in seconds)
+    DETECTION_MODE: str = os.getenv("DETECTION_MODE", "local")
+    CASCADE_GEMINI_BUDGET: float = float(os.getenv("CASCADE_GEMINI_BUDGET", "4"))
+
+    # Batch endpoint
+    BATCH_MAX_ITEMS: int = int(os.getenv("BATCH_MAX_ITEMS", "100"))
+
+    # Pitch temporal consistency: chunk length (s) and overlap between chunks (fraction, 0 to <1)
+    TEMPORAL_CHUNK_SEC: float = float(os.getenv("TEMPORAL_CHUNK_SEC", "1.5"))
+    TEMPORAL_CHUNK_OVERLAP: float = float(os.getenv("TEMPORAL_CHUNK_OVERLAP", "0"))
+    # Per-chunk pitch variances in features["pitch_profile"] (scores every chunk, no early exit)
+    PITCH_PROFILE_ENABLED: bool = os.getenv("PITCH_PROFILE_ENABLED", "false").lower() == "true"
+
+    # Admission control from the MP3 headers, before any decoding (0 = no limit):
+    # decoded payload size, header-estimated duration, and whether non-MPEG payloads get 415
+    MAX_AUDIO_BYTES: int = int(os.getenv("MAX_AUDIO_BYTES", "0"))
+    MAX_AUDIO_SECONDS: float = float(os.getenv("MAX_AUDIO_SECONDS", "0"))
+    REJECT_NON_MP3: bool = os.getenv("REJECT_NON_MP3", "false").lower() == "true"
+
+    # Long recordings: above LONG_AUDIO_MIN_SEC only a sample of speech segments is analyzed
+    # (at most LONG_AUDIO_MAX_SEGMENTS x LONG_AUDIO_SEGMENT_SEC, chosen from the first LONG_AUDIO_MAX_SEC)
+    LONG_AUDIO_MIN_SEC: float = float(os.getenv("LONG_AUDIO_MIN_SEC", "120"))
+    LONG_AUDIO_MAX_SEC: float = float(os.getenv("LONG_AUDIO_MAX_SEC", "3600"))
+    LONG_AUDIO_SEGMENT_SEC: float = float(os.getenv("LONG_AUDIO_SEGMENT_SEC", "10"))
+    LONG_AUDIO_MAX_SEGMENTS: int = int(os.getenv("LONG_AUDIO_MAX_SEGMENTS", "8"))
+
+    # Streaming uploads (/api/voice-detection/stream)
+    STREAM_MAX_BYTES: int = int(os.getenv("STREAM_MAX_BYTES", str(50 * 1024 * 1024)))
+    STREAM_BLOCK_FRAMES: int = int(os.getenv("STREAM_BLOCK_FRAMES", "256"))
+
+    # Live-call scoring (/api/voice-detection/live WebSocket)
+    LIVE_VERDICT_SECONDS: float = float(os.getenv("LIVE_VERDICT_SECONDS", "2.0"))
+    LIVE_BLOCK_FRAMES: int = int(os.getenv("LIVE_BLOCK_FRAMES", "32"))
+    LIVE_MAX_SESSIONS: int = int(os.getenv("LIVE_MAX_SESSIONS", "16"))
+
+    # Decode buffers kept for reuse (app.services.buffer_pool): total budget, split evenly
+    # between the API process and the analysis workers
+    BUFFER_POOL_MAX_BYTES: int = int(os.getenv("BUFFER_POOL_MAX_BYTES", str(32 * 1024 * 1024)))
+
+    # Slow-request profiler: analysis jobs slower than PROFILE_SLOW_MS print their
+    # hottest stacks (0 = off); PROFILE_SAMPLE_RATE of jobs are sampled every PROFILE_INTERVAL_MS
+    PROFILE_SLOW_MS: float = float(os.getenv("PROFILE_SLOW_MS", "0"))
+    PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "1.0"))
+    PROFILE_INTERVAL_MS: float = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
     
     # Validate required keys
     @classmethod
@@ -13,5 +109,5 @@ class Settings:
         if not cls.GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY not found in environment variables")
 
-settings = Settings()
-settings.validate()
\ No newline at end of file
+# validate() runs at app startup (app.main lifespan), not at import
+settings = Settings()
\ No newline at end of file
@@ -0,0 +1,30 @@
+"""
+Deferred imports for heavy third-party modules.
+
+librosa (numba, scipy), soundfile, soxr and google.generativeai take most of
+the API's cold start. lazy_import returns a module object whose real import
+runs on first attribute access, so `import app.main` stays cheap and the
+cost moves to the background warm-up (app.services.warmup) or the first
+request that needs it.
+"""
+import importlib
+import importlib.util
+import sys
+
+
+def lazy_import(name: str):
+    """Module `name`, loaded on first attribute access (importlib LazyLoader)."""
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        # Not installed: fail at import like a plain `import` would
+        return importlib.import_module(name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -1,11 +1,35 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.api.routes import router
+from app.config import settings
+from app.services.analysis_executor import analysis_executor
+from app.services.feature_store import feature_store
+from app.services.metrics import metrics
+from app.services.warmup import readiness
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings.validate()
+    # Heavy imports, numba JIT and worker start-up happen after the server is
+    # already answering /health; /ready reports when they are done
+    warm_up = asyncio.create_task(readiness.warm_up(analysis_executor))
+    yield
+    warm_up.cancel()
+    # Stop analysis worker processes with the server
+    analysis_executor.shutdown()
+    if feature_store is not None:
+        feature_store.flush()
 
 app = FastAPI(
     title="EchoTrace Voice Analysis API",
     version="1.0.0",
-    description="Backend service for detecting Human vs AI-generated voices"
+    description="Backend service for detecting Human vs AI-generated voices",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -17,6 +41,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    # Route template, not the raw path, keeps label cardinality bounded
+    route = request.scope.get("route")
+    metrics.observe(
+        "echotrace_request_seconds",
+        time.perf_counter() - started,
+        route=getattr(route, "path", "unmatched"),
+        status=str(response.status_code)
+    )
+    return response
+
 # Include API routes
 app.include_router(router)
 
@@ -27,14 +65,28 @@ def root():
         "version": "1.0.0",
         "endpoints": {
             "/analyze": "POST - Analyze voice audio",
-            "/health": "GET - Health check"
+            "/health": "GET - Health check",
+            "/ready": "GET - Readiness (warm-up finished)",
+            "/metrics": "GET - Prometheus metrics"
         }
     }
 
 @app.get("/health")
 def health_check():
+    """Liveness: the process is up (it may still be warming up)."""
     return {"status": "healthy", "service": "voice-analysis-api"}
 
+@app.get("/ready")
+def readiness_check():
+    """Readiness: 200 once the warm-up finished, 503 before."""
+    report = readiness.report()
+    return JSONResponse(status_code=200 if readiness.ready else 503, content=report)
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Stage latency histograms and fallback counters (Prometheus text format)."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
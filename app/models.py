@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic import BaseModel
 
 class VoiceAnalysisRequest(BaseModel):
@@ -5,13 +6,38 @@ class VoiceAnalysisRequest(BaseModel):
     audioFormat: str  # Always mp3
     audioBase64: str  # Base64-encoded MP3 audio
 
+class SegmentVerdict(BaseModel):
+    start: float  # Segment start, seconds from the beginning of the recording
+    end: float  # Segment end, seconds
+    classification: str  # AI_GENERATED / HUMAN
+    confidenceScore: float  # 0.0 to 1.0
+
 class VoiceAnalysisResponse(BaseModel):
     status: str  # "success"
     language: str  # Tamil / English / Hindi / Malayalam / Telugu
     classification: str  # AI_GENERATED / HUMAN
     confidenceScore: float  # 0.0 to 1.0
     explanation: str  # Short reason for the decision
+    segments: Optional[List[SegmentVerdict]] = None  # Long recordings only: sampled segments
+    analysisTier: Optional[str] = None  # full / reduced / minimal: the quality tier that answered
 
 class ErrorResponse(BaseModel):
     status: str  # "error"
-    message: str  # Error message
\ No newline at end of file
+    message: str  # Error message
+
+class BatchVoiceAnalysisRequest(BaseModel):
+    items: List[VoiceAnalysisRequest]  # Clips to analyze, results keep this order
+
+class BatchItemResult(BaseModel):
+    index: int  # Position of the clip in the request
+    status: str  # "success" / "error"
+    language: Optional[str] = None
+    classification: Optional[str] = None
+    confidenceScore: Optional[float] = None
+    explanation: Optional[str] = None
+    segments: Optional[List[SegmentVerdict]] = None  # Long recordings only: sampled segments
+    message: Optional[str] = None  # Error message when status is "error"
+
+class BatchVoiceAnalysisResponse(BaseModel):
+    status: str  # "success"
+    results: List[BatchItemResult]
@@ -0,0 +1,136 @@
+"""
+Process pool for the CPU-bound analysis pipeline.
+Keeps librosa decoding / pyin / MFCC work off the uvicorn event loop.
+"""
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.services.analysis_tiers import MINIMAL
+
+
+class QueueFullError(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+
+class WorkerCrashedError(QueueFullError):
+    """
+    Raised when a worker process died under a job (e.g. OOM). The pool is
+    replaced, so callers treat it like QueueFullError: answer 503 and let
+    the client retry.
+    """
+
+
+def warm_up_worker():
+    """
+    Worker initializer: import librosa and run the feature pipeline once on
+    a short synthetic clip so numba kernels are compiled before real traffic.
+    """
+    if not settings.ANALYSIS_WARMUP:
+        return
+    from app.services.warmup import prejit
+
+    try:
+        prejit()
+    except Exception:
+        pass
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+class AnalysisExecutor:
+    """
+    Bounded front for a ProcessPoolExecutor.
+    At most max_workers jobs run and max_queue more wait; beyond that
+    submit() raises QueueFullError so the API can answer 503 immediately.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = None
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Jobs running or waiting for a worker."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting for a free worker."""
+        return max(0, self._in_flight - self.max_workers)
+
+    @property
+    def free_slots(self) -> int:
+        """Jobs that can still be submitted without QueueFullError."""
+        return max(0, self.max_workers + self.max_queue - self._in_flight)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=warm_up_worker
+            )
+        return self._pool
+
+    async def submit(self, fn, *args):
+        """Run fn(*args) in a worker process and await its result."""
+        if self._in_flight >= self.max_workers + self.max_queue:
+            raise QueueFullError("Analysis queue is full")
+
+        self._in_flight += 1
+        pool = self._get_pool()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(pool, fn, *args)
+        except BrokenProcessPool as e:
+            # A worker died (e.g. OOM): retire that pool and let the next job start
+            # a fresh one. Jobs of the same dead pool fail later too, and must not
+            # retire a pool that already replaced it.
+            if self._pool is pool:
+                self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise WorkerCrashedError("Analysis worker crashed") from e
+        finally:
+            self._in_flight -= 1
+
+    async def submit_tier(self, tier: str, fn, *args):
+        """
+        submit() for an analysis of the given quality tier (analysis_tiers).
+        The minimal tier (byte-level features, nothing decoded) runs in the
+        API process's threadpool instead: it is chosen when the pool is
+        backed up, and behind the queued jobs it would get no relief.
+        """
+        if tier == MINIMAL:
+            return await run_in_threadpool(fn, *args)
+        return await self.submit(fn, *args)
+
+    async def start_workers(self):
+        """
+        Start every worker process (each runs warm_up_worker) by sending one
+        no-op job per worker; used by the startup warm-up.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        await asyncio.gather(*(
+            loop.run_in_executor(pool, _worker_ready) for _ in range(self.max_workers)
+        ))
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Singleton instance
+analysis_executor = AnalysisExecutor(
+    max_workers=settings.ANALYSIS_WORKERS or os.cpu_count() or 1,
+    max_queue=settings.ANALYSIS_QUEUE_SIZE
+)
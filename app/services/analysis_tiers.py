@@ -0,0 +1,79 @@
+"""
+Load-adaptive quality tiers for /api/voice-detection.
+
+  full     the complete pipeline (analyze_audio)
+  reduced  only the first REDUCED_TIER_SECONDS, pitch from
+           REDUCED_TIER_PITCH_BACKEND (yin), no pitch temporal profile
+  minimal  byte-level lightweight_audio_features, no decoding at all
+
+Under a burst a slightly cheaper answer beats a timeout or a 503.
+TierSelector picks the tier of each request from the analysis queue depth
+and the mean wall time of recent full-tier local analyses (queue wait
+included; the cheaper tiers and the cascade's Gemini wait would blur it),
+each checked against its own thresholds; a threshold of 0 disables that
+trigger. Samples older than LATENCY_MAX_AGE_SEC are dropped: while every
+request is degraded no full-tier samples arrive, and a stale window would
+otherwise keep the service degraded for good. Degraded answers are neither
+cached nor stored as features.
+"""
+import time
+from collections import deque
+
+from app.config import settings
+
+FULL = "full"
+REDUCED = "reduced"
+MINIMAL = "minimal"
+TIERS = (FULL, REDUCED, MINIMAL)
+
+# Latency samples older than this no longer count
+LATENCY_MAX_AGE_SEC = 30.0
+
+
+def _over(value: float, threshold: float) -> bool:
+    return threshold > 0 and value >= threshold
+
+
+class TierSelector:
+    def __init__(self, reduced_queue: int = None, minimal_queue: int = None,
+                 reduced_ms: float = None, minimal_ms: float = None, window: int = None,
+                 clock=time.monotonic):
+        self.reduced_queue = settings.ANALYSIS_TIER_REDUCED_QUEUE if reduced_queue is None else reduced_queue
+        self.minimal_queue = settings.ANALYSIS_TIER_MINIMAL_QUEUE if minimal_queue is None else minimal_queue
+        self.reduced_ms = settings.ANALYSIS_TIER_REDUCED_MS if reduced_ms is None else reduced_ms
+        self.minimal_ms = settings.ANALYSIS_TIER_MINIMAL_MS if minimal_ms is None else minimal_ms
+        self._clock = clock
+        self._latencies = deque(maxlen=window or settings.ANALYSIS_TIER_WINDOW)  # (observed_at, seconds)
+        self.chosen = dict.fromkeys(TIERS, 0)
+
+    def recent_latency_ms(self) -> float:
+        """Mean wall time of the last `window` full-tier analyses, in ms (0 without recent samples)."""
+        cutoff = self._clock() - LATENCY_MAX_AGE_SEC
+        while self._latencies and self._latencies[0][0] < cutoff:
+            self._latencies.popleft()
+        if not self._latencies:
+            return 0.0
+        return 1000.0 * sum(seconds for _, seconds in self._latencies) / len(self._latencies)
+
+    def choose(self, queue_depth: int) -> str:
+        """Tier for the next analysis, given the jobs waiting for a worker."""
+        latency_ms = self.recent_latency_ms()
+        if _over(queue_depth, self.minimal_queue) or _over(latency_ms, self.minimal_ms):
+            tier = MINIMAL
+        elif _over(queue_depth, self.reduced_queue) or _over(latency_ms, self.reduced_ms):
+            tier = REDUCED
+        else:
+            tier = FULL
+        self.chosen[tier] += 1
+        return tier
+
+    def observe(self, seconds: float):
+        """Record the wall time of a finished full-tier local analysis."""
+        self._latencies.append((self._clock(), seconds))
+
+    def stats(self) -> dict:
+        return {"recent_latency_ms": round(self.recent_latency_ms(), 1), "chosen": dict(self.chosen)}
+
+
+# Singleton instance
+tier_selector = TierSelector()
@@ -1,25 +1,225 @@
-from .audio_decoder import decode_base64_audio
-from .feature_extractor import extract_voice_features
+from contextlib import ExitStack
+
+from app.config import settings
+from .audio_decoder import (
+    BytesReader,
+    b64decode_audio,
+    decode_audio,
+    iter_decoded_blocks,
+    pooled_b64decode,
+    probe_duration
+)
+from .feature_extractor import extract_voice_features, extract_voice_features_batch, bucket_by_length
 from .language_handler import validate_language
-from .temporal_analyzer import pitch_temporal_consistency
-from .lightweight_fallback import lightweight_audio_features
+from .temporal_analyzer import pitch_temporal_consistency, pitch_temporal_profile
+from .pitch_analyzer import track_pitch
+from .lightweight_fallback import lightweight_audio_features, lightweight_audio_features_batch
+from .stream_extractor import StreamingFeatureExtractor
+from .long_audio import analyze_long_audio
+from .metrics import stage
+from .spectral import SpectralContext
+from .vad import voiced_frames
+from .mp3_header import sniff_mp3_bytes, sniff_mp3_file
+from .analysis_tiers import FULL, MINIMAL, REDUCED
+
+
+def analyze_audio(audio_base64: str, language: str, audio_format: str = "mp3", tier: str = FULL):
+    """
+    tier: "full", "reduced" or "minimal" quality (analysis_tiers); the
+    result's "tier" says which one ran.
+    """
+    lang = validate_language(language)
+
+    # The decoded bytes live in a pooled buffer until the analysis is done
+    with ExitStack() as stack:
+        with stage("decode"):
+            audio_bytes = stack.enter_context(pooled_b64decode(audio_base64))
+        return analyze_audio_bytes(audio_bytes, lang, audio_format, tier)
 
 
-def analyze_audio(audio_base64: str, language: str, audio_format: str = "mp3"):
+def analyze_audio_bytes(audio_bytes, language: str, audio_format: str = "mp3", tier: str = FULL):
+    """analyze_audio for already-decoded bytes (any bytes-like object, not copied)."""
     lang = validate_language(language)
 
-    y, sr = decode_base64_audio(audio_base64, audio_format)
+    # Minimal tier: byte-level features only, nothing is decoded
+    if tier == MINIMAL:
+        with stage("lightweight"):
+            features = lightweight_audio_features(audio_bytes)
+        return {"language": lang, "features": features, "decoder": "lightweight", "tier": tier}
+
+    # Frame headers only: duration up front, and whether this is MPEG audio at all
+    header = sniff_mp3_bytes(audio_bytes)
+
+    # ✅ CASE 0: Long recording → sampled speech segments, never fully decoded
+    # (the reduced tier reads too little of the clip for this to pay off)
+    if tier == FULL:
+        long_result = _analyze_if_long(lambda: BytesReader(audio_bytes), lang, header)
+        if long_result is not None:
+            return long_result
+
+    with stage("decode"):
+        # Not MPEG: libsndfile still recognises WAV / FLAC / OGG by their own
+        # headers, but the audioread and ffmpeg fallbacks would only burn time
+        decoders = None if header is not None else ("soundfile",)
+        # Reduced tier: only the start of the clip is decoded and analyzed
+        max_seconds = settings.REDUCED_TIER_SECONDS if tier == REDUCED else None
+        y, sr, decoder = decode_audio(audio_bytes, audio_format, decoders=decoders, max_seconds=max_seconds)
 
     # ✅ CASE 1: Real waveform available
     if y is not None:
-        features = extract_voice_features(y, sr)
-        features["pitch_consistency"] = pitch_temporal_consistency(y, sr)
+        # One framing for the whole clip: the voiced-frame mask comes from the
+        # same frames and RMS the spectral features use, and gates the pitch track too
+        with stage("vad"):
+            spectral = SpectralContext(y, sr)
+            voiced = voiced_frames(spectral.rms, sr, spectral.frames)
+        # Single pyin pass shared by both pitch-based features (a fast backend in the reduced tier)
+        with stage("pitch"):
+            backend = settings.REDUCED_TIER_PITCH_BACKEND if tier == REDUCED else None
+            pitch_track = track_pitch(y, sr, backend=backend, voiced=voiced)
+        with stage("features"):
+            features = extract_voice_features(y, sr, pitch_track=pitch_track, voiced=voiced, spectral=spectral)
+        if tier == FULL:
+            with stage("temporal"):
+                _add_temporal_profile(features, y, sr, pitch_track)
 
     # ✅ CASE 2: Decoder unavailable → byte-level inference
     else:
-        features = lightweight_audio_features(audio_base64)
+        with stage("lightweight"):
+            features = lightweight_audio_features(audio_bytes)
 
     return {
         "language": lang,
-        "features": features
+        "features": features,
+        "decoder": decoder or "lightweight",
+        "tier": tier
     }
+
+
+def _analyze_if_long(open_source, lang: str, header=None):
+    """
+    Long-recording mode (app.services.long_audio) when the header says the
+    clip is longer than LONG_AUDIO_MIN_SEC; None for short clips. A long
+    clip is never handed back to the full decode: when no sample can be
+    read it raises ValueError and the safe fallback answers.
+    header: sniff_mp3 result, if any (otherwise libsndfile reads the duration).
+    """
+    if header is not None:
+        duration = header["duration_us"] / 1e6
+    else:
+        duration = probe_duration(open_source())
+    if duration is None or duration <= settings.LONG_AUDIO_MIN_SEC:
+        return None
+    try:
+        with stage("long_audio"):
+            result = analyze_long_audio(open_source, duration)
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Long recording could not be sampled: {e}") from e
+    return {
+        "language": lang,
+        "features": result["features"],
+        "segments": result["segments"],
+        "decoder": "soundfile-long"
+    }
+
+
+def _add_temporal_profile(features: dict, y, sr, pitch_track):
+    if not settings.PITCH_PROFILE_ENABLED:
+        # Verdict only: stops scoring chunks once it is decided
+        features["pitch_consistency"] = pitch_temporal_consistency(y, sr, pitch_track=pitch_track)
+        return
+    # Verdict plus the per-chunk variances it was computed from
+    profile = pitch_temporal_profile(y, sr, pitch_track=pitch_track)
+    features["pitch_consistency"] = profile["verdict"]
+    features["pitch_profile"] = profile["chunks"]
+
+
+def analyze_audio_file(path: str, language: str, audio_format: str = "mp3"):
+    """
+    analyze_audio for an uploaded file on disk, decoded and featurized block
+    by block (StreamingFeatureExtractor), so memory is bounded by one block
+    rather than by clip length. Same return shape as analyze_audio.
+    """
+    lang = validate_language(language)
+
+    long_result = _analyze_if_long(lambda: path, lang, sniff_mp3_file(path))
+    if long_result is not None:
+        return long_result
+
+    try:
+        with stage("stream_features"):
+            extractor = StreamingFeatureExtractor(block_frames=settings.STREAM_BLOCK_FRAMES)
+            for block in iter_decoded_blocks(path):
+                extractor.push(block)
+            features = extractor.finalize()
+        decoder = "soundfile-stream"
+    except Exception:
+        # Not decodable in-process → byte-level inference, as in analyze_audio
+        with open(path, "rb") as f:
+            features = lightweight_audio_features(f.read())
+        decoder = "lightweight"
+
+    return {
+        "language": lang,
+        "features": features,
+        "decoder": decoder
+    }
+
+
+def analyze_audio_batch(items):
+    """
+    Batch form of analyze_audio over (audio_base64, language, audio_format) tuples.
+    Decoded clips are bucketed by length and featurized together
+    (extract_voice_features_batch). Returns one entry per item, in order:
+    {"language", "features", "decoder"} or {"error": message}.
+    """
+    results = [None] * len(items)
+    decoded = {}
+    undecodable = {}
+
+    for i, (audio_base64, language, audio_format) in enumerate(items):
+        try:
+            lang = validate_language(language)
+            with stage("decode"):
+                audio_bytes = b64decode_audio(audio_base64)
+                # Not MPEG: only libsndfile is worth trying, as in analyze_audio_bytes
+                decoders = None if sniff_mp3_bytes(audio_bytes) is not None else ("soundfile",)
+                y, sr, decoder = decode_audio(audio_bytes, audio_format, decoders=decoders)
+        except ValueError as e:
+            results[i] = {"error": str(e)}
+            continue
+
+        if y is not None:
+            decoded[i] = (lang, y, sr, decoder)
+        else:
+            undecodable[i] = (lang, audio_bytes)
+
+    # Decoder unavailable → byte-level inference, as in analyze_audio (one vectorized pass)
+    with stage("lightweight"):
+        fallback = lightweight_audio_features_batch([audio_bytes for _, audio_bytes in undecodable.values()])
+    for i, features in zip(undecodable, fallback):
+        results[i] = {"language": undecodable[i][0], "features": features, "decoder": "lightweight"}
+
+    indices = list(decoded)
+    for bucket in bucket_by_length([len(decoded[i][1]) for i in indices]):
+        members = [indices[j] for j in bucket]
+        ys = [decoded[i][1] for i in members]
+        sr = decoded[members[0]][2]
+        try:
+            with stage("pitch"):
+                pitch_tracks = [track_pitch(y, sr) for y in ys]
+            with stage("features"):
+                features = extract_voice_features_batch(ys, sr, pitch_tracks=pitch_tracks)
+            with stage("temporal"):
+                for f, y, track in zip(features, ys, pitch_tracks):
+                    _add_temporal_profile(f, y, sr, track)
+        except Exception as e:
+            for i in members:
+                results[i] = {"error": f"Analysis error: {str(e)}"}
+            continue
+
+        for i, f in zip(members, features):
+            results[i] = {"language": decoded[i][0], "features": f, "decoder": decoded[i][3]}
+
+    return results
@@ -1,23 +1,259 @@
-def decode_base64_audio(audio_base64: str, audio_format: str = "mp3", sr: int = 16000):
+import base64
+import binascii
+import io
+from contextlib import contextmanager
+
+import numpy as np
+
+from app.lazy import lazy_import
+from .buffer_pool import buffer_pool
+
+sf = lazy_import("soundfile")
+soxr = lazy_import("soxr")
+librosa = lazy_import("librosa")
+
+# Blocks read per soundfile call while downmixing into the output buffer
+DECODE_BLOCK_FRAMES = 65536
+# base64 characters per a2b_base64 call when decoding into a pooled buffer
+B64_CHUNK_CHARS = 4 * 16384
+
+
+class BytesReader(io.RawIOBase):
     """
-    Decode base64 audio into waveform.
-    If decoding fails (no ffmpeg), return None instead of crashing.
+    Seekable read-only file over a bytes-like object, without the copy
+    io.BytesIO makes of non-bytes input. soundfile reads through readinto(),
+    straight into libsndfile's buffer.
     """
+
+    def __init__(self, data):
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buf):
+        n = min(len(buf), len(self._view) - self._pos)
+        if n <= 0:
+            return 0
+        buf[:n] = self._view[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+
+def b64decode_audio(audio_base64: str) -> bytes:
+    """Decode the base64 payload; raises ValueError on empty or invalid input."""
     if not audio_base64:
         raise ValueError("Empty audio_base64 provided")
 
     try:
-        audio_bytes = base64.b64decode(audio_base64)
-    except Exception as e:
+        return base64.b64decode(audio_base64)
+    except (binascii.Error, ValueError) as e:
         raise ValueError("Invalid base64 audio data") from e
 
-    # Try librosa byte stream
-    try:
-        return _load_with_librosa_bytestream(audio_bytes, sr=sr)
-    except Exception:
-        # Try pydub only if ffmpeg exists
+
+@contextmanager
+def pooled_b64decode(audio_base64):
+    """
+    b64decode_audio into a pooled buffer (app.services.buffer_pool): yields a
+    read-only memoryview of the decoded bytes that is only valid inside the
+    with block. Decodes B64_CHUNK_CHARS at a time, so no payload-sized bytes
+    object is created; raises ValueError like b64decode_audio.
+    """
+    if not audio_base64:
+        raise ValueError("Empty audio_base64 provided")
+
+    with buffer_pool.lease(3 * (len(audio_base64) // 4) + 3) as buf:
+        out = memoryview(buf)
+        try:
+            n = _b64decode_into(audio_base64, out)
+        except (binascii.Error, ValueError):
+            # Chunks must hold whole quartets: line-wrapped or otherwise unusual
+            # payloads go through the one-shot decoder (which validates too)
+            decoded = b64decode_audio(audio_base64)
+            n = len(decoded)
+            out[:n] = decoded
+        yield out[:n].toreadonly()
+
+
+def _b64decode_into(audio_base64, out: memoryview) -> int:
+    pos = 0
+    for start in range(0, len(audio_base64), B64_CHUNK_CHARS):
+        chunk = binascii.a2b_base64(audio_base64[start:start + B64_CHUNK_CHARS])
+        out[pos:pos + len(chunk)] = chunk
+        pos += len(chunk)
+    return pos
+
+
+def decode_audio(audio_bytes: bytes, audio_format: str = "mp3", sr: int = 16000, decoders=None,
+                 max_seconds: float = None):
+    """
+    Decode audio bytes into a mono float32 waveform at `sr`.
+    Tries, in order:
+      - soundfile: in-process libsndfile (MP3 via mpg123), one soxr resample
+      - librosa: librosa.load on a byte stream (may fall back to audioread)
+      - pydub: ffmpeg subprocess re-encode to WAV, then librosa
+    decoders: optional subset of those names to try (e.g. only "soundfile"
+    for payloads the MP3 header sniff did not recognise).
+    max_seconds: keep only the start of the clip; soundfile stops reading
+    there, the other decoders decode everything and are trimmed.
+    Returns (y, sr, decoder_name), or (None, None, None) if every decoder
+    failed (graceful degradation: caller switches to byte-level features).
+    """
+    chain = (
+        ("soundfile", _load_with_soundfile),
+        ("librosa", _load_with_librosa_bytestream),
+        ("pydub", _load_with_pydub_and_librosa),
+    )
+    for name, loader in chain:
+        if decoders is not None and name not in decoders:
+            continue
         try:
-            return _load_with_pydub_and_librosa(audio_bytes, sr=sr, src_format=audio_format)
+            if max_seconds is not None and name == "soundfile":
+                y, out_sr = read_segment(BytesReader(audio_bytes), 0.0, max_seconds, sr), sr
+            else:
+                y, out_sr = loader(audio_bytes, sr=sr, src_format=audio_format)
         except Exception:
-            # ❗ IMPORTANT: graceful degradation
-            return None, None
+            continue
+        if y is not None and len(y) > 0:
+            if max_seconds is not None:
+                y = y[:int(max_seconds * out_sr)]
+            return y, out_sr, name
+    return None, None, None
+
+
+def decode_base64_audio(audio_base64: str, audio_format: str = "mp3", sr: int = 16000):
+    """
+    Decode base64 audio into waveform.
+    If decoding fails (no ffmpeg), return None instead of crashing.
+    """
+    with pooled_b64decode(audio_base64) as audio_bytes:
+        y, out_sr, _ = decode_audio(audio_bytes, audio_format, sr)
+    return y, out_sr
+
+
+def iter_decoded_blocks(source, sr: int = 16000, block_frames: int = DECODE_BLOCK_FRAMES):
+    """
+    Incrementally decode a file path / file object with soundfile.
+    Yields mono float32 blocks at `sr` (streaming soxr resampler), so only
+    one block of decoded audio is alive at a time. Raises if libsndfile
+    cannot open the input.
+    """
+    with sf.SoundFile(source) as f:
+        native_sr = f.samplerate
+        resampler = None
+        if native_sr != sr:
+            resampler = soxr.ResampleStream(native_sr, sr, 1, dtype="float32", quality="HQ")
+
+        while True:
+            block = f.read(block_frames, dtype="float32", always_2d=True)
+            last = len(block) == 0
+            mono = block[:, 0] if block.shape[1] == 1 else np.mean(block, axis=1, dtype=np.float32)
+            if resampler is not None:
+                mono = resampler.resample_chunk(mono, last=last)
+            if len(mono) > 0:
+                yield mono
+            if last:
+                break
+
+
+def probe_duration(source):
+    """Duration in seconds from the file header (libsndfile); None if it can't be read."""
+    try:
+        info = sf.info(source)
+    except Exception:
+        return None
+    finally:
+        if hasattr(source, "seek"):
+            source.seek(0)
+    return info.frames / float(info.samplerate) if info.samplerate else None
+
+
+def read_segment(source, start_sec: float, seconds: float, sr: int = 16000) -> np.ndarray:
+    """
+    Decode only [start_sec, start_sec + seconds) of a file path / file object:
+    seek in the compressed stream, read, downmix, resample to `sr`.
+    """
+    with sf.SoundFile(source) as f:
+        native_sr = f.samplerate
+        f.seek(min(int(start_sec * native_sr), max(f.frames - 1, 0)))
+        block = f.read(int(seconds * native_sr), dtype="float32", always_2d=True)
+    mono = block[:, 0] if block.shape[1] == 1 else np.mean(block, axis=1, dtype=np.float32)
+    if native_sr != sr and len(mono) > 0:
+        mono = soxr.resample(mono, native_sr, sr, quality="HQ")
+    return np.ascontiguousarray(mono, dtype=np.float32)
+
+
+def _load_with_soundfile(audio_bytes: bytes, sr: int, src_format: str = "mp3"):
+    """
+    In-process decode: libsndfile writes float32 blocks into a pooled scratch
+    buffer, they are downmixed straight into one mono buffer, then a single
+    soxr pass resamples to the target rate (same "HQ" quality as librosa's
+    default). When resampling, the mono buffer is pooled too; only the
+    returned waveform is a fresh allocation.
+    """
+    with sf.SoundFile(BytesReader(audio_bytes)) as f:
+        native_sr = f.samplerate
+        n_frames = max(f.frames, 1)
+        if native_sr == sr:
+            # mono is returned as-is: it must outlive the pool lease
+            return _read_mono(f, np.empty(n_frames, dtype=np.float32)), sr
+        with buffer_pool.lease_array(n_frames) as scratch:
+            mono = _read_mono(f, scratch)
+            y = soxr.resample(mono, native_sr, sr, quality="HQ")
+
+    # Same output length as librosa.resample (ceil), so both paths agree
+    n_out = int(np.ceil(len(mono) * sr / native_sr))
+    y = np.pad(y, (0, max(0, n_out - len(y))))[:n_out]
+    return np.ascontiguousarray(y, dtype=np.float32), sr
+
+
+def _read_mono(f, mono: np.ndarray) -> np.ndarray:
+    """Downmix every block of an open SoundFile into mono (grown if needed); returns the filled part."""
+    pos = 0
+    with buffer_pool.lease_array((DECODE_BLOCK_FRAMES, f.channels)) as block_buf:
+        # f.read() in a loop rather than f.blocks(): blocks() trusts the (estimated)
+        # MP3 frame count and can pad the tail
+        while True:
+            block = f.read(dtype="float32", always_2d=True, out=block_buf)
+            n = len(block)
+            if n == 0:
+                break
+            if pos + n > len(mono):
+                # MP3 frame counts can be estimates; grow (off-pool) instead of failing
+                grown = np.empty(max(pos + n, 2 * len(mono)), dtype=np.float32)
+                grown[:pos] = mono[:pos]
+                mono = grown
+            if block.shape[1] == 1:
+                mono[pos:pos + n] = block[:, 0]
+            else:
+                np.mean(block, axis=1, out=mono[pos:pos + n])
+            pos += n
+    return mono[:pos]
+
+
+def _load_with_librosa_bytestream(audio_bytes: bytes, sr: int, src_format: str = "mp3"):
+    y, out_sr = librosa.load(io.BytesIO(audio_bytes), sr=sr, mono=True)
+    return y, out_sr
+
+
+def _load_with_pydub_and_librosa(audio_bytes: bytes, sr: int, src_format: str = "mp3"):
+    # Needs ffmpeg on PATH; imported lazily so the dependency stays optional
+    from pydub import AudioSegment
+
+    segment = AudioSegment.from_file(io.BytesIO(audio_bytes), format=src_format)
+    wav = io.BytesIO()
+    segment.export(wav, format="wav")
+    wav.seek(0)
+    return _load_with_librosa_bytestream(wav.read(), sr=sr)
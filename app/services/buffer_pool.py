@@ -0,0 +1,95 @@
+"""
+Reusable byte buffers for the decode path.
+
+Every request used to allocate a fresh payload-sized bytes object for the
+base64 decode and fresh float32 arrays for the soundfile read; under
+concurrency that churns the allocator and spikes RSS. BufferPool keeps
+released bytearrays per size class and hands them back out, so a steady stream of similar-sized
+requests stops allocating. Size classes are 1/8 of a power of two apart,
+so a buffer is at most 12.5% larger than asked for.
+
+BUFFER_POOL_MAX_BYTES is the budget of the whole deployment: each process
+(the API and every analysis worker) retains at most its even share.
+
+Buffers are only valid inside lease(): callers must not keep views of
+one past it.
+"""
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+from app.config import settings
+
+MIN_BUFFER_BYTES = 4096
+
+
+def size_class(nbytes: int) -> int:
+    """Round nbytes up to the next size class (1/8-power-of-two steps)."""
+    step = 1 << max(MIN_BUFFER_BYTES.bit_length() - 1, nbytes.bit_length() - 3)
+    return max(MIN_BUFFER_BYTES, -(-nbytes // step) * step)
+
+
+class BufferPool:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._free = {}  # size class -> [bytearray]
+        self.retained = 0
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self, nbytes: int) -> bytearray:
+        size = size_class(nbytes)
+        with self._lock:
+            free = self._free.get(size)
+            if free:
+                self.hits += 1
+                self.retained -= size
+                return free.pop()
+            self.misses += 1
+        return bytearray(size)
+
+    def release(self, buf: bytearray):
+        with self._lock:
+            if self.retained + len(buf) > self.max_bytes:
+                return  # over budget: let it be freed
+            self._free.setdefault(len(buf), []).append(buf)
+            self.retained += len(buf)
+
+    @contextmanager
+    def lease(self, nbytes: int):
+        """A bytearray of at least nbytes, returned to the pool on exit."""
+        buf = self.acquire(nbytes)
+        try:
+            yield buf
+        finally:
+            self.release(buf)
+
+    @contextmanager
+    def lease_array(self, shape, dtype=np.float32):
+        """A writable (uninitialized) ndarray backed by a pooled buffer."""
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape))
+        with self.lease(max(1, count * dtype.itemsize)) as buf:
+            yield np.frombuffer(buf, dtype=dtype, count=count).reshape(shape)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "retained_bytes": self.retained,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def process_budget() -> int:
+    """This process's share of BUFFER_POOL_MAX_BYTES: API process + one per analysis worker."""
+    processes = 1 + (settings.ANALYSIS_WORKERS or os.cpu_count() or 1)
+    return settings.BUFFER_POOL_MAX_BYTES // processes
+
+
+# Singleton instance
+buffer_pool = BufferPool(process_budget())
@@ -0,0 +1,117 @@
+"""
+Cascade EchoTrace Detection
+Tier 1: local feature rules (classify_voice) in the analysis pool.
+Tier 2: Gemini, only for clips the rules can't call (ai_score == 2, the
+band that otherwise gets the fixed 0.55 answer, or clips the local
+pipeline could not analyze), within a per-request latency budget.
+"""
+import base64
+import functools
+import threading
+import time
+
+from app.config import settings
+from app.services.analysis_executor import analysis_executor
+from app.services.analysis_tiers import FULL
+from app.services.integrated_service import analyze_audio_bytes_job, analyze_audio_job, voice_ai_score
+
+# ai_score at or below / at or above these is answered locally
+DECISIVE_HUMAN_SCORE = 1
+DECISIVE_AI_SCORE = 3
+
+
+class TierStats:
+    """Escalation counters and per-tier latency (count / mean / max)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.escalated = 0
+        self.gemini_answered = 0
+        self._latency = {}  # tier -> [count, total_seconds, max_seconds]
+
+    def observe(self, tier: str, seconds: float):
+        with self._lock:
+            entry = self._latency.setdefault(tier, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    def count(self, escalated: bool, answered: bool):
+        with self._lock:
+            self.requests += 1
+            self.escalated += int(escalated)
+            self.gemini_answered += int(answered)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "escalated": self.escalated,
+                "escalation_rate": round(self.escalated / self.requests, 4) if self.requests else 0.0,
+                "gemini_answered": self.gemini_answered,
+                "latency_ms": {
+                    tier: {
+                        "count": count,
+                        "mean": round(1000 * total / count, 2),
+                        "max": round(1000 * peak, 2)
+                    }
+                    for tier, (count, total, peak) in self._latency.items()
+                }
+            }
+
+
+class CascadeDetectionService:
+    def __init__(self, gemini=None, budget: float = None):
+        self._gemini = gemini
+        self.budget = settings.CASCADE_GEMINI_BUDGET if budget is None else budget
+        self.stats = TierStats()
+
+    @property
+    def gemini(self):
+        # Imported on first escalation so local-only deployments never build a client
+        if self._gemini is None:
+            from app.services.gemini_service import gemini_service
+            self._gemini = gemini_service
+        return self._gemini
+
+    async def analyze(self, audio, language: str, audio_format: str = "mp3", tier: str = FULL) -> dict:
+        """
+        audio is the base64 payload, or the already-decoded bytes; tier is
+        the local analysis quality tier (analysis_tiers).
+        analyze_audio_job's {"result", "features", "decoder"} plus "tier":
+        "local", "gemini" or "local_fallback" (escalation got no answer in
+        time; the ambiguous local verdict stands), and "local_seconds": the
+        wall time of the local analysis alone.
+        Raises QueueFullError (or WorkerCrashedError) like analysis_executor.submit.
+        """
+        started = time.perf_counter()
+        job_fn = analyze_audio_job if isinstance(audio, str) else analyze_audio_bytes_job
+        if tier != FULL:
+            job_fn = functools.partial(job_fn, tier=tier)
+        job = await analysis_executor.submit_tier(tier, job_fn, audio, language, audio_format)
+        job["local_seconds"] = time.perf_counter() - started
+        self.stats.observe("local", job["local_seconds"])
+
+        features = job["features"]
+        if features is not None:
+            score = voice_ai_score(features)
+            if score <= DECISIVE_HUMAN_SCORE or score >= DECISIVE_AI_SCORE:
+                self.stats.count(escalated=False, answered=False)
+                return {**job, "tier": "local"}
+
+        escalated_at = time.perf_counter()
+        # Gemini takes base64: re-encoded only for the clips that get escalated
+        audio_base64 = audio if isinstance(audio, str) else base64.b64encode(audio).decode("ascii")
+        answer = await self.gemini.try_analyze_async(audio_base64, language, timeout=self.budget)
+        self.stats.observe("gemini", time.perf_counter() - escalated_at)
+        self.stats.count(escalated=True, answered=answer is not None)
+
+        if answer is None:
+            # Budget spent or Gemini unavailable: keep the local verdict
+            return {**job, "tier": "local_fallback"}
+        return {**job, "result": answer, "tier": "gemini"}
+
+
+# Singleton instance
+cascade_service = CascadeDetectionService()
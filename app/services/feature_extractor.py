@@ -1,9 +1,29 @@
 # feature_extractor.py
 import numpy as np
-import librosa
 
+from app.config import settings
+from .pitch_analyzer import track_pitch
+from .spectral import HOP_LENGTH, SILENCE_RMS, SpectralContext, mel_power, mfcc, onset_envelope, power_to_db
+from .vad import rms_threshold, voiced_frames
 
-def extract_voice_features(y: np.ndarray, sr: int):
+# Bump whenever feature values can change; keys cached results and stored features
+# 2: voice-activity gating of pitch, rhythm and spectral features (vad.py)
+FEATURE_PIPELINE_VERSION = "2"
+
+
+def feature_settings_key() -> str:
+    """
+    The settings that change feature values without a code change (pitch
+    backend, VAD), e.g. "pyin.vad0.01-200-0" or "yin.novad". Keys cached
+    results and stored features next to FEATURE_PIPELINE_VERSION.
+    """
+    backend = settings.PITCH_BACKEND.strip().lower()
+    if not settings.VAD_ENABLED:
+        return f"{backend}.novad"
+    return f"{backend}.vad{rms_threshold():g}-{settings.VAD_HANGOVER_MS:g}-{settings.VAD_ZCR_MAX:g}"
+
+
+def extract_voice_features(y: np.ndarray, sr: int, pitch_track=None, voiced=None, spectral=None):
     """
     Extracts a small set of explainable acoustic features used by the decision engine:
       - pitch_variance (variance of estimated F0 across voiced frames)
@@ -12,6 +32,14 @@ def extract_voice_features(y: np.ndarray, sr: int):
       - spectral_smoothness (normalized smoothness metric derived from MFCC diffs)
       - duration_seconds
 
+    pitch_track: optional PitchTrack for y (see pitch_analyzer.track_pitch);
+    computed here when not supplied.
+    voiced: optional voiced-frame mask (vad.voice_activity); computed here
+    when not supplied. Pitch, rhythm and smoothness come from voiced frames
+    only, pause_ratio from every frame.
+    spectral: optional SpectralContext of y the caller already framed
+    (e.g. to compute voiced from its RMS).
+
     Returns: dict of features (floats)
     """
     if y is None or len(y) == 0:
@@ -19,50 +47,152 @@ def extract_voice_features(y: np.ndarray, sr: int):
 
     duration_sec = len(y) / float(sr)
 
-    # 1) Pitch (F0) variance using librosa.pyin (works on voiced speech)
-    try:
-        f0, voiced_flag, voiced_probs = librosa.pyin(
-            y,
-            fmin=librosa.note_to_hz("C2"),
-            fmax=librosa.note_to_hz("C7"),
-            sr=sr
-        )
-        # f0 can contain np.nan for unvoiced frames
-        pitch_vals = f0[~np.isnan(f0)]
-        pitch_variance = float(np.var(pitch_vals)) if pitch_vals.size > 0 else 0.0
-    except Exception:
-        # fallback: use zero as unreliable
-        pitch_variance = 0.0
+    # One framing + STFT shared by RMS, onset strength and MFCC
+    if spectral is None:
+        spectral = SpectralContext(y, sr)
+    rms = spectral.rms
+
+    # Voice activity from the same RMS: the estimators below skip silence
+    if voiced is None:
+        voiced = voiced_frames(rms, sr, spectral.frames)
+    spectral.voiced = voiced
+
+    # 1) Pitch (F0) variance from the shared pyin track (works on voiced speech)
+    if pitch_track is None:
+        pitch_track = track_pitch(y, sr, voiced=voiced)
+    # fallback: use zero as unreliable
+    pitch_variance = pitch_track.variance() if pitch_track is not None else 0.0
 
     # 2) Rhythm variance (onset strength variance)
     try:
-        onset_env = librosa.onset.onset_strength(y=y, sr=sr)
-        rhythm_variance = float(np.var(onset_env)) if onset_env.size > 0 else 0.0
+        rhythm_variance = _rhythm_variance(spectral.onset_envelope)
     except Exception:
         rhythm_variance = 0.0
 
-    # 3) Pause ratio (frames with very low RMS energy)
+    # 3) Pause ratio (frames with very low RMS energy), over the full timeline
     try:
-        rms = librosa.feature.rms(y=y)[0]  # shape (n_frames,)
-        silence_frames = rms < 0.01  # threshold; empirical
-        pause_ratio = float(np.sum(silence_frames) / rms.size) if rms.size > 0 else 0.0
+        pause_ratio = _pause_ratio(rms)  # shape (n_frames,)
     except Exception:
         pause_ratio = 0.0
 
     # 4) Spectral smoothness - normalized metric (0..1), higher ~ smoother
     try:
-        mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-        # Frame-to-frame mean absolute diff
-        diffs = np.mean(np.abs(np.diff(mfcc, axis=1)), axis=0)
-        mean_diff = np.mean(diffs) if diffs.size > 0 else 0.0
-        mean_mfcc = np.mean(np.abs(mfcc)) + 1e-9
-        # Normalize: smaller mean_diff relative to MFCC magnitude -> smoother
-        raw = 1.0 - (mean_diff / mean_mfcc)
-        spectral_smoothness = float(np.clip(raw, 0.0, 1.0))
+        spectral_smoothness = _spectral_smoothness(spectral.mfcc)
     except Exception:
         spectral_smoothness = 0.0
 
-    # Round and return
+    return _round_features(duration_sec, pitch_variance, rhythm_variance,
+                           pause_ratio, spectral_smoothness)
+
+
+def extract_voice_features_batch(ys, sr: int, pitch_tracks=None):
+    """
+    Batched extract_voice_features for clips of similar length (see bucket_by_length).
+
+    Clips are zero-padded to the longest one so the framing runs once over
+    the whole batch; each clip's voiced frames are then stacked so the STFT
+    and mel projection run once too. Frames past each clip's end are
+    dropped, so values match the single-clip path.
+
+    Returns: list of feature dicts in input order.
+    """
+    if any(y is None or len(y) == 0 for y in ys):
+        raise ValueError("Empty waveform provided")
+
+    lengths = [len(y) for y in ys]
+    n_frames = [1 + n // HOP_LENGTH for n in lengths]
+    batch = np.zeros((len(ys), max(lengths)), dtype=np.float32)
+    for i, y in enumerate(ys):
+        batch[i, :len(y)] = y
+
+    spectral = SpectralContext(batch, sr)
+    try:
+        rms = spectral.rms  # (n_clips, n_frames)
+    except Exception:
+        rms = None
+
+    # Frames of each clip that the estimators see (all of them with VAD disabled)
+    clip_frames = []
+    for i, n in enumerate(n_frames):
+        frames = spectral.frames[i, :n]
+        voiced = voiced_frames(rms[i, :n], sr, frames) if rms is not None else None
+        clip_frames.append((frames, voiced))
+
+    if pitch_tracks is None:
+        pitch_tracks = [track_pitch(y, sr, voiced=voiced) for y, (_, voiced) in zip(ys, clip_frames)]
+
+    try:
+        # Power mel spectrogram of every clip's frames in one pass; onset strength and MFCC both start from it
+        selected = [frames if voiced is None else frames[voiced] for frames, voiced in clip_frames]
+        mel = np.split(mel_power(np.concatenate(selected), sr), np.cumsum([len(f) for f in selected])[:-1], axis=1)
+    except Exception:
+        mel = None
+
+    features = []
+    for i, n in enumerate(n_frames):
+        pitch_variance = pitch_tracks[i].variance() if pitch_tracks[i] is not None else 0.0
+
+        rhythm_variance = spectral_smoothness = 0.0
+        if mel is not None and mel[i].shape[1] > 0:
+            # dB scaling is per clip: top_db clipping is relative to each clip's own peak
+            log_mel = power_to_db(mel[i])
+            try:
+                rhythm_variance = _rhythm_variance(onset_envelope(log_mel))
+            except Exception:
+                pass
+            try:
+                spectral_smoothness = _spectral_smoothness(mfcc(log_mel))
+            except Exception:
+                pass
+
+        pause_ratio = _pause_ratio(rms[i, :n]) if rms is not None else 0.0
+
+        features.append(_round_features(lengths[i] / float(sr), pitch_variance,
+                                        rhythm_variance, pause_ratio, spectral_smoothness))
+    return features
+
+
+def bucket_by_length(lengths, slack: float = 0.25, max_size: int = 16):
+    """
+    Group clip indices so that, within a bucket, the longest clip is at most
+    (1 + slack) times the shortest. Bounds the padding wasted by batching.
+    Returns: list of index lists.
+    """
+    buckets = []
+    current = []
+    for idx in sorted(range(len(lengths)), key=lambda i: lengths[i]):
+        if current and (
+            len(current) >= max_size
+            or lengths[idx] > (1 + slack) * max(lengths[current[0]], 1)
+        ):
+            buckets.append(current)
+            current = []
+        current.append(idx)
+    if current:
+        buckets.append(current)
+    return buckets
+
+
+def _rhythm_variance(onset_env: np.ndarray) -> float:
+    return float(np.var(onset_env)) if onset_env.size > 0 else 0.0
+
+
+def _pause_ratio(rms: np.ndarray) -> float:
+    silence_frames = rms < SILENCE_RMS
+    return float(np.sum(silence_frames) / rms.size) if rms.size > 0 else 0.0
+
+
+def _spectral_smoothness(mfcc: np.ndarray) -> float:
+    # Frame-to-frame mean absolute diff
+    diffs = np.mean(np.abs(np.diff(mfcc, axis=1)), axis=0)
+    mean_diff = np.mean(diffs) if diffs.size > 0 else 0.0
+    mean_mfcc = np.mean(np.abs(mfcc)) + 1e-9
+    # Normalize: smaller mean_diff relative to MFCC magnitude -> smoother
+    raw = 1.0 - (mean_diff / mean_mfcc)
+    return float(np.clip(raw, 0.0, 1.0))
+
+
+def _round_features(duration_sec, pitch_variance, rhythm_variance, pause_ratio, spectral_smoothness):
     return {
         "duration_seconds": round(float(duration_sec), 3),
         "pitch_variance": round(float(pitch_variance), 6),
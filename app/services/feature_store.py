@@ -0,0 +1,179 @@
+"""
+Columnar store of extracted feature vectors.
+
+Features are keyed by audio digest + language and grouped by
+FEATURE_PIPELINE_VERSION and the feature-affecting settings
+(feature_settings_key), so one corpus is always homogeneous and classifier thresholds can change without
+re-running extract_voice_features: rescore() re-classifies the whole stored
+corpus in one vectorized pass (score_voice_batch).
+
+Layout: <directory>/v<version>-<settings>/seg-<id>/<column>.npy, one .npy per column.
+Segments are written atomically (temp dir + rename) and memory-mapped on load.
+
+    python -m app.services.feature_store rescore --threshold smoothness=0.8 [--output verdicts.csv]
+"""
+import argparse
+import csv
+import glob
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from app.config import settings
+from app.services.feature_extractor import FEATURE_PIPELINE_VERSION, feature_settings_key
+from app.services.integrated_service import FEATURE_COLUMNS, DEFAULT_THRESHOLDS, score_voice_batch
+
+STORE_COLUMNS = FEATURE_COLUMNS + ("duration_seconds",)
+
+
+class FeatureStore:
+    def __init__(self, directory: str, flush_rows: int = 256, version: str = None):
+        """version defaults to FEATURE_PIPELINE_VERSION plus the current feature_settings_key()."""
+        if version is None:
+            version = f"{FEATURE_PIPELINE_VERSION}-{feature_settings_key()}"
+        self.directory = os.path.join(directory, f"v{version}")
+        self.flush_rows = flush_rows
+        self._rows = []
+        self._lock = threading.Lock()
+
+    def append(self, digest: str, language: str, features: dict):
+        """Buffer one feature vector; a segment is written every flush_rows rows."""
+        row = (digest, language, time.time()) + tuple(
+            float(features.get(c, np.nan)) for c in STORE_COLUMNS
+        )
+        with self._lock:
+            self._rows.append(row)
+            if len(self._rows) >= self.flush_rows:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+
+        digests, languages, written_at, *values = zip(*rows)
+        columns = {
+            "digest": np.array(digests, dtype="U64"),
+            "language": np.array(languages, dtype="U16"),
+            "written_at": np.array(written_at, dtype=np.float64),
+        }
+        for name, column in zip(STORE_COLUMNS, values):
+            columns[name] = np.array(column, dtype=np.float64)
+
+        name = f"seg-{time.time_ns()}-{os.getpid()}"
+        tmp = os.path.join(self.directory, f".{name}")
+        os.makedirs(tmp)
+        for column, array in columns.items():
+            np.save(os.path.join(tmp, f"{column}.npy"), array)
+        os.rename(tmp, os.path.join(self.directory, name))
+
+    def load(self) -> dict:
+        """
+        All stored vectors for this version as {column: array}.
+        The latest row wins when a digest + language was stored more than once.
+        """
+        self.flush()
+        segments = sorted(glob.glob(os.path.join(self.directory, "seg-*")))
+        names = ("digest", "language", "written_at") + STORE_COLUMNS
+        if not segments:
+            return {
+                name: np.empty(0, dtype="U64" if name in ("digest", "language") else np.float64)
+                for name in names
+            }
+
+        data = {
+            name: np.concatenate([
+                np.load(os.path.join(seg, f"{name}.npy"), mmap_mode="r") for seg in segments
+            ])
+            for name in names
+        }
+
+        # Newest first, then keep the first occurrence of each (digest, language)
+        order = np.argsort(-data["written_at"], kind="stable")
+        keys = np.char.add(np.char.add(data["digest"][order], ":"), data["language"][order])
+        _, first = np.unique(keys, return_index=True)
+        keep = np.sort(order[first])
+        return {name: array[keep] for name, array in data.items()}
+
+    def rescore(self, thresholds: dict = None) -> dict:
+        """
+        Re-run the decision rules over the stored corpus in one vectorized call.
+        Returns {"digest", "language", "ai_score", "classification", "confidenceScore"} arrays.
+        """
+        data = self.load()
+        matrix = np.column_stack([data[c] for c in FEATURE_COLUMNS])
+        _, ai_score, classification, confidence = score_voice_batch(
+            matrix, data["language"], thresholds
+        )
+        return {
+            "digest": data["digest"],
+            "language": data["language"],
+            "ai_score": ai_score,
+            "classification": classification,
+            "confidenceScore": confidence
+        }
+
+
+def create_feature_store():
+    """Store configured by FEATURE_STORE_*; None when disabled."""
+    if not settings.FEATURE_STORE_ENABLED:
+        return None
+    return FeatureStore(settings.FEATURE_STORE_DIR, settings.FEATURE_STORE_FLUSH_ROWS)
+
+
+# Singleton instance
+feature_store = create_feature_store()
+
+
+def _parse_thresholds(pairs) -> dict:
+    thresholds = {}
+    for pair in pairs or []:
+        name, _, value = pair.partition("=")
+        if name not in DEFAULT_THRESHOLDS or not value:
+            raise SystemExit(f"Invalid --threshold '{pair}'. Names: {', '.join(DEFAULT_THRESHOLDS)}")
+        thresholds[name] = float(value)
+    return thresholds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score stored feature vectors with new thresholds")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rescore = sub.add_parser("rescore")
+    rescore.add_argument("--dir", default=settings.FEATURE_STORE_DIR)
+    rescore.add_argument("--threshold", action="append", metavar="NAME=VALUE",
+                         help=f"Override a threshold ({', '.join(DEFAULT_THRESHOLDS)})")
+    rescore.add_argument("--output", help="Write per-clip verdicts to this CSV file")
+    args = parser.parse_args(argv)
+
+    store = FeatureStore(args.dir)
+    thresholds = _parse_thresholds(args.threshold)
+
+    start = time.perf_counter()
+    baseline = store.rescore()
+    scored = store.rescore(thresholds)
+    elapsed = time.perf_counter() - start
+
+    n = len(scored["digest"])
+    n_ai = int(np.sum(scored["classification"] == "AI_GENERATED"))
+    flipped = int(np.sum(scored["classification"] != baseline["classification"]))
+    print(f"clips: {n}  AI_GENERATED: {n_ai}  HUMAN: {n - n_ai}  "
+          f"changed vs defaults: {flipped}  ({elapsed * 1000:.1f} ms)")
+
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["digest", "language", "ai_score", "classification", "confidenceScore"])
+            for row in zip(*(scored[k] for k in ("digest", "language", "ai_score",
+                                                 "classification", "confidenceScore"))):
+                writer.writerow([str(row[0]), str(row[1]), int(row[2]), str(row[3]), float(row[4])])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
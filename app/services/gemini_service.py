@@ -1,16 +1,134 @@
+import asyncio
 import json
-import google.generativeai as genai
+import logging
+import threading
+import time
+from collections import deque
+
 from app.config import settings
+from app.lazy import lazy_import
+from app.services.analysis_executor import analysis_executor, QueueFullError
+from app.services.metrics import metrics
+
+# google.generativeai pulls in the gRPC stack: loaded when the first client is built
+genai = lazy_import("google.generativeai")
+_configured = False
+
+logger = logging.getLogger(__name__)
+
 
-# Configure Gemini once
-genai.configure(api_key=settings.GEMINI_API_KEY)
+def _configure_once():
+    global _configured
+    if not _configured:
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+        _configured = True
 
 SUPPORTED_LANGUAGES = ["Tamil", "English", "Hindi", "Malayalam", "Telugu"]
 
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker over the last `window` calls.
+    closed: calls go through. open: calls fail fast until `cooldown` seconds
+    have passed. half_open: one probe call decides whether to close again.
+    """
+
+    def __init__(self, window: int = 20, error_rate: float = 0.5, min_calls: int = 5,
+                 cooldown: float = 30.0, clock=time.monotonic):
+        self.error_rate = error_rate
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self._clock = clock
+        self._outcomes = deque(maxlen=window)
+        self._state = "closed"
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == "open" and self._clock() - self._opened_at >= self.cooldown:
+                self._state = "half_open"
+            return self._state
+
+    def allow(self) -> bool:
+        """True if a call may go upstream now."""
+        state = self.state
+        with self._lock:
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record(self, success: bool):
+        with self._lock:
+            if self._state == "half_open":
+                self._probe_in_flight = False
+                if success:
+                    self._state = "closed"
+                    self._outcomes.clear()
+                else:
+                    self._trip()
+                return
+
+            self._outcomes.append(success)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.error_rate:
+                self._trip()
+
+    def cancel_probe(self):
+        """Release a half-open probe that ended without an outcome (cancelled)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _trip(self):
+        self._state = "open"
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+
+    def stats(self) -> dict:
+        return {"state": self.state, "recent_calls": len(self._outcomes), "rejected": self.rejected}
+
+
+async def classify_locally(audio_base64: str, language: str) -> dict:
+    """Local rules (classify_voice) in the analysis pool; the Gemini fallback."""
+    from app.services.integrated_service import analyze_audio_job
+
+    try:
+        job = await analysis_executor.submit(analyze_audio_job, audio_base64, language, "mp3")
+    except QueueFullError:
+        return None
+    return job["result"]
+
+
 class GeminiService:
-    def __init__(self):
-        self.model = genai.GenerativeModel(model_name="gemini-2.5-flash")
+    def __init__(self, model=None, timeout: float = None, max_concurrency: int = None,
+                 hedge_after: float = None, breaker: CircuitBreaker = None, local_fallback=None):
+        if model is None:
+            _configure_once()
+            model = genai.GenerativeModel(model_name="gemini-2.5-flash")
+        self.model = model
         self.mime_type = "audio/mp3"  # Only MP3 now
+        self.timeout = settings.GEMINI_TIMEOUT if timeout is None else timeout
+        self.hedge_after = settings.GEMINI_HEDGE_AFTER if hedge_after is None else hedge_after
+        self.max_concurrency = max_concurrency or settings.GEMINI_MAX_CONCURRENCY
+        self.breaker = breaker or CircuitBreaker(
+            window=settings.GEMINI_BREAKER_WINDOW,
+            error_rate=settings.GEMINI_BREAKER_ERROR_RATE,
+            cooldown=settings.GEMINI_BREAKER_COOLDOWN
+        )
+        self.local_fallback = local_fallback or classify_locally
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight = 0
+        self.hedged = 0
+
+    def stats(self) -> dict:
+        return {"in_flight": self.in_flight, "hedged": self.hedged, "breaker": self.breaker.stats()}
 
     def _get_prompt(self, language: str) -> str:
         """Generate the analysis prompt."""
@@ -43,72 +161,177 @@ Respond ONLY in valid JSON format (no markdown, no extra text, no explanation ou
   "explanation": "Short acoustic-based reason for the classification"
 }}"""
 
+    def _contents(self, audio_base64: str, language: str) -> list:
+        return [
+            {
+                "mime_type": self.mime_type,
+                "data": audio_base64
+            },
+            self._get_prompt(language)
+        ]
+
+    async def analyze_audio_async(self, audio_base64: str, language: str) -> dict:
+        """
+        Non-blocking Gemini analysis with a deadline of self.timeout seconds
+        (semaphore wait included). At most max_concurrency calls are in
+        flight. When the breaker is open, the deadline passes or the upstream
+        errors, the answer comes from local classify_voice instead.
+        """
+        analysis = await self.try_analyze_async(audio_base64, language)
+        if analysis is None:
+            return await self._local_verdict(audio_base64, language)
+        return analysis
+
+    async def try_analyze_async(self, audio_base64: str, language: str, timeout: float = None):
+        """
+        One guarded Gemini attempt: the parsed answer, or None when the
+        breaker is open, no slot frees up in time, the deadline passes or the
+        upstream fails. timeout defaults to self.timeout.
+        """
+        timeout = self.timeout if timeout is None else min(timeout, self.timeout)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            # Saturated locally, not an upstream failure: the breaker is not told
+            return None
+
+        if not self.breaker.allow():
+            self._semaphore.release()
+            return None
+
+        self.in_flight += 1
+        called = time.perf_counter()
+        try:
+            remaining = max(0.0, timeout - (time.monotonic() - started))
+            result = await asyncio.wait_for(self._generate(self._contents(audio_base64, language)), remaining)
+            analysis = self._parse_response(result.text, language)
+        except Exception as e:
+            logger.warning("[Gemini Service Error]: %s: %s", type(e).__name__, e)
+            self.breaker.record(False)
+            return None
+        except BaseException:
+            # Cancelled (client gone, cascade budget): no verdict on upstream health,
+            # but a half-open probe must not stay claimed forever
+            self.breaker.cancel_probe()
+            raise
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+            metrics.observe("echotrace_stage_seconds", time.perf_counter() - called, stage="gemini")
+
+        self.breaker.record(True)
+        return analysis
+
+    async def _generate(self, contents):
+        """
+        generate_content_async, hedged: if the call is still pending after
+        hedge_after seconds and a concurrency slot is free, a duplicate is
+        sent and the first answer wins.
+        """
+        options = {"timeout": self.timeout}
+        first = asyncio.ensure_future(self.model.generate_content_async(contents, request_options=options))
+        tasks = [first]
+        hedged = False
+        try:
+            if self.hedge_after <= 0:
+                return await first
+
+            done, _ = await asyncio.wait({first}, timeout=self.hedge_after)
+            if done or self._semaphore.locked():
+                return await first
+
+            await self._semaphore.acquire()
+            hedged = True
+            self.hedged += 1
+            tasks.append(asyncio.ensure_future(self.model.generate_content_async(contents, request_options=options)))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is None:
+                        return task.result()
+            return first.result()  # both failed: raise the original error
+        finally:
+            # Also runs when the caller's wait_for cancels us mid-wait
+            for task in tasks:
+                task.cancel()
+            if hedged:
+                self._semaphore.release()
+
+    async def _local_verdict(self, audio_base64: str, language: str) -> dict:
+        try:
+            result = await self.local_fallback(audio_base64, language)
+        except Exception as e:
+            logger.warning("[Local fallback error]: %s", e)
+            result = None
+        return result or self._get_safe_fallback(language)
+
     def analyze_audio(self, audio_base64: str, language: str) -> dict:
         """
-        Analyze audio using Gemini.
+        Analyze audio using Gemini (blocking; prefer analyze_audio_async).
         Always classifies as AI_GENERATED or HUMAN.
         Never returns Unknown.
         """
-        try:
-            prompt = self._get_prompt(language)
-
-            # Generate content with audio
-            result = self.model.generate_content([
-                {
-                    "mime_type": self.mime_type,
-                    "data": audio_base64
-                },
-                prompt
-            ])
-
-            # Parse response
-            response_text = result.text.strip()
-            print(f"[Gemini Raw Response]: {response_text[:300]}")
-
-            # Clean markdown if present
-            response_text = response_text.replace("```json", "").replace("```", "").strip()
-
-            # Parse JSON
-            analysis = json.loads(response_text)
-
-            # Validate required fields
-            required_fields = ["classification", "confidenceScore", "language", "explanation"]
-            if not all(field in analysis for field in required_fields):
-                raise ValueError("Missing required fields in Gemini response")
-
-            # Force valid classification if Gemini returns something wrong
-            if analysis["classification"] not in ["AI_GENERATED", "HUMAN"]:
-                analysis["classification"] = "AI_GENERATED"
-                analysis["confidenceScore"] = 0.55
-                analysis["explanation"] = "Mixed acoustic indicators detected. Pitch stability suggests synthetic characteristics with moderate confidence."
-
-            # Force valid language
-            if analysis["language"] not in SUPPORTED_LANGUAGES:
-                analysis["language"] = language
-
-            # Clamp confidence between 0.0 and 1.0
-            analysis["confidenceScore"] = max(0.0, min(1.0, float(analysis["confidenceScore"])))
-
-            return {
-                "status": "success",
-                "language": analysis["language"],
-                "classification": analysis["classification"],
-                "confidenceScore": analysis["confidenceScore"],
-                "explanation": analysis["explanation"]
-            }
-
-        except json.JSONDecodeError as e:
-            print(f"[JSON Parse Error]: {e}")
+        if not self.breaker.allow():
             return self._get_safe_fallback(language)
-
+        try:
+            result = self.model.generate_content(
+                self._contents(audio_base64, language),
+                request_options={"timeout": self.timeout}
+            )
+            analysis = self._parse_response(result.text, language)
         except Exception as e:
-            print(f"[Gemini Service Error]: {str(e)}")
+            logger.warning("[Gemini Service Error]: %s", e)
+            self.breaker.record(False)
             return self._get_safe_fallback(language)
 
+        self.breaker.record(True)
+        return analysis
+
+    def _parse_response(self, text: str, language: str) -> dict:
+        """Validate and normalize Gemini's JSON answer; raises ValueError if unusable."""
+        # Parse response
+        response_text = text.strip()
+        logger.debug("[Gemini Raw Response]: %s", response_text[:300])
+
+        # Clean markdown if present
+        response_text = response_text.replace("```json", "").replace("```", "").strip()
+
+        # Parse JSON (json.JSONDecodeError is a ValueError)
+        analysis = json.loads(response_text)
+
+        # Validate required fields
+        required_fields = ["classification", "confidenceScore", "language", "explanation"]
+        if not all(field in analysis for field in required_fields):
+            raise ValueError("Missing required fields in Gemini response")
+
+        # Force valid classification if Gemini returns something wrong
+        if analysis["classification"] not in ["AI_GENERATED", "HUMAN"]:
+            analysis["classification"] = "AI_GENERATED"
+            analysis["confidenceScore"] = 0.55
+            analysis["explanation"] = "Mixed acoustic indicators detected. Pitch stability suggests synthetic characteristics with moderate confidence."
+
+        # Force valid language
+        if analysis["language"] not in SUPPORTED_LANGUAGES:
+            analysis["language"] = language
+
+        # Clamp confidence between 0.0 and 1.0
+        analysis["confidenceScore"] = max(0.0, min(1.0, float(analysis["confidenceScore"])))
+
+        return {
+            "status": "success",
+            "language": analysis["language"],
+            "classification": analysis["classification"],
+            "confidenceScore": analysis["confidenceScore"],
+            "explanation": analysis["explanation"]
+        }
+
     def _get_safe_fallback(self, language: str) -> dict:
         """
         Judge-safe fallback. Always classifies. Never returns Unknown.
         """
+        metrics.inc("echotrace_fallback_total", source="gemini")
         return {
             "status": "success",
             "language": language if language in SUPPORTED_LANGUAGES else "English",
@@ -3,46 +3,86 @@ Integrated EchoTrace Detection Service
 Combines Person 2's audio analysis + Person 1's classification logic
 """
 
+import logging
+
+import numpy as np
+
 # Person 2's audio processing imports (you'll add their actual files to app/services/)
-from app.services.audio_analyzer import analyze_audio
+from app.services.analysis_tiers import FULL
+from app.services.audio_analyzer import analyze_audio, analyze_audio_bytes, analyze_audio_file, analyze_audio_batch
+from app.services.metrics import slow_request_profile, stage, trace
+
+logger = logging.getLogger(__name__)
+
+# Feature order for the vectorized engine (classify_voice_batch)
+FEATURE_COLUMNS = ("pitch_variance", "rhythm_variance", "pause_ratio", "spectral_smoothness")
+
+# Decision thresholds shared by classify_voice and classify_voice_batch.
+# Callers may pass a partial override dict (e.g. feature_store re-scoring).
+WIDE_PITCH_LANGUAGES = ["Tamil", "Telugu", "Malayalam"]
+DEFAULT_THRESHOLDS = {
+    "pitch_wide": 0.16,     # pitch_variance, Tamil / Telugu / Malayalam
+    "pitch_default": 0.14,  # pitch_variance, other languages
+    "rhythm": 0.10,         # rhythm_variance
+    "pause": 0.03,          # pause_ratio
+    "smoothness": 0.85,     # spectral_smoothness
+}
+RULE_REASONS = (
+    "unnaturally stable pitch",
+    "uniform speech rhythm",
+    "lack of natural pauses",
+    "over-smooth speech texture",
+)
+
+
+def _thresholds(overrides=None) -> dict:
+    if not overrides:
+        return DEFAULT_THRESHOLDS
+    unknown = set(overrides) - set(DEFAULT_THRESHOLDS)
+    if unknown:
+        raise ValueError(f"Unknown thresholds: {sorted(unknown)}")
+    return {**DEFAULT_THRESHOLDS, **overrides}
+
 
 # Person 1's classification logic
-def classify_voice(features):
+def classify_voice(features, thresholds=None):
     """
     EchoTrace Decision Engine
     Determines whether a voice is AI-generated or Human
     based on extracted voice behavior features.
+    thresholds: optional overrides of DEFAULT_THRESHOLDS.
     """
+    t = _thresholds(thresholds)
     ai_score = 0
     reasons = []
 
     language = features.get("language", "English")
 
     # Language-aware pitch threshold
-    if language in ["Tamil", "Telugu", "Malayalam"]:
-        pitch_threshold = 0.16
+    if language in WIDE_PITCH_LANGUAGES:
+        pitch_threshold = t["pitch_wide"]
     else:
-        pitch_threshold = 0.14
+        pitch_threshold = t["pitch_default"]
 
     # Rule 1: Pitch consistency
     if features["pitch_variance"] < pitch_threshold:
         ai_score += 1
-        reasons.append("unnaturally stable pitch")
+        reasons.append(RULE_REASONS[0])
 
     # Rule 2: Rhythm uniformity
-    if features["rhythm_variance"] < 0.10:
+    if features["rhythm_variance"] < t["rhythm"]:
         ai_score += 1
-        reasons.append("uniform speech rhythm")
+        reasons.append(RULE_REASONS[1])
 
     # Rule 3: Natural pauses
-    if features["pause_ratio"] < 0.03:
+    if features["pause_ratio"] < t["pause"]:
         ai_score += 1
-        reasons.append("lack of natural pauses")
+        reasons.append(RULE_REASONS[2])
 
     # Rule 4: Spectral smoothness
-    if features["spectral_smoothness"] > 0.85:
+    if features["spectral_smoothness"] > t["smoothness"]:
         ai_score += 1
-        reasons.append("over-smooth speech texture")
+        reasons.append(RULE_REASONS[3])
 
     # Final Decision
     if ai_score >= 3:
@@ -60,6 +100,60 @@ def classify_voice(features):
     return classification, round(confidenceScore, 2), explanation
 
 
+def voice_ai_score(features, thresholds=None) -> int:
+    """Number of AI-leaning rules classify_voice would fire (0-4)."""
+    row = [[features[c] for c in FEATURE_COLUMNS]]
+    _, ai_score, _, _ = score_voice_batch(row, [features.get("language", "English")], thresholds)
+    return int(ai_score[0])
+
+
+def score_voice_batch(feature_matrix, languages, thresholds=None):
+    """
+    Vectorized rule evaluation over a feature matrix.
+    feature_matrix: array-like (n_clips, 4) with columns in FEATURE_COLUMNS order.
+    languages: one canonical language per row.
+    Returns: (hits bool (n, 4), ai_score int (n,), classification str (n,), confidence float (n,))
+    """
+    t = _thresholds(thresholds)
+    X = np.asarray(feature_matrix, dtype=np.float64).reshape(-1, len(FEATURE_COLUMNS))
+    pitch_threshold = np.where(
+        np.isin(np.asarray(languages, dtype=object), WIDE_PITCH_LANGUAGES),
+        t["pitch_wide"],
+        t["pitch_default"]
+    )
+
+    hits = np.column_stack([
+        X[:, 0] < pitch_threshold,
+        X[:, 1] < t["rhythm"],
+        X[:, 2] < t["pause"],
+        X[:, 3] > t["smoothness"],
+    ])
+    ai_score = hits.sum(axis=1)
+
+    confidence = np.where(
+        ai_score >= 3,
+        np.minimum(0.9, 0.6 + ai_score * 0.1),
+        np.where(ai_score <= 1, np.maximum(0.6, 1 - ai_score * 0.2), 0.55)
+    )
+    classification = np.where(ai_score <= 1, "HUMAN", "AI_GENERATED")
+    return hits, ai_score, classification, np.round(confidence, 2)
+
+
+def classify_voice_batch(feature_matrix, languages, thresholds=None):
+    """
+    Vectorized classify_voice.
+    Returns: list of (classification, confidenceScore, explanation), same as classify_voice.
+    """
+    hits, _, classification, confidence = score_voice_batch(feature_matrix, languages, thresholds)
+
+    results = []
+    for row in range(len(hits)):
+        reasons = [RULE_REASONS[k] for k in np.flatnonzero(hits[row])]
+        explanation = ", ".join(reasons[:2]) if reasons else "Normal voice characteristics detected"
+        results.append((str(classification[row]), float(confidence[row]), explanation))
+    return results
+
+
 class IntegratedDetectionService:
     """Combines Person 2 audio processing + Person 1 classification"""
     
@@ -67,9 +161,31 @@ class IntegratedDetectionService:
         """
         Full pipeline: Audio → Features → Classification
         """
+        return self.analyze_audio_detailed(audio_base64, language, audio_format)["result"]
+
+    def analyze_audio_detailed(self, audio_base64: str, language: str, audio_format: str = "mp3",
+                               tier: str = FULL) -> dict:
+        """
+        Same pipeline, also returning the extracted features and the decoder used:
+        {"result": <API response dict>, "features": dict or None, "decoder": str or None,
+        "analysis_tier": the quality tier that ran (analysis_tiers)}.
+        features is None when the safe fallback answered (nothing worth caching).
+        """
+        return self._detailed(analyze_audio, (audio_base64, language, audio_format, tier), language, tier)
+
+    def analyze_audio_file_detailed(self, path: str, language: str, audio_format: str = "mp3") -> dict:
+        """analyze_audio_detailed for an uploaded file, featurized block by block."""
+        return self._detailed(analyze_audio_file, (path, language, audio_format), language)
+
+    def analyze_audio_bytes_detailed(self, audio_bytes, language: str, audio_format: str = "mp3",
+                                     tier: str = FULL) -> dict:
+        """analyze_audio_detailed for already-decoded bytes (e.g. a memory-mapped file)."""
+        return self._detailed(analyze_audio_bytes, (audio_bytes, language, audio_format, tier), language, tier)
+
+    def _detailed(self, analyze, args, language: str, tier: str = FULL) -> dict:
         try:
             # Step 1: Person 2's audio analysis (extract features)
-            audio_result = analyze_audio(audio_base64, language, audio_format)
+            audio_result = analyze(*args)
             
             extracted_language = audio_result["language"]
             features = audio_result["features"]
@@ -78,28 +194,102 @@ class IntegratedDetectionService:
             features["language"] = extracted_language
             
             # Step 2: Person 1's classification logic
-            classification, confidence_score, explanation = classify_voice(features)
+            with stage("classify"):
+                classification, confidence_score, explanation = classify_voice(features)
             
             # Step 3: Return in API format
-            return {
+            result = {
                 "status": "success",
                 "language": extracted_language,
                 "classification": classification,
                 "confidenceScore": confidence_score,
                 "explanation": explanation
             }
+            if "segments" in audio_result:
+                # Long-recording mode: one verdict per sampled segment as well
+                result["segments"] = self._segment_verdicts(audio_result["segments"], extracted_language)
+
+            return {
+                "result": result,
+                "features": features,
+                "decoder": audio_result["decoder"],
+                "analysis_tier": audio_result.get("tier", FULL)
+            }
             
         except ValueError as e:
             # Audio processing error
-            return self._get_safe_fallback(language, f"Audio processing error: {str(e)}")
+            error_msg = f"Audio processing error: {str(e)}"
         
         except Exception as e:
             # Any other error
-            return self._get_safe_fallback(language, f"Analysis error: {str(e)}")
+            error_msg = f"Analysis error: {str(e)}"
+
+        return {
+            "result": self._get_safe_fallback(language, error_msg),
+            "features": None,
+            "decoder": None,
+            "analysis_tier": tier
+        }
     
+    def _segment_verdicts(self, segments, language: str) -> list:
+        verdicts = classify_voice_batch(
+            [[segment["features"][c] for c in FEATURE_COLUMNS] for segment in segments],
+            [language] * len(segments)
+        )
+        return [
+            {
+                "start": segment["start"],
+                "end": segment["end"],
+                "classification": classification,
+                "confidenceScore": confidence_score
+            }
+            for segment, (classification, confidence_score, _) in zip(segments, verdicts)
+        ]
+
+    def analyze_batch_integrated(self, items) -> list:
+        """
+        Batch pipeline: items are (audio_base64, language, audio_format) tuples.
+        Features are extracted in length buckets and classified in one
+        vectorized call. Returns one dict per item, in order; failed items
+        get {"status": "error", "message": ...}.
+        """
+        return [entry["result"] for entry in self.analyze_batch_detailed(items)]
+
+    def analyze_batch_detailed(self, items) -> list:
+        """analyze_batch_integrated, with {"result", "features", "decoder"} per item like analyze_audio_detailed."""
+        analyses = analyze_audio_batch(items)
+
+        ok = [i for i, a in enumerate(analyses) if "error" not in a]
+        with stage("classify"):
+            verdicts = classify_voice_batch(
+                [[analyses[i]["features"][c] for c in FEATURE_COLUMNS] for i in ok],
+                [analyses[i]["language"] for i in ok]
+            )
+
+        results = [
+            {"result": {"status": "error", "message": a["error"]}, "features": None, "decoder": None}
+            if "error" in a else None
+            for a in analyses
+        ]
+        for i, (classification, confidence_score, explanation) in zip(ok, verdicts):
+            features = analyses[i]["features"]
+            features["language"] = analyses[i]["language"]
+            results[i] = {
+                "result": {
+                    "status": "success",
+                    "language": analyses[i]["language"],
+                    "classification": classification,
+                    "confidenceScore": confidence_score,
+                    "explanation": explanation
+                },
+                "features": features,
+                "decoder": analyses[i]["decoder"]
+            }
+        return results
+
     def _get_safe_fallback(self, language: str, error_msg: str) -> dict:
         """Judge-safe fallback - always returns valid response"""
-        print(f"[Fallback triggered]: {error_msg}")
+        logger.warning("[Fallback triggered]: %s", error_msg)
         
         SUPPORTED_LANGUAGES = ["Tamil", "English", "Hindi", "Malayalam", "Telugu"]
         
@@ -113,3 +303,41 @@ class IntegratedDetectionService:
 
 # Singleton instance
 integrated_service = IntegratedDetectionService()
+
+
+def _traced(label: str, analyze, *args) -> dict:
+    # Stage timings travel back to the API process as job["timings"] (metrics.record_job)
+    with trace() as timings, slow_request_profile(label):
+        job = analyze(*args)
+    job["timings"] = timings
+    return job
+
+
+def analyze_audio_job(audio_base64: str, language: str, audio_format: str = "mp3", tier: str = FULL) -> dict:
+    """
+    Module-level entry point so the pipeline can be pickled into worker processes.
+    Returns analyze_audio_detailed's {"result", "features"} dict plus "timings".
+    """
+    return _traced("analyze_audio_job", integrated_service.analyze_audio_detailed, audio_base64, language, audio_format, tier)
+
+
+def analyze_audio_bytes_job(audio_bytes: bytes, language: str, audio_format: str = "mp3", tier: str = FULL) -> dict:
+    """analyze_audio_job for audio the API process already base64-decoded."""
+    return _traced(
+        "analyze_audio_bytes_job", integrated_service.analyze_audio_bytes_detailed, audio_bytes, language, audio_format, tier
+    )
+
+
+def analyze_batch_job(items) -> dict:
+    """
+    Worker entry point for one shard of a batch request:
+    {"items": analyze_batch_detailed's list, "timings": stage timings of the shard}.
+    """
+    with trace() as timings, slow_request_profile("analyze_batch_job"):
+        entries = integrated_service.analyze_batch_detailed(items)
+    return {"items": entries, "timings": timings}
+
+
+def analyze_audio_file_job(path: str, language: str, audio_format: str = "mp3") -> dict:
+    """Worker entry point for streamed uploads spooled to `path` (analyze_audio_file_detailed)."""
+    return _traced("analyze_audio_file_job", integrated_service.analyze_audio_file_detailed, path, language, audio_format)
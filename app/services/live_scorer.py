@@ -0,0 +1,80 @@
+"""
+Live-call scoring: PCM frames in, a classify_voice verdict every N seconds out.
+
+LiveVoiceScorer wraps one StreamingFeatureExtractor per call, so memory per
+stream is constant (running statistics plus one analysis block) no matter
+how long the call lasts.
+"""
+import numpy as np
+
+from app.lazy import lazy_import
+from app.services.feature_extractor import HOP_LENGTH
+from app.services.integrated_service import classify_voice
+from app.services.language_handler import validate_language
+from app.services.stream_extractor import StreamingFeatureExtractor
+
+soxr = lazy_import("soxr")
+
+ANALYSIS_SR = 16000
+
+
+class LiveVoiceScorer:
+    def __init__(self, language: str, sample_rate: int = ANALYSIS_SR, verdict_every_sec: float = 2.0,
+                 block_frames: int = 32, pitch_backend: str = None):
+        self.language = validate_language(language)
+        self.verdict_every_sec = verdict_every_sec
+        self.extractor = StreamingFeatureExtractor(
+            ANALYSIS_SR, block_frames=block_frames, pitch_backend=pitch_backend
+        )
+        self._resampler = None
+        if sample_rate != ANALYSIS_SR:
+            self._resampler = soxr.ResampleStream(sample_rate, ANALYSIS_SR, 1, dtype="float32", quality="HQ")
+        self._next_verdict_at = verdict_every_sec
+        self._odd_byte = b""
+
+    @property
+    def seconds_analyzed(self) -> float:
+        return self.extractor.frames * HOP_LENGTH / float(ANALYSIS_SR)
+
+    def feed(self, pcm: bytes) -> list:
+        """
+        Feed little-endian int16 mono PCM. Returns the verdicts that became
+        due (usually zero or one; more if a large buffer arrived at once).
+        """
+        # A WebSocket message may split a sample; carry the odd byte over
+        pcm = self._odd_byte + pcm
+        usable = len(pcm) - len(pcm) % 2
+        self._odd_byte = pcm[usable:]
+        y = np.frombuffer(pcm[:usable], dtype="<i2").astype(np.float32) / 32768.0
+        if self._resampler is not None:
+            y = self._resampler.resample_chunk(y)
+
+        verdicts = []
+        self.extractor.push(y)
+        while self.seconds_analyzed >= self._next_verdict_at:
+            verdicts.append(self.verdict(self.extractor.snapshot(), self.seconds_analyzed, final=False))
+            self._next_verdict_at += self.verdict_every_sec
+        return verdicts
+
+    def finish(self):
+        """Flush the stream and return the final verdict (None if no audio arrived)."""
+        if self._resampler is not None:
+            self.extractor.push(self._resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True))
+        if self.extractor.n_samples == 0:
+            return None
+        features = self.extractor.finalize()
+        return self.verdict(features, features["duration_seconds"], final=True)
+
+    def verdict(self, features: dict, seconds: float, final: bool) -> dict:
+        classification, confidence_score, explanation = classify_voice(
+            dict(features, language=self.language)
+        )
+        return {
+            "status": "success",
+            "language": self.language,
+            "classification": classification,
+            "confidenceScore": confidence_score,
+            "explanation": explanation,
+            "secondsAnalyzed": round(seconds, 2),
+            "final": final
+        }
@@ -0,0 +1,123 @@
+"""
+Long-recording mode.
+
+Recordings longer than LONG_AUDIO_MIN_SEC are never decoded into one array.
+Instead:
+  1. one streaming decode pass computes frame energies (voice activity),
+     reading at most LONG_AUDIO_MAX_SEC of audio;
+  2. the recording is split into LONG_AUDIO_MAX_SEGMENTS equal strata and the
+     segment of LONG_AUDIO_SEGMENT_SEC with the most speech is chosen in each,
+     so the sample covers the whole call and is deterministic (cacheable);
+  3. only those segments are decoded again (seek + read) and featurized as
+     one batch.
+Memory and latency are bounded by the segment settings, not by clip length.
+"""
+import numpy as np
+
+from app.config import settings
+from .audio_decoder import iter_decoded_blocks, read_segment
+from .feature_extractor import HOP_LENGTH, extract_voice_features_batch
+from .pitch_analyzer import track_pitch
+from .spectral import SILENCE_RMS
+from .temporal_analyzer import consistency_verdict, pitch_temporal_profile
+
+ANALYSIS_SR = 16000
+# A candidate segment needs at least this share of speech frames
+MIN_SPEECH_RATIO = 0.3
+
+AVERAGED_FEATURES = ("pitch_variance", "rhythm_variance", "pause_ratio", "spectral_smoothness")
+
+
+def frame_energies(open_source, max_seconds: float, sr: int = ANALYSIS_SR) -> np.ndarray:
+    """
+    RMS per HOP_LENGTH frame over the first max_seconds, from a streaming
+    decode (one block in memory at a time). open_source() returns a fresh
+    file path / file object.
+    """
+    limit = int(max_seconds * sr)
+    energies = []
+    carry = np.zeros(0, dtype=np.float32)
+    seen = 0
+    for block in iter_decoded_blocks(open_source(), sr=sr):
+        block = block[:max(0, limit - seen)]
+        seen += len(block)
+        block = np.concatenate([carry, block])
+        n_frames = len(block) // HOP_LENGTH
+        frames = block[:n_frames * HOP_LENGTH].reshape(n_frames, HOP_LENGTH)
+        energies.append(np.sqrt(np.mean(np.square(frames), axis=1)))
+        carry = block[n_frames * HOP_LENGTH:]
+        if seen >= limit:
+            break
+    return np.concatenate(energies) if energies else np.zeros(0, dtype=np.float32)
+
+
+def select_segments(energies: np.ndarray, segment_sec: float, max_segments: int,
+                    sr: int = ANALYSIS_SR):
+    """
+    Stratified pick of speech segments: [(start_sec, end_sec)] in time order,
+    at most one per stratum, each the most speech-dense window there.
+    """
+    frames_per_segment = max(1, int(segment_sec * sr / HOP_LENGTH))
+    n_windows = len(energies) // frames_per_segment
+    if n_windows == 0:
+        return []
+
+    speech = (energies[:n_windows * frames_per_segment] > SILENCE_RMS)
+    density = speech.reshape(n_windows, frames_per_segment).mean(axis=1)
+
+    chosen = []
+    for stratum in np.array_split(np.arange(n_windows), min(max_segments, n_windows)):
+        best = stratum[np.argmax(density[stratum])]
+        if density[best] >= MIN_SPEECH_RATIO:
+            chosen.append(int(best))
+
+    seconds_per_window = frames_per_segment * HOP_LENGTH / sr
+    return [(w * seconds_per_window, (w + 1) * seconds_per_window) for w in chosen]
+
+
+def analyze_long_audio(open_source, duration_sec: float, sr: int = ANALYSIS_SR) -> dict:
+    """
+    Features for a long recording from a bounded sample of speech segments.
+    Returns {"features": duration-weighted segment average plus
+    duration_seconds / analyzed_seconds / pitch_consistency,
+    "segments": [{"start", "end", "features"}]}. With no speech-dense
+    window anywhere (a silent or noisy call) the first LONG_AUDIO_SEGMENT_SEC
+    is analyzed instead, so the cost stays bounded either way. Raises
+    ValueError when not even that much audio can be read.
+    """
+    energies = frame_energies(open_source, settings.LONG_AUDIO_MAX_SEC, sr)
+    bounds = select_segments(energies, settings.LONG_AUDIO_SEGMENT_SEC, settings.LONG_AUDIO_MAX_SEGMENTS, sr)
+    if not bounds:
+        bounds = [(0.0, settings.LONG_AUDIO_SEGMENT_SEC)]
+
+    ys = [read_segment(open_source(), start, end - start, sr) for start, end in bounds]
+    # Header durations of MP3s are estimates: a segment at the very end may come back short
+    kept = [i for i, y in enumerate(ys) if len(y) >= sr // 2]
+    if not kept:
+        raise ValueError("Long recording has no decodable audio")
+    bounds = [bounds[i] for i in kept]
+    ys = [ys[i] for i in kept]
+
+    tracks = [track_pitch(y, sr) for y in ys]
+    seg_features = extract_voice_features_batch(ys, sr, pitch_tracks=tracks)
+
+    segments = []
+    chunk_variances = []
+    for (start, end), y, track, features in zip(bounds, ys, tracks, seg_features):
+        profile = pitch_temporal_profile(y, sr, pitch_track=track)
+        features["pitch_consistency"] = profile["verdict"]
+        chunk_variances.extend(c["pitch_variance"] for c in profile["chunks"])
+        segments.append({"start": round(start, 3), "end": round(end, 3), "features": features})
+
+    weights = np.array([f["duration_seconds"] for f in seg_features])
+    overall = {
+        name: round(float(np.average([f[name] for f in seg_features], weights=weights)), 6)
+        for name in AVERAGED_FEATURES
+    }
+    overall["duration_seconds"] = round(float(duration_sec), 3)
+    overall["analyzed_seconds"] = round(float(weights.sum()), 3)
+
+    # Pooled over every chunk of every segment, as pitch_temporal_consistency would
+    overall["pitch_consistency"] = consistency_verdict(chunk_variances)
+
+    return {"features": overall, "segments": segments}
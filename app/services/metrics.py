@@ -0,0 +1,207 @@
+"""
+Per-stage latency and fallback counters, exposed in Prometheus text format on /metrics.
+
+Analysis runs in worker processes, so the pipeline does not write to the
+registry directly: stage("pitch") adds its wall time to the trace() of the
+current job, the job returns it as job["timings"], and the API process
+folds it in with metrics.record_job(job). Outside a trace, stage() is a
+no-op (one ContextVar lookup).
+
+Slow-request profiling (PROFILE_SLOW_MS > 0): slow_request_profile()
+samples the calling thread's stack every PROFILE_INTERVAL_MS while a job
+runs and logs the hottest stacks when the job took longer than the threshold.
+"""
+import collections
+import contextvars
+import logging
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds (+Inf is implicit)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HELP = {
+    "echotrace_stage_seconds": "Wall time per pipeline stage",
+    "echotrace_request_seconds": "HTTP request latency by route",
+    "echotrace_decoder_total": "Analyzed clips by decoder (lightweight = byte-level fallback)",
+    "echotrace_fallback_total": "Fixed safe-fallback answers by source",
+    "echotrace_coalesced_total": "Requests that joined an identical in-flight analysis",
+    "echotrace_admission_rejected_total": "Requests turned away by the MP3 header check, by reason",
+    "echotrace_analysis_tier_total": "Single-clip analyses by load-adaptive quality tier",
+}
+
+_trace = contextvars.ContextVar("echotrace_trace", default=None)
+
+
+@contextmanager
+def trace():
+    """Collect stage timings of the enclosed pipeline run into the yielded dict."""
+    timings = {}
+    token = _trace.set(timings)
+    try:
+        yield timings
+    finally:
+        _trace.reset(token)
+
+
+@contextmanager
+def stage(name: str):
+    """Time the enclosed block as `name` in the current trace (summed if repeated)."""
+    timings = _trace.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round(timings.get(name, 0.0) + time.perf_counter() - started, 6)
+
+
+class Metrics:
+    """Thread-safe counters and fixed-bucket histograms keyed by (name, labels)."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}  # key -> [bucket counts..., sum, count]
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            entry = self._histograms.get(key)
+            if entry is None:
+                entry = self._histograms[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    entry[i] += 1
+            entry[-2] += seconds
+            entry[-1] += 1
+
+    def value(self, name: str, **labels):
+        """Counter value, or observation count of a histogram (0 if never recorded)."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            if key in self._histograms:
+                return self._histograms[key][-1]
+            return self._counters.get(key, 0)
+
+    def record_timings(self, timings: dict):
+        """Stage timings of one traced worker run (metrics.trace)."""
+        for name, seconds in (timings or {}).items():
+            self.observe("echotrace_stage_seconds", seconds, stage=name)
+
+    def record_job(self, job: dict, source: str = "integrated"):
+        """Fold a worker job's timings, decoder and quality tier into the registry."""
+        self.record_timings(job.get("timings"))
+        if job.get("decoder"):
+            self.inc("echotrace_decoder_total", decoder=job["decoder"])
+        if job.get("analysis_tier"):
+            self.inc("echotrace_analysis_tier_total", tier=job["analysis_tier"])
+        # features is None exactly when the pipeline answered with its safe fallback
+        if job.get("features") is None:
+            self.inc("echotrace_fallback_total", source=source)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: list(entry) for key, entry in self._histograms.items()}
+
+        lines = []
+        for name in sorted({key[0] for key in counters}):
+            lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} counter"]
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_labels(labels)} {value}")
+
+        for name in sorted({key[0] for key in histograms}):
+            lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} histogram"]
+            for (metric, labels), entry in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                for bound, count in zip(self.buckets, entry):
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', repr(bound)),))} {count}")
+                lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {entry[-1]}")
+                lines.append(f"{name}_sum{_labels(labels)} {round(entry[-2], 6)}")
+                lines.append(f"{name}_count{_labels(labels)} {entry[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels) -> str:
+    if not labels:
+        return ""
+    escaped = [(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in labels]
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval (a poor man's py-spy)."""
+
+    def __init__(self, thread_id: int, interval: float, max_depth: int = 12):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self) -> collections.Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+
+@contextmanager
+def slow_request_profile(label: str):
+    """
+    Profile the enclosed block when PROFILE_SLOW_MS is set (and this call is
+    picked by PROFILE_SAMPLE_RATE); log its hottest stacks if it was slow.
+    """
+    if settings.PROFILE_SLOW_MS <= 0 or random.random() >= settings.PROFILE_SAMPLE_RATE:
+        yield
+        return
+
+    sampler = StackSampler(threading.get_ident(), settings.PROFILE_INTERVAL_MS / 1000.0).start()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = 1000 * (time.perf_counter() - started)
+        samples = sampler.stop()
+        if elapsed_ms >= settings.PROFILE_SLOW_MS and samples:
+            total = sum(samples.values())
+            hot = "".join(f"\n  {100 * count / total:5.1f}%  {stack}" for stack, count in samples.most_common(5))
+            logger.warning("[Slow request profile] %s: %.0f ms, %d samples%s", label, elapsed_ms, total, hot)
+
+
+# Singleton instance
+metrics = Metrics()
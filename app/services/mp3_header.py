@@ -0,0 +1,184 @@
+"""
+MP3 header sniffing: format, bitrate, sample rate, channels and an
+estimated duration from the ID3 and MPEG frame headers alone, without
+decoding any audio. Costs a few hundred bytes of reads, so the API can
+turn away non-audio and oversized clips before any expensive work.
+
+Duration: exact frame count from a Xing/Info or VBRI header when the
+encoder wrote one; otherwise a constant-bitrate estimate from the payload
+size (like libsndfile's).
+"""
+import binascii
+import os
+
+# kbps by (MPEG version 1 or 2/2.5, layer)
+_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Hz by version bits (0 = MPEG 2.5, 2 = MPEG 2, 3 = MPEG 1)
+_SAMPLE_RATES = {0: (11025, 12000, 8000), 2: (22050, 24000, 16000), 3: (44100, 48000, 32000)}
+
+ID3V2_HEADER_BYTES = 10
+ID3V1_TAG_BYTES = 128
+# How far past the ID3 tag to look for the first frame (encoders may leave junk)
+SYNC_SEARCH_BYTES = 16 * 1024
+
+
+def _frame_header(b: bytes):
+    """Decoded 4-byte MPEG audio frame header, or None if b isn't one."""
+    if len(b) < 4 or b[0] != 0xFF or (b[1] & 0xE0) != 0xE0:
+        return None
+    version_bits = (b[1] >> 3) & 0x03
+    layer = 4 - ((b[1] >> 1) & 0x03)
+    bitrate_index = b[2] >> 4
+    rate_index = (b[2] >> 2) & 0x03
+    if version_bits == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None  # reserved values (free-format bitrate is not supported)
+
+    version = 1 if version_bits == 3 else 2
+    bitrate = _BITRATES[(version, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version_bits][rate_index]
+    padding = (b[2] >> 1) & 0x01
+    if layer == 1:
+        samples, length = 384, (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 576 if (layer == 3 and version == 2) else 1152
+        length = samples // 8 * bitrate // sample_rate + padding
+    return {
+        "version": version,
+        "layer": layer,
+        "bitrate": bitrate,
+        "sample_rate": sample_rate,
+        "channels": 1 if (b[3] >> 6) == 3 else 2,
+        "samples_per_frame": samples,
+        "frame_bytes": length,
+    }
+
+
+def _vbr_frame_count(frame: bytes, header: dict):
+    """Frame count from a Xing/Info or VBRI header inside the first frame, or None."""
+    if header["version"] == 1:
+        side_info = 17 if header["channels"] == 1 else 32
+    else:
+        side_info = 9 if header["channels"] == 1 else 17
+    xing = 4 + side_info
+    if frame[xing:xing + 4] in (b"Xing", b"Info") and len(frame) >= xing + 12:
+        flags = int.from_bytes(frame[xing + 4:xing + 8], "big")
+        if flags & 0x01:
+            return int.from_bytes(frame[xing + 8:xing + 12], "big")
+    if frame[36:40] == b"VBRI" and len(frame) >= 54:
+        return int.from_bytes(frame[50:54], "big")
+    return None
+
+
+def sniff_mp3(read, size: int):
+    """
+    MP3 stream info via read(offset, n) -> bytes over a payload of `size`
+    bytes. Returns {"bitrate", "sample_rate", "channels", "duration_us",
+    "vbr", "audio_offset"} or None when the payload is not MPEG audio.
+    """
+    offset = 0
+    head = read(0, ID3V2_HEADER_BYTES)
+    if head[:3] == b"ID3" and len(head) == ID3V2_HEADER_BYTES:
+        # Synchsafe size (7 bits per byte), plus the optional footer
+        tag_size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+        offset = ID3V2_HEADER_BYTES + tag_size + (10 if head[5] & 0x10 else 0)
+
+    window = read(offset, SYNC_SEARCH_BYTES)
+    for i in range(max(0, len(window) - 3)):
+        if window[i] != 0xFF:
+            continue
+        header = _frame_header(window[i:i + 4])
+        if header is None:
+            continue
+        # A second header right after the first rules out a stray 0xFFE pattern
+        start = offset + i
+        following = read(start + header["frame_bytes"], 4)
+        if len(following) == 4 and _frame_header(following) is None:
+            continue
+        break
+    else:
+        return None
+
+    frame = read(start, header["frame_bytes"])
+    frames = _vbr_frame_count(frame, header)
+    if frames is not None:
+        seconds = frames * header["samples_per_frame"] / header["sample_rate"]
+        audio_bytes = size - start - header["frame_bytes"]
+        bitrate = int(audio_bytes * 8 / seconds) if seconds > 0 else header["bitrate"]
+    else:
+        audio_bytes = size - start
+        if read(size - ID3V1_TAG_BYTES, 3) == b"TAG":
+            audio_bytes -= ID3V1_TAG_BYTES
+        bitrate = header["bitrate"]
+        seconds = audio_bytes * 8 / bitrate
+
+    return {
+        "bitrate": bitrate,
+        "sample_rate": header["sample_rate"],
+        "channels": header["channels"],
+        "duration_us": int(round(seconds * 1_000_000)),
+        "vbr": frames is not None,
+        "audio_offset": start,
+    }
+
+
+def sniff_mp3_bytes(data):
+    """sniff_mp3 over decoded bytes (any bytes-like object)."""
+    view = memoryview(data).cast("B")
+    return sniff_mp3(lambda offset, n: bytes(view[max(0, offset):max(0, offset + n)]), len(view))
+
+
+def sniff_mp3_file(path: str):
+    """sniff_mp3 over a file on disk (a few small seeks and reads)."""
+    with open(path, "rb") as f:
+        def read(offset, n):
+            f.seek(max(0, offset))
+            return f.read(max(0, n))
+        return sniff_mp3(read, os.fstat(f.fileno()).st_size)
+
+
+def base64_payload_size(audio_base64) -> int:
+    """
+    Decoded size of plain unwrapped base64 (str or bytes-like), from its
+    length and padding alone. Raises ValueError for other lengths.
+    """
+    n_chars = len(audio_base64)
+    if n_chars == 0 or n_chars % 4:
+        raise ValueError("Base64 payload is not addressable")
+    tail = audio_base64[-2:]
+    tail = tail.encode("ascii", errors="replace") if isinstance(tail, str) else bytes(tail)
+    padding = 2 if tail == b"==" else 1 if tail.endswith(b"=") else 0
+    return n_chars // 4 * 3 - padding
+
+
+def sniff_mp3_base64(audio_base64):
+    """
+    sniff_mp3 straight from the base64 payload (str or bytes-like): only the
+    few quartets covering the headers are decoded. Raises ValueError when
+    the payload isn't plain unwrapped base64 (offsets can't be mapped), so
+    callers can tell "unknown" from "not MP3" (None).
+    """
+    size = base64_payload_size(audio_base64)
+
+    def read(offset, n):
+        offset = max(0, offset)
+        end = min(size, offset + n)
+        if end <= offset:
+            return b""
+        first, last = offset // 3, -(-end // 3)
+        try:
+            decoded = binascii.a2b_base64(audio_base64[4 * first:4 * last])
+        except (binascii.Error, ValueError) as e:
+            raise ValueError("Base64 payload is not addressable") from e
+        # Whitespace or other skipped characters shift every later offset
+        if len(decoded) != min(size, 3 * last) - 3 * first:
+            raise ValueError("Base64 payload is not addressable")
+        return decoded[offset - 3 * first:end - 3 * first]
+
+    return sniff_mp3(read, size)
@@ -0,0 +1,94 @@
+"""
+Streaming multipart/form-data parsing for /api/voice-detection/stream.
+
+request.form() reads the whole upload into a spooled temp file before the
+route sees a byte, so STREAM_MAX_BYTES could only be checked afterwards.
+iter_multipart_file feeds the body to the multipart parser chunk by chunk
+and yields the file part's bytes as they arrive, so the caller counts (and
+rejects) them while the client is still sending. Only the named text fields
+are kept, each capped at MAX_FIELD_BYTES; other parts are discarded.
+"""
+try:
+    from python_multipart.exceptions import MultipartParseError
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.exceptions import MultipartParseError
+    from multipart.multipart import MultipartParser, parse_options_header
+
+from .request_body import RequestBodyError
+
+MAX_FIELD_BYTES = 1024
+
+
+async def iter_multipart_file(stream, content_type: str, name: str, fields: dict):
+    """
+    Yield the bytes of file part `name` from a multipart body (`stream`: async
+    iterator of raw chunks). Text parts whose names are keys of `fields`
+    overwrite their values there. Raises RequestBodyError for a malformed
+    body, an oversized field or a missing file part.
+    """
+    _, params = parse_options_header(content_type)
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise RequestBodyError("Missing boundary in multipart body")
+
+    state = {"headers": {}, "header": b"", "value": b"", "part": None, "data": bytearray(), "found": False}
+    pieces = []
+
+    def on_part_begin():
+        state["headers"] = {}
+        state["data"] = bytearray()
+
+    def on_header_field(data, start, end):
+        state["header"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        state["value"] += data[start:end]
+
+    def on_header_end():
+        state["headers"][state["header"].lower()] = state["value"]
+        state["header"], state["value"] = b"", b""
+
+    def on_headers_finished():
+        _, options = parse_options_header(state["headers"].get(b"content-disposition", b""))
+        part_name = options.get(b"name", b"").decode("latin-1")
+        if part_name == name and b"filename" in options:
+            state["part"] = "file"
+            state["found"] = True
+        elif part_name in fields:
+            state["part"] = part_name
+        else:
+            state["part"] = None
+
+    def on_part_data(data, start, end):
+        if state["part"] == "file":
+            pieces.append(bytes(data[start:end]))
+        elif state["part"] is not None:
+            state["data"] += data[start:end]
+            if len(state["data"]) > MAX_FIELD_BYTES:
+                raise RequestBodyError(f"Form field '{state['part']}' is too long")
+
+    def on_part_end():
+        if state["part"] not in (None, "file"):
+            fields[state["part"]] = state["data"].decode("utf-8", errors="replace")
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+    })
+    try:
+        async for chunk in stream:
+            parser.write(chunk)
+            for piece in pieces:
+                yield piece
+            pieces.clear()
+        parser.finalize()
+    except MultipartParseError as e:
+        raise RequestBodyError(f"Malformed multipart body: {e}") from e
+    if not state["found"]:
+        raise RequestBodyError(f"Multipart upload needs an '{name}' file field")
@@ -0,0 +1,227 @@
+# pitch_analyzer.py
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from app.config import settings
+from app.lazy import lazy_import
+from .vad import voice_activity, voiced_runs
+
+librosa = lazy_import("librosa")
+
+# pyin defaults (librosa): frame_length=2048, hop_length=frame_length // 4, center=True
+PYIN_FRAME_LENGTH = 2048
+PYIN_HOP_LENGTH = PYIN_FRAME_LENGTH // 4
+
+# librosa.note_to_hz("C2") / ("C7"), spelled out so importing this module
+# does not load librosa
+PYIN_FMIN = 65.40639132514966
+PYIN_FMAX = 2093.004522404789
+
+# Typical speaking F0 range; used by the band-limited estimators
+SPEECH_FMIN = 65.0   # ~C2
+SPEECH_FMAX = 500.0  # ~B4
+
+
+class PitchTrack:
+    """
+    F0 track computed once per clip and shared by every pitch-based feature.
+    Frame t is centred on sample t * hop_length (librosa center=True framing).
+    """
+
+    def __init__(self, f0: np.ndarray, sr: int, hop_length: int = PYIN_HOP_LENGTH):
+        self.f0 = f0
+        self.sr = sr
+        self.hop_length = hop_length
+
+    def voiced(self) -> np.ndarray:
+        """F0 values of voiced frames (unvoiced frames are NaN)."""
+        return self.f0[~np.isnan(self.f0)]
+
+    def variance(self) -> float:
+        vals = self.voiced()
+        return float(np.var(vals)) if vals.size > 0 else 0.0
+
+    def slice_samples(self, start: int, end: int) -> np.ndarray:
+        """F0 frames whose centres fall inside the sample range [start, end)."""
+        first = -(-start // self.hop_length)
+        last = -(-end // self.hop_length)
+        return self.f0[first:last]
+
+
+class PitchEstimator(ABC):
+    """
+    Base class for F0 backends.
+    estimate() returns one F0 value (Hz) per PYIN_HOP_LENGTH frame,
+    NaN for unvoiced frames, on librosa's center=True frame grid.
+    min_skip_sec: shortest silence worth a separate estimate() call on each
+    side of it under VAD gating (the backend's per-call setup cost, in audio seconds).
+    """
+    name = "base"
+    min_skip_sec = 0.0
+
+    @abstractmethod
+    def estimate(self, y: np.ndarray, sr: int) -> np.ndarray:
+        ...
+
+
+class PyinEstimator(PitchEstimator):
+    """librosa.pyin (probabilistic YIN + Viterbi decoding)."""
+    # Each call builds the Viterbi transition matrix: ~0.6 s of audio worth of work
+    min_skip_sec = 0.6
+
+    def __init__(self, name: str, fmin: float, fmax: float):
+        self.name = name
+        self.fmin = fmin
+        self.fmax = fmax
+
+    def estimate(self, y: np.ndarray, sr: int) -> np.ndarray:
+        f0, _, _ = librosa.pyin(y, fmin=self.fmin, fmax=self.fmax, sr=sr)
+        return f0
+
+
+class YinEstimator(PitchEstimator):
+    """
+    Vectorized NumPy YIN: FFT autocorrelation over all frames at once,
+    cumulative mean normalized difference, absolute-threshold dip picking
+    and parabolic interpolation. Frames with no dip below `threshold`
+    are reported unvoiced (NaN), like pyin.
+    """
+    name = "yin"
+
+    def __init__(self, fmin: float = SPEECH_FMIN, fmax: float = SPEECH_FMAX,
+                 threshold: float = 0.15, block_frames: int = 512):
+        self.fmin = fmin
+        self.fmax = fmax
+        self.threshold = threshold
+        self.block_frames = block_frames
+
+    def estimate(self, y: np.ndarray, sr: int) -> np.ndarray:
+        frame_length = PYIN_FRAME_LENGTH
+        hop_length = PYIN_HOP_LENGTH
+        win_length = frame_length // 2
+
+        min_period = max(int(np.floor(sr / self.fmax)), 1)
+        max_period = min(int(np.ceil(sr / self.fmin)), frame_length - win_length - 1)
+
+        y = np.asarray(y, dtype=np.float32)
+        padded = np.pad(y, frame_length // 2, mode="constant")
+        frames = np.lib.stride_tricks.sliding_window_view(padded, frame_length)[::hop_length]
+        n_frames = 1 + len(y) // hop_length
+        frames = frames[:n_frames]
+
+        f0 = np.empty(n_frames, dtype=np.float64)
+        # Bound temporary FFT buffers on long clips
+        for start in range(0, n_frames, self.block_frames):
+            block = frames[start:start + self.block_frames]
+            f0[start:start + len(block)] = self._estimate_block(
+                block, sr, win_length, min_period, max_period
+            )
+        return f0
+
+    def _estimate_block(self, frames, sr, win_length, min_period, max_period):
+        n_fft = 1 << int(np.ceil(np.log2(frames.shape[1] + win_length)))
+
+        # r(tau) = sum_{j < W} x[j] * x[j + tau]
+        spec = np.fft.rfft(frames, n_fft, axis=1)
+        head = np.fft.rfft(frames[:, :win_length], n_fft, axis=1)
+        acf = np.fft.irfft(np.conj(head) * spec, n_fft, axis=1)[:, :max_period + 1]
+
+        # e(tau) = sum_{j < W} x[j + tau]^2
+        energy = np.cumsum(np.square(frames, dtype=np.float64), axis=1)
+        energy = np.concatenate([np.zeros((len(frames), 1)), energy], axis=1)
+        taus = np.arange(max_period + 1)
+        window_energy = energy[:, taus + win_length] - energy[:, taus]
+
+        diff = window_energy[:, :1] + window_energy - 2.0 * acf
+        diff[:, 0] = 0.0
+        np.maximum(diff, 0.0, out=diff)
+
+        cumulative = np.cumsum(diff[:, 1:], axis=1) / taus[1:]
+        cmnd = np.ones_like(diff)
+        cmnd[:, 1:] = diff[:, 1:] / (cumulative + np.finfo(np.float64).tiny)
+
+        # First local minimum below the threshold inside [min_period, max_period]
+        core = cmnd[:, min_period:max_period]
+        left = cmnd[:, min_period - 1:max_period - 1]
+        right = cmnd[:, min_period + 1:max_period + 1]
+        dips = (core < self.threshold) & (core <= left) & (core < right)
+        voiced = dips.any(axis=1)
+        tau = np.argmax(dips, axis=1) + min_period
+
+        # Parabolic interpolation around the chosen lag
+        rows = np.arange(len(frames))
+        a, b, c = cmnd[rows, tau - 1], cmnd[rows, tau], cmnd[rows, tau + 1]
+        denom = a - 2.0 * b + c
+        curved = np.abs(denom) > 1e-12
+        shift = np.where(curved, 0.5 * (a - c) / np.where(curved, denom, 1.0), 0.0)
+        period = tau + np.clip(shift, -1.0, 1.0)
+
+        # Silent frames carry no pitch
+        voiced &= window_energy[:, 0] > 1e-6
+
+        return np.where(voiced, sr / period, np.nan)
+
+
+PITCH_ESTIMATORS = {
+    # Current behavior: six-octave pyin
+    "pyin": PyinEstimator("pyin", PYIN_FMIN, PYIN_FMAX),
+    # pyin restricted to the speech range: fewer pitch bins for Viterbi
+    "pyin_speech": PyinEstimator("pyin_speech", SPEECH_FMIN, SPEECH_FMAX),
+    "yin": YinEstimator(),
+}
+
+
+def get_pitch_estimator(name: str = None) -> PitchEstimator:
+    """Look up a backend by name (defaults to settings.PITCH_BACKEND)."""
+    name = (name or settings.PITCH_BACKEND).strip().lower()
+    if name not in PITCH_ESTIMATORS:
+        raise ValueError(f"Unknown pitch backend '{name}'. Allowed: {sorted(PITCH_ESTIMATORS)}")
+    return PITCH_ESTIMATORS[name]
+
+
+def estimate_voiced(estimator: PitchEstimator, padded: np.ndarray, sr: int, voiced: np.ndarray) -> np.ndarray:
+    """
+    F0 for the voiced frames (mask over the frame grid), NaN for all others.
+    padded holds PYIN_FRAME_LENGTH // 2 samples of context before frame 0,
+    so frame f is centred on padded[f * hop + frame // 2] and each voiced
+    run is estimated with the same samples around it as a whole-clip pass
+    would see. Gaps shorter than estimator.min_skip_sec are estimated
+    through (one call instead of two) and masked afterwards.
+    """
+    min_gap = int(estimator.min_skip_sec * sr / PYIN_HOP_LENGTH)
+    # The estimator's own centred framing puts a run's first frame at index `offset`
+    offset = (PYIN_FRAME_LENGTH // 2) // PYIN_HOP_LENGTH
+    f0 = np.full(len(voiced), np.nan)
+    for first, end in voiced_runs(voiced, min_gap):
+        segment = padded[first * PYIN_HOP_LENGTH:(end - 1) * PYIN_HOP_LENGTH + PYIN_FRAME_LENGTH]
+        f0[first:end] = estimator.estimate(segment, sr)[offset:offset + end - first]
+    f0[~voiced] = np.nan
+    return f0
+
+
+def track_pitch(y: np.ndarray, sr: int, backend: str = None, voiced=None) -> PitchTrack:
+    """
+    Run the configured pitch estimator over the waveform's voiced runs
+    (vad; voiced is the frame mask, computed here when not supplied).
+    Frames outside them are unvoiced (NaN). With VAD disabled the whole
+    waveform is estimated in one pass.
+    Returns a PitchTrack, or None if pitch estimation failed.
+    """
+    if y is None or len(y) == 0:
+        return None
+
+    estimator = get_pitch_estimator(backend)
+    if voiced is None:
+        voiced = voice_activity(y, sr)
+    try:
+        if voiced is None:
+            f0 = estimator.estimate(y, sr)
+        else:
+            # The VAD grid (spectral 2048/512 framing) is the estimator's frame grid
+            padded = np.pad(np.asarray(y, dtype=np.float32), PYIN_FRAME_LENGTH // 2)
+            f0 = estimate_voiced(estimator, padded, sr, voiced)
+    except Exception:
+        return None
+
+    return PitchTrack(f0, sr)
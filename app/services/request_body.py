@@ -0,0 +1,111 @@
+"""
+Low-copy parsing of /api/voice-detection request bodies.
+
+Validating the body as a VoiceAnalysisRequest materializes the audio as a
+str as large as the body, and each later stage (emptiness check, digest,
+header sniff, decode, lightweight fallback) copied or re-decoded it.
+parse_voice_request reads the raw body once instead: the audioBase64
+value is located in place (base64 never needs JSON escapes), only the
+small remainder of the document goes through the JSON parser, and the
+value is base64-decoded once, straight from a view of the body. Every
+downstream stage gets those decoded bytes. read_voice_request stops short
+of the decode, so the route can sniff the MP3 headers from the base64
+value and turn away oversized clips before paying for it.
+
+Bodies the fast path can't vouch for (escaped characters in the audio
+value, a repeated or nested audioBase64 key) are parsed in full, with the
+same validation and results.
+"""
+import binascii
+import re
+
+import orjson
+
+# Top-level key followed by the opening quote of its value
+_AUDIO_VALUE = re.compile(rb'[{,]\s*"audioBase64"\s*:\s*"')
+# Allowed between quartets (line-wrapped base64); any other non-alphabet character is an error
+_BASE64_WHITESPACE = b" \t\r\n"
+
+
+class RequestBodyError(ValueError):
+    """The body is not a well-formed voice-detection request (HTTP 422)."""
+
+
+def parse_voice_request(raw: bytes) -> dict:
+    """
+    {"language", "audioFormat", "audio"} from a raw JSON body, "audio"
+    being the decoded audio bytes. Raises RequestBodyError for malformed
+    JSON, missing or non-string fields and invalid base64.
+    """
+    body = read_voice_request(raw)
+    return {
+        "language": body["language"],
+        "audioFormat": body["audioFormat"],
+        "audio": decode_audio_base64(body["audioBase64"])
+    }
+
+
+def read_voice_request(raw: bytes) -> dict:
+    """
+    parse_voice_request without the base64 decode: "audioBase64" is the
+    still-encoded value (a view of `raw` on the fast path, else a str).
+    """
+    doc, audio = _parse_fast(raw)
+    if doc is None:
+        doc, audio = _parse_full(raw)
+
+    for field in ("language", "audioFormat"):
+        if not isinstance(doc.get(field), str):
+            raise RequestBodyError(f"{field} must be a string")
+    return {"language": doc["language"], "audioFormat": doc["audioFormat"], "audioBase64": audio}
+
+
+def decode_audio_base64(audio) -> bytes:
+    """
+    Strict base64 decode of an audioBase64 value: line breaks and spaces
+    between characters are allowed, anything else outside the alphabet
+    raises RequestBodyError (a2b_base64 alone would silently skip it).
+    """
+    try:
+        try:
+            return binascii.a2b_base64(audio, strict_mode=True)
+        except binascii.Error:
+            # Retry without whitespace: the copy is only made for wrapped values
+            data = audio.encode("ascii") if isinstance(audio, str) else bytes(audio)
+            stripped = data.translate(None, _BASE64_WHITESPACE)
+            if len(stripped) == len(data):
+                raise
+            return binascii.a2b_base64(stripped, strict_mode=True)
+    except (binascii.Error, ValueError) as e:
+        raise RequestBodyError("audioBase64 is not valid base64") from e
+
+
+def _parse_fast(raw: bytes):
+    """(document with audioBase64 blanked, view of the base64 chars), or (None, None)."""
+    match = _AUDIO_VALUE.search(raw)
+    if match is None:
+        return None, None
+    start = match.end()
+    end = raw.find(b'"', start)
+    if end < 0 or raw.find(b"\\", start, end) >= 0 or _AUDIO_VALUE.search(raw, end):
+        return None, None
+    try:
+        doc = orjson.loads(raw[:start] + raw[end:])
+    except orjson.JSONDecodeError:
+        return None, None
+    # The blanked value must be the document's own audioBase64
+    if not isinstance(doc, dict) or doc.get("audioBase64") != "":
+        return None, None
+    return doc, memoryview(raw)[start:end]
+
+
+def _parse_full(raw: bytes):
+    try:
+        doc = orjson.loads(raw)
+    except orjson.JSONDecodeError as e:
+        raise RequestBodyError(f"Malformed JSON body: {e}") from e
+    if not isinstance(doc, dict):
+        raise RequestBodyError("Request body must be a JSON object")
+    if not isinstance(doc.get("audioBase64"), str):
+        raise RequestBodyError("audioBase64 must be a string")
+    return doc, doc["audioBase64"]
@@ -0,0 +1,244 @@
+"""
+Content-addressed cache of final analysis results.
+Key = digest of the decoded audio bytes + canonical language + pipeline version,
+so retries, duplicate uploads and re-checks skip the whole pipeline.
+"""
+import base64
+import binascii
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from app.config import settings
+from app.services.feature_extractor import FEATURE_PIPELINE_VERSION, feature_settings_key
+from app.services.language_handler import validate_language
+
+
+def audio_digest(audio_bytes: bytes) -> str:
+    """Stable content hash of decoded audio bytes."""
+    return hashlib.blake2b(audio_bytes, digest_size=20).hexdigest()
+
+
+def digest_base64(audio_base64: str):
+    """audio_digest of a base64 payload; None if the payload can't be decoded."""
+    try:
+        return audio_digest(base64.b64decode(audio_base64))
+    except (binascii.Error, ValueError):
+        return None
+
+
+def make_cache_key(digest: str, language: str, mode: str = None) -> str:
+    """
+    Cache key for one analysis. Includes the pipeline version, the
+    feature-affecting settings (pitch backend, VAD) and the detection mode
+    so a new release or a settings / mode switch never serves stale
+    entries. mode: the detection mode that produced the answer (default
+    DETECTION_MODE).
+    """
+    return ":".join([
+        digest,
+        validate_language(language),
+        FEATURE_PIPELINE_VERSION,
+        feature_settings_key(),
+        (mode or settings.DETECTION_MODE).strip().lower()
+    ])
+
+
+class MemoryResultCache:
+    """In-process LRU cache with TTL and entry-count / byte-size limits."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.time():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[2])
+
+    def set(self, key: str, value: dict):
+        size = len(json.dumps(value))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.time() + self.ttl_seconds, size, dict(value))
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self._bytes
+        }
+
+
+class SqliteResultCache:
+    """
+    On-disk cache (sqlite) that survives restarts.
+    Same LRU/TTL/size semantics as MemoryResultCache; recency is tracked
+    with an accessed_at column.
+    """
+
+    def __init__(self, path: str, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed_at)")
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] < now:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return json.loads(row[0])
+
+    def set(self, key: str, value: dict):
+        payload = json.dumps(value)
+        if len(payload) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now + self.ttl_seconds, now)
+            )
+            self._conn.execute("DELETE FROM results WHERE expires_at < ?", (now,))
+            self._evict()
+
+    def _evict(self):
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        while count > self.max_entries or total > self.max_bytes:
+            # Drop the least recently used tenth (at least one row) per round
+            batch = max(1, count // 10)
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN"
+                " (SELECT key FROM results ORDER BY accessed_at LIMIT ?)", (batch,)
+            )
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+        return {
+            "backend": "sqlite",
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": count,
+            "bytes": total
+        }
+
+
+class NullResultCache:
+    """Cache disabled: every lookup misses."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: dict):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": "none", "hits": 0, "misses": self.misses, "entries": 0, "bytes": 0}
+
+
+def create_result_cache(backend: str = None):
+    """Build the cache selected by settings.RESULT_CACHE_BACKEND (memory / sqlite / none)."""
+    backend = (backend or settings.RESULT_CACHE_BACKEND).strip().lower()
+    if backend == "memory":
+        return MemoryResultCache(
+            settings.RESULT_CACHE_MAX_ENTRIES,
+            settings.RESULT_CACHE_MAX_BYTES,
+            settings.RESULT_CACHE_TTL
+        )
+    if backend == "sqlite":
+        return SqliteResultCache(
+            settings.RESULT_CACHE_PATH,
+            settings.RESULT_CACHE_MAX_ENTRIES,
+            settings.RESULT_CACHE_MAX_BYTES,
+            settings.RESULT_CACHE_TTL
+        )
+    if backend == "none":
+        return NullResultCache()
+    raise ValueError(f"Unknown result cache backend '{backend}'. Allowed: memory, sqlite, none")
+
+
+# Singleton instance
+result_cache = create_result_cache()
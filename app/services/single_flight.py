@@ -0,0 +1,61 @@
+"""
+Single-flight coalescing of identical in-flight analyses.
+
+A client that retries on timeout sends the same payload again while the
+first copy is still in the analysis pool. SingleFlight runs one computation
+per key (the result-cache key: audio digest + language + pipeline
+version) and hands its result to every concurrent caller, so N retries
+cost one pyin run.
+
+Callers await the shared task through asyncio.shield: a caller that is
+cancelled (client disconnect) leaves, but the computation keeps running
+for the others, and its work (e.g. the result-cache write inside it) is
+not lost when every caller has gone.
+"""
+import asyncio
+
+from app.services.metrics import metrics
+
+
+class SingleFlight:
+    def __init__(self):
+        self._flights = {}  # key -> asyncio.Task
+        self.leaders = 0
+        self.coalesced = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def run(self, key, factory):
+        """
+        Result of factory() (a coroutine function), shared with every
+        concurrent run() of the same key. key None disables coalescing.
+        Exceptions propagate to every caller.
+        """
+        if key is None:
+            return await factory()
+
+        task = self._flights.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(factory())
+            self._flights[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            self.coalesced += 1
+            metrics.inc("echotrace_coalesced_total")
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved: nobody may be left to await it
+
+    def stats(self) -> dict:
+        return {"in_flight": self.in_flight, "leaders": self.leaders, "coalesced": self.coalesced}
+
+
+# Singleton instance
+single_flight = SingleFlight()
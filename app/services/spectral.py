@@ -0,0 +1,153 @@
+"""
+Shared spectral analysis for the feature extractors.
+
+SpectralContext frames a waveform once (librosa's centred 2048/512 framing)
+and derives everything the features need from that one pass:
+
+  frames ──┬── rms                       (librosa.feature.rms)
+           └── |STFT|² ── mel ── log-mel ──┬── onset envelope (librosa.onset.onset_strength)
+                                           └── MFCC           (librosa.feature.mfcc)
+
+so a clip costs one STFT instead of one per librosa call. With a voiced
+mask (vad.py) the STFT and everything after it cover only voiced frames. Mel filterbanks,
+DCT matrices and windows are built once per parameter set and reused across
+requests. Intermediates are float32.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from app.lazy import lazy_import
+
+librosa = lazy_import("librosa")
+scipy_fft = lazy_import("scipy.fft")
+
+N_FFT = 2048
+HOP_LENGTH = 512
+N_MELS = 128
+N_MFCC = 13
+TOP_DB = 80.0
+# Frame RMS under this is silence: the pause feature, long-audio speech windows
+# and (unless VAD_RMS_THRESHOLD overrides it) the VAD all use it
+SILENCE_RMS = 0.01
+AMIN = 1e-10
+# onset_strength(lag=1) pads lag + n_fft // (2 * hop) zeros in front
+ONSET_PAD = 1 + N_FFT // (2 * HOP_LENGTH)
+
+
+@lru_cache(maxsize=8)
+def hann_window(n_fft: int = N_FFT) -> np.ndarray:
+    window = librosa.filters.get_window("hann", n_fft, fftbins=True).astype(np.float32)
+    window.flags.writeable = False
+    return window
+
+
+@lru_cache(maxsize=8)
+def mel_basis(sr: int, n_fft: int = N_FFT, n_mels: int = N_MELS) -> np.ndarray:
+    """librosa.filters.mel (slaney), shape (n_mels, 1 + n_fft // 2)."""
+    basis = librosa.filters.mel(sr=sr, n_fft=n_fft, n_mels=n_mels).astype(np.float32)
+    basis.flags.writeable = False
+    return basis
+
+
+@lru_cache(maxsize=8)
+def dct_matrix(n_mels: int = N_MELS, n_mfcc: int = N_MFCC) -> np.ndarray:
+    """Orthonormal DCT-II rows as used by librosa.feature.mfcc, shape (n_mfcc, n_mels)."""
+    matrix = scipy_fft.dct(np.eye(n_mels, dtype=np.float32), type=2, norm="ortho", axis=0)[:n_mfcc]
+    matrix.flags.writeable = False
+    return matrix
+
+
+def power_to_db(mel: np.ndarray, top_db: float = TOP_DB, floor_db: float = None) -> np.ndarray:
+    """
+    librosa.power_to_db(ref=1.0): 10·log10 with an `top_db` floor below the
+    peak. floor_db overrides the peak-derived floor (streaming uses a running peak).
+    """
+    log_mel = 10.0 * np.log10(np.maximum(np.float32(AMIN), mel))
+    if floor_db is None:
+        floor_db = float(log_mel.max()) - top_db
+    return np.maximum(log_mel, np.float32(floor_db))
+
+
+def onset_diffs(log_mel: np.ndarray) -> np.ndarray:
+    """Mean positive first difference across mel bands (lag 1), one value per frame pair."""
+    return np.mean(np.maximum(0.0, np.diff(log_mel, axis=-1)), axis=-2)
+
+
+def onset_envelope(log_mel: np.ndarray) -> np.ndarray:
+    """librosa.onset.onset_strength(S=log_mel) with its defaults."""
+    n_frames = log_mel.shape[-1]
+    envelope = np.concatenate([np.zeros(ONSET_PAD, dtype=log_mel.dtype), onset_diffs(log_mel)])
+    return envelope[:n_frames]
+
+
+def mfcc(log_mel: np.ndarray, n_mfcc: int = N_MFCC) -> np.ndarray:
+    """librosa.feature.mfcc(S=log_mel), shape (n_mfcc, n_frames)."""
+    return dct_matrix(log_mel.shape[-2], n_mfcc) @ log_mel
+
+
+def mel_power(frames: np.ndarray, sr: int, n_fft: int = N_FFT) -> np.ndarray:
+    """Power mel spectrogram of frames (..., n_frames, n_fft) → (..., n_mels, n_frames)."""
+    spectrum = np.fft.rfft(frames * hann_window(n_fft), axis=-1)
+    power = np.square(spectrum.real) + np.square(spectrum.imag)
+    return np.swapaxes(power.astype(np.float32, copy=False) @ mel_basis(sr, n_fft).T, -1, -2)
+
+
+def frame_signal(y: np.ndarray, n_fft: int = N_FFT, hop_length: int = HOP_LENGTH) -> np.ndarray:
+    """
+    Centred, zero-padded frames of y (..., n_samples) → (..., 1 + n // hop, n_fft),
+    a strided view of one padded copy.
+    """
+    pad = [(0, 0)] * (y.ndim - 1) + [(n_fft // 2, n_fft // 2)]
+    padded = np.pad(np.asarray(y, dtype=np.float32), pad)
+    return np.lib.stride_tricks.sliding_window_view(padded, n_fft, axis=-1)[..., ::hop_length, :]
+
+
+class SpectralContext:
+    """
+    One framing + one STFT of y (1-D clip or (n_clips, n_samples) batch),
+    shared by RMS, onset strength and MFCC. Arrays follow librosa's layout:
+    rms (..., n_frames), mel (..., n_mels, n_frames).
+
+    voiced: optional frame mask of a 1-D clip (set before the first mel
+    access); mel and everything derived from it then hold the voiced
+    frames only, in order. rms always covers every frame.
+    """
+
+    def __init__(self, y: np.ndarray, sr: int, n_fft: int = N_FFT, hop_length: int = HOP_LENGTH):
+        self.sr = sr
+        self.n_fft = n_fft
+        self.frames = frame_signal(y, n_fft, hop_length)
+        self.voiced = None
+        self._rms = None
+        self._mel = None
+        self._log_mel = None
+
+    @property
+    def rms(self) -> np.ndarray:
+        if self._rms is None:
+            self._rms = np.sqrt(np.mean(np.square(self.frames), axis=-1))
+        return self._rms
+
+    @property
+    def mel(self) -> np.ndarray:
+        """Power mel spectrogram (librosa.feature.melspectrogram)."""
+        if self._mel is None:
+            frames = self.frames if self.voiced is None else self.frames[self.voiced]
+            self._mel = mel_power(frames, self.sr, self.n_fft)
+        return self._mel
+
+    @property
+    def log_mel(self) -> np.ndarray:
+        """power_to_db(mel) for a single clip (batches scale per clip, see extract_voice_features_batch)."""
+        if self._log_mel is None:
+            self._log_mel = power_to_db(self.mel)
+        return self._log_mel
+
+    @property
+    def onset_envelope(self) -> np.ndarray:
+        return onset_envelope(self.log_mel)
+
+    @property
+    def mfcc(self) -> np.ndarray:
+        return mfcc(self.log_mel)
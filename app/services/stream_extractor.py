@@ -0,0 +1,264 @@
+"""
+Streaming feature extraction with memory bounded by one analysis block.
+
+StreamingFeatureExtractor consumes successive mono float32 blocks and keeps
+only running statistics, so peak memory does not grow with clip length.
+It reproduces extract_voice_features + pitch_temporal_consistency frame by
+frame (same 2048/512 centred framing, Hann STFT, 128-band mel, 13 MFCCs):
+
+  - pause_ratio, duration_seconds: exact
+  - pitch_variance / pitch_consistency: exact for frame-local backends (yin);
+    pyin is decoded per block, so Viterbi context stops at block edges
+  - rhythm_variance, spectral_smoothness: the 80 dB floor of power_to_db is
+    taken from the running peak instead of the whole-clip peak, which only
+    moves bins more than 80 dB below the loudest frame
+
+Voice-activity gating (vad.py) is causal, so the voiced-frame mask, and
+with it which frames reach the pitch estimator, onset strength and MFCC,
+is the whole-clip one.
+"""
+import numpy as np
+
+from app.config import settings
+from .feature_extractor import _round_features
+from .pitch_analyzer import estimate_voiced, get_pitch_estimator
+from .spectral import (
+    HOP_LENGTH, N_FFT, ONSET_PAD, SILENCE_RMS, TOP_DB,
+    dct_matrix, hann_window, mel_basis, onset_diffs, power_to_db,
+)
+from .temporal_analyzer import consistency_verdict
+from .vad import active_frames, apply_hangover, hangover_frames
+
+
+class RunningStats:
+    """Welford / Chan running mean and population variance."""
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        n = values.size
+        if n == 0:
+            return
+        batch_mean = float(values.mean())
+        batch_m2 = float(np.sum(np.square(values - batch_mean)))
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += batch_m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count > 0 else 0.0
+
+
+class StreamingFeatureExtractor:
+    def __init__(self, sr: int = 16000, block_frames: int = 256, chunk_sec: float = None,
+                 pitch_backend: str = None):
+        # Chunks for pitch_consistency never overlap here (TEMPORAL_CHUNK_OVERLAP
+        # applies to whole-clip analysis only)
+        self.sr = sr
+        self.block_frames = block_frames
+        self.chunk_size = int((settings.TEMPORAL_CHUNK_SEC if chunk_sec is None else chunk_sec) * sr)
+        self.estimator = get_pitch_estimator(pitch_backend)
+        self.vad = settings.VAD_ENABLED
+        self._hangover = hangover_frames(sr)
+        # Activity of the last hangover frames, carried into the next block
+        self._active_tail = np.zeros(0, dtype=bool)
+
+        self._window = hann_window()
+        self._mel_basis = mel_basis(sr)
+        self._dct = dct_matrix()
+
+        # centre=True framing: the stream starts with N_FFT // 2 zeros
+        self._buffer = np.zeros(N_FFT // 2, dtype=np.float32)
+        self._next_frame = 0
+        self.n_samples = 0
+
+        self._silent_frames = 0
+        self._pitch = RunningStats()
+        self._onset = RunningStats()
+        self._onset_pending = []
+        self._log_mel_peak = -np.inf
+        self._prev_log_mel = None
+        self._prev_mfcc = None
+        self._mfcc_diff_sum = 0.0
+        self._mfcc_diff_count = 0
+        self._mfcc_abs_sum = 0.0
+        self._mfcc_count = 0
+
+        self._chunk_index = 0
+        self._chunk_pitch = RunningStats()
+        self._chunk_variances = []
+
+    @property
+    def frames(self) -> int:
+        """Frames analyzed so far."""
+        return self._next_frame
+
+    def push(self, y_block: np.ndarray):
+        """Feed the next block of mono float32 samples at self.sr."""
+        y_block = np.asarray(y_block, dtype=np.float32)
+        if y_block.size == 0:
+            return
+        self._buffer = np.concatenate([self._buffer, y_block])
+        self.n_samples += y_block.size
+        while self._complete_frames() >= self.block_frames:
+            self._process(self.block_frames)
+
+    def finalize(self) -> dict:
+        """
+        Flush the tail and return the same dict as extract_voice_features,
+        plus "pitch_consistency".
+        """
+        if self.n_samples == 0:
+            raise ValueError("Empty waveform provided")
+
+        total_frames = 1 + self.n_samples // HOP_LENGTH
+        remaining = total_frames - self._next_frame
+        if remaining > 0:
+            needed = (remaining - 1) * HOP_LENGTH + N_FFT
+            if len(self._buffer) < needed:
+                self._buffer = np.pad(self._buffer, (0, needed - len(self._buffer)))
+            self._process(remaining)
+
+        features = self._features(total_frames)
+        features["pitch_consistency"] = self._pitch_consistency()
+        return features
+
+    def snapshot(self):
+        """
+        Features of the frames analyzed so far, without ending the stream;
+        None before the first block. pitch_consistency covers finished chunks.
+        """
+        if self._next_frame == 0:
+            return None
+        features = self._features(self._next_frame)
+        features["pitch_consistency"] = consistency_verdict(self._chunk_variances)
+        return features
+
+    def _features(self, n_frames: int) -> dict:
+        return _round_features(
+            self.n_samples / float(self.sr),
+            self._pitch.variance,
+            self._onset.variance,
+            self._silent_frames / n_frames,
+            self._spectral_smoothness()
+        )
+
+    def _complete_frames(self) -> int:
+        if len(self._buffer) < N_FFT:
+            return 0
+        return (len(self._buffer) - N_FFT) // HOP_LENGTH + 1
+
+    def _process(self, n_frames: int):
+        segment = self._buffer[:(n_frames - 1) * HOP_LENGTH + N_FFT]
+        frames = np.lib.stride_tricks.sliding_window_view(segment, N_FFT)[::HOP_LENGTH][:n_frames]
+        first = self._next_frame
+
+        # Pause ratio: RMS over the raw frame (librosa.feature.rms)
+        rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+        self._silent_frames += int(np.sum(rms < SILENCE_RMS))
+        voiced = self._voiced(rms, frames)
+
+        # Log-mel shared by onset strength and MFCC, voiced frames only
+        selected = frames if voiced is None else frames[voiced]
+        if len(selected) > 0:
+            spectrum = np.fft.rfft(selected * self._window, axis=1)
+            mel = self._mel_basis @ (np.square(spectrum.real) + np.square(spectrum.imag)).T
+            log_mel = power_to_db(mel, floor_db=-np.inf)
+            self._log_mel_peak = max(self._log_mel_peak, float(log_mel.max()))
+            log_mel = np.maximum(log_mel, np.float32(self._log_mel_peak - TOP_DB))
+
+            self._push_onset(log_mel)
+            self._push_mfcc(self._dct @ log_mel)
+        self._push_pitch(segment, first, n_frames, voiced)
+
+        self._next_frame += n_frames
+        self._buffer = self._buffer[n_frames * HOP_LENGTH:].copy()
+
+    def _voiced(self, rms: np.ndarray, frames: np.ndarray):
+        """Voiced mask of this block's frames (vad.voiced_frames, continued across blocks); None with VAD off."""
+        if not self.vad:
+            return None
+        active = np.concatenate([self._active_tail, active_frames(rms, frames)])
+        voiced = apply_hangover(active, self._hangover)[len(self._active_tail):]
+        self._active_tail = active[len(active) - self._hangover:]
+        return voiced
+
+    def _push_onset(self, log_mel: np.ndarray):
+        # librosa.onset.onset_strength: ONSET_PAD leading zeros, then mean
+        # positive first difference, trimmed to the frame count
+        if self._prev_log_mel is None:
+            self._onset_pending = [0.0] * ONSET_PAD
+            diffs = onset_diffs(log_mel)
+        else:
+            diffs = onset_diffs(np.concatenate([self._prev_log_mel, log_mel], axis=1))
+        self._prev_log_mel = log_mel[:, -1:]
+
+        # Padding makes the envelope 2 values longer than the frame count and
+        # the trim drops the last 2, so values are committed 2 frames late
+        queue = np.concatenate([np.asarray(self._onset_pending), diffs])
+        self._onset.push(queue[:-2])
+        self._onset_pending = list(queue[-2:])
+
+    def _push_mfcc(self, mfcc: np.ndarray):
+        stacked = mfcc if self._prev_mfcc is None else np.concatenate([self._prev_mfcc, mfcc], axis=1)
+        diffs = np.mean(np.abs(np.diff(stacked, axis=1)), axis=0)
+        self._mfcc_diff_sum += float(np.sum(diffs))
+        self._mfcc_diff_count += diffs.size
+        self._mfcc_abs_sum += float(np.sum(np.abs(mfcc)))
+        self._mfcc_count += mfcc.size
+        self._prev_mfcc = mfcc[:, -1:]
+
+    def _push_pitch(self, segment: np.ndarray, first: int, n_frames: int, voiced):
+        # The segment starts N_FFT // 2 samples before frame `first`, as estimate_voiced expects
+        if voiced is None:
+            voiced = np.ones(n_frames, dtype=bool)
+        try:
+            f0 = estimate_voiced(self.estimator, segment, self.sr, voiced)
+        except Exception:
+            f0 = np.full(n_frames, np.nan)
+
+        voiced = ~np.isnan(f0)
+        self._pitch.push(f0[voiced])
+
+        # Per-chunk stats for pitch_temporal_consistency (frame centre decides the
+        # chunk; a centre on the very last sample belongs to no chunk)
+        centres = np.arange(first, first + n_frames) * HOP_LENGTH
+        in_clip = centres < self.n_samples
+        chunks = centres // self.chunk_size
+        for chunk in np.unique(chunks[in_clip]):
+            if chunk != self._chunk_index:
+                self._close_chunk()
+                self._chunk_index = int(chunk)
+            self._chunk_pitch.push(f0[(chunks == chunk) & voiced & in_clip])
+
+    def _close_chunk(self):
+        self._chunk_variances.append(self._chunk_pitch.variance if self._chunk_pitch.count > 0 else None)
+        self._chunk_pitch = RunningStats()
+
+    def _pitch_consistency(self) -> str:
+        # Chunks shorter than half a chunk are ignored, as in pitch_temporal_consistency
+        n_chunks = sum(
+            1 for start in range(0, self.n_samples, self.chunk_size)
+            if min(self.chunk_size, self.n_samples - start) > self.chunk_size // 2
+        )
+        last_start = self._chunk_index * self.chunk_size
+        if self.n_samples - last_start > self.chunk_size // 2:
+            self._close_chunk()
+
+        # Chunks without a voiced frame never closed: unvoiced
+        variances = self._chunk_variances[:n_chunks]
+        return consistency_verdict(variances + [None] * (n_chunks - len(variances)))
+
+    def _spectral_smoothness(self) -> float:
+        mean_diff = self._mfcc_diff_sum / self._mfcc_diff_count if self._mfcc_diff_count else 0.0
+        mean_mfcc = (self._mfcc_abs_sum / self._mfcc_count if self._mfcc_count else 0.0) + 1e-9
+        return float(np.clip(1.0 - mean_diff / mean_mfcc, 0.0, 1.0))
+
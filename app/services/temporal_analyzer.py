@@ -1,51 +1,115 @@
 import numpy as np
-import librosa
+
+from app.config import settings
+from .pitch_analyzer import track_pitch
 
 # Simple, explainable heuristics (safe for judges)
 PITCH_AI_THRESHOLD = 0.12
 CONSISTENCY_RATIO = 0.75
 
 
-def pitch_temporal_consistency(y, sr, chunk_sec=1.5):
+def chunk_bounds(n_samples: int, sr: int, chunk_sec: float = None, overlap: float = None):
+    """
+    (start, end) sample ranges of the analysis chunks. Consecutive chunks
+    overlap by `overlap` (fraction of a chunk, 0 <= overlap < 1); chunks
+    shorter than half a chunk are dropped.
+    """
+    chunk_sec = settings.TEMPORAL_CHUNK_SEC if chunk_sec is None else chunk_sec
+    overlap = settings.TEMPORAL_CHUNK_OVERLAP if overlap is None else overlap
+    if not 0.0 <= overlap < 1.0:
+        raise ValueError("overlap must be in [0, 1)")
+
+    chunk_size = int(chunk_sec * sr)
+    step = max(1, int(round(chunk_size * (1.0 - overlap))))
+    return [
+        (start, min(start + chunk_size, n_samples))
+        for start in range(0, n_samples, step)
+        if min(chunk_size, n_samples - start) > chunk_size // 2
+    ]
+
+
+def consistency_verdict(chunk_variances) -> str:
+    """
+    Verdict over per-chunk F0 variances (None for unvoiced chunks):
+    INCONCLUSIVE under two chunks, CONSISTENT when at least
+    CONSISTENCY_RATIO of them are AI-like, else INCONSISTENT.
+    """
+    if len(chunk_variances) < 2:
+        return "INCONCLUSIVE"
+    ai_like_chunks = sum(1 for v in chunk_variances if _is_ai_like(v))
+    return "CONSISTENT" if ai_like_chunks / len(chunk_variances) >= CONSISTENCY_RATIO else "INCONSISTENT"
+
+
+def _is_ai_like(variance) -> bool:
+    return variance is not None and variance < PITCH_AI_THRESHOLD
+
+
+def _chunk_variance(pitch_track, start: int, end: int):
+    """F0 variance of the chunk's voiced frames (a view of the shared track); None if unvoiced."""
+    f0 = pitch_track.slice_samples(start, end)
+    vals = f0[~np.isnan(f0)]
+    return float(np.var(vals)) if vals.size > 0 else None
+
+
+def pitch_temporal_consistency(y, sr, chunk_sec=None, pitch_track=None, overlap=None):
     """
     Check whether low pitch variance persists across time.
+    Each chunk is judged on its slice of the clip-level F0 track, so pyin
+    runs once per clip (computed here when pitch_track is not supplied).
+    Stops as soon as CONSISTENCY_RATIO is reached or out of reach (same
+    verdict as consistency_verdict over every chunk).
     Returns: "CONSISTENT", "INCONSISTENT", or "INCONCLUSIVE"
     """
     if y is None or len(y) == 0:
         return "INCONCLUSIVE"
 
-    chunk_size = int(chunk_sec * sr)
-
-    chunks = [
-        y[i:i + chunk_size]
-        for i in range(0, len(y), chunk_size)
-        if len(y[i:i + chunk_size]) > chunk_size // 2
-    ]
-
+    chunks = chunk_bounds(len(y), sr, chunk_sec, overlap)
     if len(chunks) < 2:
         return "INCONCLUSIVE"
 
-    ai_like_chunks = 0
+    if pitch_track is None:
+        pitch_track = track_pitch(y, sr)
+    if pitch_track is None:
+        return "INCONSISTENT"
 
-    for chunk in chunks:
-        try:
-            f0, _, _ = librosa.pyin(
-                chunk,
-                fmin=librosa.note_to_hz("C2"),
-                fmax=librosa.note_to_hz("C7"),
-                sr=sr
-            )
-            vals = f0[~np.isnan(f0)]
-            if vals.size == 0:
-                continue
-
-            if np.var(vals) < PITCH_AI_THRESHOLD:
-                ai_like_chunks += 1
-        except Exception:
-            continue
-
-    ratio = ai_like_chunks / len(chunks)
-
-    if ratio >= CONSISTENCY_RATIO:
-        return "CONSISTENT"
+    needed = CONSISTENCY_RATIO * len(chunks)
+    ai_like_chunks = 0
+    for checked, (start, end) in enumerate(chunks, start=1):
+        if _is_ai_like(_chunk_variance(pitch_track, start, end)):
+            ai_like_chunks += 1
+        if ai_like_chunks >= needed:
+            return "CONSISTENT"
+        if ai_like_chunks + len(chunks) - checked < needed:
+            return "INCONSISTENT"
     return "INCONSISTENT"
+
+
+def pitch_temporal_profile(y, sr, chunk_sec=None, pitch_track=None, overlap=None) -> dict:
+    """
+    Time-resolved form of pitch_temporal_consistency, from the same F0 track:
+    {"verdict": str, "chunks": [{"start", "end" (seconds), "pitch_variance" (None if unvoiced)}]}.
+    """
+    if y is None or len(y) == 0:
+        return {"verdict": "INCONCLUSIVE", "chunks": []}
+
+    if pitch_track is None:
+        pitch_track = track_pitch(y, sr)
+
+    bounds = chunk_bounds(len(y), sr, chunk_sec, overlap)
+    variances = [
+        _chunk_variance(pitch_track, start, end) if pitch_track is not None else None
+        for start, end in bounds
+    ]
+
+    return {
+        # No F0 track: every chunk unvoiced, so INCONSISTENT (or INCONCLUSIVE)
+        "verdict": consistency_verdict(variances),
+        "chunks": [
+            {
+                "start": round(start / sr, 3),
+                "end": round(end / sr, 3),
+                "pitch_variance": None if v is None else round(v, 6)
+            }
+            for (start, end), v in zip(bounds, variances)
+        ]
+    }
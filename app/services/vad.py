@@ -0,0 +1,82 @@
+"""
+Voice-activity detection on the shared 2048/512 frame grid (spectral.py).
+
+A frame is active when its RMS reaches VAD_RMS_THRESHOLD (by default the
+pause feature's silence threshold, spectral.SILENCE_RMS) and, with VAD_ZCR_MAX set, its zero-crossing
+rate stays at or below it, which drops hiss and line noise. A causal
+hangover of VAD_HANGOVER_MS keeps decaying word endings and short pauses
+inside the surrounding segment, so the mask can be extended block by
+block (stream_extractor) with the same result as over a whole clip.
+
+The mask gates the expensive estimators: the pitch estimator runs once per
+voiced run (pitch_analyzer.track_pitch), onset strength and MFCC see only
+voiced frames (SpectralContext.voiced). pause_ratio still counts every frame.
+"""
+import numpy as np
+
+from app.config import settings
+from .spectral import HOP_LENGTH, SILENCE_RMS, frame_signal
+
+
+def rms_threshold() -> float:
+    """VAD_RMS_THRESHOLD, or SILENCE_RMS when it is unset (0)."""
+    return settings.VAD_RMS_THRESHOLD or SILENCE_RMS
+
+
+def hangover_frames(sr: int) -> int:
+    return int(round(settings.VAD_HANGOVER_MS / 1000.0 * sr / HOP_LENGTH))
+
+
+def zero_crossing_rate(frames: np.ndarray) -> np.ndarray:
+    """Fraction of sign changes per frame, frames (..., n_frames, n_fft)."""
+    signs = np.signbit(frames)
+    return np.mean(signs[..., 1:] != signs[..., :-1], axis=-1)
+
+
+def active_frames(rms: np.ndarray, frames: np.ndarray = None) -> np.ndarray:
+    """Frames loud enough (and, with VAD_ZCR_MAX, tonal enough) to be speech, before hangover."""
+    active = rms >= rms_threshold()
+    if settings.VAD_ZCR_MAX > 0 and frames is not None:
+        active &= zero_crossing_rate(frames) <= settings.VAD_ZCR_MAX
+    return active
+
+
+def apply_hangover(active: np.ndarray, hangover: int) -> np.ndarray:
+    """A frame is voiced when any of it and the `hangover` frames before it are active."""
+    counts = np.concatenate([[0], np.cumsum(active)])
+    index = np.arange(len(active))
+    return counts[index + 1] - counts[np.maximum(0, index - hangover)] > 0
+
+
+def voiced_frames(rms: np.ndarray, sr: int, frames: np.ndarray = None):
+    """
+    Voiced-frame mask of one clip from its frame RMS (frames: the framed
+    signal, only needed for the zero-crossing test). None when VAD is
+    disabled: every frame counts.
+    """
+    if not settings.VAD_ENABLED:
+        return None
+    return apply_hangover(active_frames(rms, frames), hangover_frames(sr))
+
+
+def voice_activity(y: np.ndarray, sr: int):
+    """voiced_frames for a waveform, framed like SpectralContext."""
+    if not settings.VAD_ENABLED:
+        return None
+    frames = frame_signal(y)
+    return voiced_frames(np.sqrt(np.mean(np.square(frames), axis=-1)), sr, frames)
+
+
+def voiced_runs(voiced: np.ndarray, min_gap: int = 0):
+    """
+    [(first, end)] frame ranges of consecutive voiced frames. Runs fewer
+    than min_gap unvoiced frames apart are merged into one.
+    """
+    edges = np.diff(np.concatenate([[0], voiced.astype(np.int8), [0]]))
+    runs = []
+    for first, end in zip(np.flatnonzero(edges == 1).tolist(), np.flatnonzero(edges == -1).tolist()):
+        if runs and first - runs[-1][1] < min_gap:
+            runs[-1] = (runs[-1][0], end)
+        else:
+            runs.append((first, end))
+    return runs
@@ -0,0 +1,84 @@
+"""
+Startup warm-up and readiness.
+
+The API answers /health as soon as uvicorn is up; /ready turns 200 once
+the background warm-up has imported the audio stack, pre-compiled
+librosa's numba kernels (ANALYSIS_WARMUP) and started the analysis workers.
+"""
+import logging
+import time
+
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+WARMUP_SR = 16000
+
+
+def prejit():
+    """
+    Run every numba-backed code path once on a short synthetic tone so the
+    first real request does not pay for JIT compilation: pitch tracking
+    with the configured backend (pyin's Viterbi decoder), the batch feature
+    pipeline and the streaming extractor.
+    """
+    from app.services.feature_extractor import extract_voice_features
+    from app.services.pitch_analyzer import track_pitch
+    from app.services.stream_extractor import StreamingFeatureExtractor
+
+    t = np.arange(WARMUP_SR // 2) / WARMUP_SR
+    y = (0.1 * np.sin(2 * np.pi * 150.0 * t)).astype(np.float32)
+    track = track_pitch(y, WARMUP_SR)
+    extract_voice_features(y, WARMUP_SR, pitch_track=track)
+
+    extractor = StreamingFeatureExtractor(WARMUP_SR, block_frames=8)
+    extractor.push(y)
+    extractor.finalize()
+
+
+def _import_audio_stack():
+    # Resolves the lazy_import placeholders (librosa, numba, scipy, soundfile, soxr)
+    import librosa.feature  # noqa: F401
+    import soundfile  # noqa: F401
+    import soxr  # noqa: F401
+    import scipy.fft  # noqa: F401
+
+
+class Readiness:
+    """Progress of the background warm-up, as reported by /ready."""
+
+    def __init__(self):
+        self.ready = False
+        self.error = None
+        self.steps = {}  # step -> seconds
+
+    async def _step(self, name: str, fn):
+        started = time.perf_counter()
+        await fn()
+        self.steps[name] = round(time.perf_counter() - started, 3)
+
+    async def warm_up(self, executor):
+        """Run the warm-up steps; failures are reported, never raised."""
+        try:
+            await self._step("imports", lambda: run_in_threadpool(_import_audio_stack))
+            if settings.ANALYSIS_WARMUP:
+                await self._step("prejit", lambda: run_in_threadpool(prejit))
+            await self._step("workers", executor.start_workers)
+            self.ready = True
+        except Exception as e:
+            logger.error("[Warm-up failed]: %s", e)
+            self.error = str(e)
+
+    def report(self) -> dict:
+        report = {"status": "ready" if self.ready else "starting", "steps": dict(self.steps)}
+        if self.error:
+            report["status"] = "failed"
+            report["error"] = self.error
+        return report
+
+
+# Singleton instance
+readiness = Readiness()
@@ -0,0 +1,83 @@
+"""
+Decoder latency / memory comparison on MP3 payloads.
+
+    python -m benchmarks.decoders [--file app/services/sample_voice_1.mp3] [--repeats 5] [--json out.json]
+
+Compares the in-process soundfile path against the previous chain
+(librosa byte stream, and pydub/ffmpeg when ffmpeg is installed).
+"""
+import argparse
+import json
+import os
+import shutil
+import time
+import tracemalloc
+
+import numpy as np
+
+from app.services import audio_decoder
+
+DEFAULT_FILE = os.path.join(os.path.dirname(audio_decoder.__file__), "sample_voice_1.mp3")
+
+DECODERS = {
+    "soundfile": audio_decoder._load_with_soundfile,
+    "librosa": audio_decoder._load_with_librosa_bytestream,
+    "pydub": audio_decoder._load_with_pydub_and_librosa,
+}
+
+
+def run(audio_bytes: bytes, repeats: int):
+    rows = []
+    for name, loader in DECODERS.items():
+        if name == "pydub" and shutil.which("ffmpeg") is None:
+            rows.append({"decoder": name, "skipped": "ffmpeg not installed"})
+            continue
+
+        loader(audio_bytes, sr=16000)  # warm-up (library init, resampler plans)
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            y, _ = loader(audio_bytes, sr=16000)
+            timings.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        loader(audio_bytes, sr=16000)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        rows.append({
+            "decoder": name,
+            "p50_ms": round(1000 * float(np.percentile(timings, 50)), 2),
+            "p95_ms": round(1000 * float(np.percentile(timings, 95)), 2),
+            "peak_alloc_mb": round(peak / 2**20, 2),
+            "samples": int(len(y)),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--file", default=DEFAULT_FILE)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args()
+
+    with open(args.file, "rb") as f:
+        audio_bytes = f.read()
+
+    rows = run(audio_bytes, args.repeats)
+    print(f"{os.path.basename(args.file)}: {len(audio_bytes) / 1024:.0f} KiB")
+    for r in rows:
+        if "skipped" in r:
+            print(f"  {r['decoder']:<10} skipped ({r['skipped']})")
+        else:
+            print(f"  {r['decoder']:<10} p50 {r['p50_ms']:>8.1f} ms  p95 {r['p95_ms']:>8.1f} ms"
+                  f"  peak {r['peak_alloc_mb']:>6.1f} MiB  samples {r['samples']}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
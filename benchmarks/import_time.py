@@ -0,0 +1,95 @@
+"""
+Cold-start import time of the API process.
+
+    python -m benchmarks.import_time [--module app.main] [--repeats 5] [--max-ms 1500] [--json out.json]
+
+Imports the module in fresh interpreters (python -X importtime), reports
+p50 / max wall time, the slowest modules, and which heavy dependencies were
+really loaded (they should stay deferred until warm-up). With --max-ms the
+exit status is 1 when p50 exceeds the budget, for CI regression checks.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+# Dependencies app.main must not load at import time (see app.lazy)
+HEAVY_MODULES = ("librosa", "numba", "soundfile", "soxr", "google.generativeai")
+
+_PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = [m for m in {heavy!r} if m in sys.modules and type(sys.modules[m]).__name__ != "_LazyModule"]
+print(json.dumps({{"ms": 1000 * elapsed, "loaded": loaded}}))
+"""
+
+
+def measure(module: str):
+    """One fresh-interpreter import: (wall ms, heavy modules loaded, {module: cumulative us})."""
+    env = dict(os.environ, GEMINI_API_KEY=os.environ.get("GEMINI_API_KEY", "benchmark"))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        capture_output=True, text=True, env=env, check=True
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cum)
+    return result["ms"], result["loaded"], cumulative
+
+
+def run(module: str, repeats: int) -> dict:
+    timings, loaded, cumulative = [], [], {}
+    for _ in range(repeats):
+        ms, loaded, cumulative = measure(module)
+        timings.append(ms)
+
+    # Slowest top-level-ish entries: third-party packages and app modules
+    top = sorted(
+        ((name, us) for name, us in cumulative.items() if "." not in name or name.startswith("app.")),
+        key=lambda item: -item[1]
+    )[:10]
+    return {
+        "module": module,
+        "p50_ms": round(float(np.percentile(timings, 50)), 1),
+        "max_ms": round(float(np.max(timings)), 1),
+        "heavy_loaded": loaded,
+        "slowest": [{"module": name, "cumulative_ms": round(us / 1000, 1)} for name, us in top],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, help="Fail (exit 1) when p50 exceeds this")
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args(argv)
+
+    report = run(args.module, args.repeats)
+    print(f"import {report['module']}: p50 {report['p50_ms']:.0f} ms  max {report['max_ms']:.0f} ms")
+    print(f"  heavy modules loaded: {', '.join(report['heavy_loaded']) or 'none'}")
+    for entry in report["slowest"]:
+        print(f"  {entry['module']:<40} {entry['cumulative_ms']:>8.1f} ms")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.max_ms is not None and report["p50_ms"] > args.max_ms:
+        print(f"FAIL: p50 {report['p50_ms']:.0f} ms exceeds budget {args.max_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Peak allocation per request on the decode path, with and without the buffer pool.
+
+    python -m benchmarks.memory [--durations 10 60 180] [--requests 5] [--json out.json]
+
+Synthetic speech (44.1 kHz, the common MP3 rate, so the resampling path
+runs) is MP3-encoded and base64'd, then decoded --requests times in a row
+as consecutive requests would be. Reports the tracemalloc peak of one
+steady-state request (pool already warm) and how often the pool was hit:
+
+  unpooled  b64decode_audio + decode_audio with a pool that keeps nothing
+  pooled    decode_base64_audio (pooled base64 buffer + PCM scratch)
+  analyze   the full analyze_audio pipeline, pooled
+"""
+import argparse
+import json
+import tracemalloc
+
+from app.services import buffer_pool as pool_module
+from app.services.audio_analyzer import analyze_audio
+from app.services.audio_decoder import b64decode_audio, decode_audio, decode_base64_audio
+from app.services.buffer_pool import BufferPool
+from benchmarks.pipeline import encode_mp3_base64
+from benchmarks.synthetic import speech_like
+
+NATIVE_SR = 44100
+
+
+def _unpooled(audio_base64: str):
+    return decode_audio(b64decode_audio(audio_base64))
+
+
+CASES = {
+    "unpooled": _unpooled,
+    "pooled": decode_base64_audio,
+    "analyze": lambda audio_base64: analyze_audio(audio_base64, "English"),
+}
+
+
+def _measure(fn, audio_base64: str, requests: int) -> dict:
+    fn(audio_base64)  # warm-up: fills the pool, loads codecs
+    tracemalloc.start()
+    peak = 0
+    for _ in range(requests):
+        tracemalloc.reset_peak()
+        fn(audio_base64)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+    return {"peak_alloc_mb": round(peak / 2**20, 2)}
+
+
+def run(durations, requests: int) -> list:
+    rows = []
+    for seconds in durations:
+        y, _ = speech_like(seconds, sr=NATIVE_SR)
+        audio_base64 = encode_mp3_base64(y, NATIVE_SR)
+        for name, fn in CASES.items():
+            # "unpooled" runs against a pool with no budget: every lease allocates
+            pool = BufferPool(0 if name == "unpooled" else pool_module.buffer_pool.max_bytes)
+            original = pool_module.buffer_pool
+            _swap_pool(pool)
+            try:
+                row = _measure(fn, audio_base64, requests)
+            finally:
+                _swap_pool(original)
+            rows.append({
+                "seconds": seconds,
+                "payload_mb": round(len(audio_base64) / 2**20, 2),
+                "case": name,
+                **row,
+                "pool_hits": pool.hits,
+            })
+    return rows
+
+
+def _swap_pool(pool: BufferPool):
+    from app.services import audio_decoder
+    pool_module.buffer_pool = pool
+    audio_decoder.buffer_pool = pool
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--durations", type=float, nargs="+", default=[10.0, 60.0, 180.0])
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args(argv)
+
+    rows = run(args.durations, args.requests)
+    header = f"{'sec':>6}{'payload MiB':>13}  {'case':<10}{'peak MiB':>10}{'pool hits':>11}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['seconds']:>6g}{r['payload_mb']:>13.2f}  {r['case']:<10}{r['peak_alloc_mb']:>10.2f}{r['pool_hits']:>11}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
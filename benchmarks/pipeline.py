@@ -0,0 +1,210 @@
+"""
+Per-stage latency / memory of the detection pipeline on a synthetic corpus.
+
+    python -m benchmarks.pipeline [--durations 2 10 30] [--repeats 5] [--json out.json]
+                                  [--baseline benchmarks/baseline.json] [--tolerance 0.5]
+                                  [--update-baseline] [--no-route]
+
+Every signal of benchmarks.synthetic is rendered at each duration, encoded
+to MP3 in memory and base64'd, then pushed through the stages one at a time:
+
+  decode    decode_base64_audio
+  pitch     track_pitch (shared by the next two, as in analyze_audio)
+  features  extract_voice_features
+  temporal  pitch_temporal_consistency
+  classify  classify_voice
+  route     POST /api/voice-detection through TestClient (analysis pool;
+            a throwaway in-memory result cache, cleared before each call,
+            and no feature store, so the server's own are never touched)
+
+Reports p50 / p95 wall time and tracemalloc peak per stage (no peak for
+route: the analysis runs in a worker, out of tracemalloc's sight). With --baseline the exit
+status is 1 when any p50 or peak exceeds the baseline by more than
+--tolerance (0.5 = +50%), for CI regression checks; --update-baseline
+rewrites the baseline file from this run instead.
+"""
+import argparse
+import base64
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.synthetic import SR, flat_pitch, noise_bursts, speech_like, tone_sweep
+
+SIGNALS = {
+    "speech_like": speech_like,
+    "flat_pitch": flat_pitch,
+    "tone_sweep": tone_sweep,
+    "noise_bursts": noise_bursts,
+}
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def encode_mp3_base64(y: np.ndarray, sr: int = SR) -> str:
+    import soundfile as sf
+
+    buf = io.BytesIO()
+    sf.write(buf, y, sr, format="MP3")
+    return base64.b64encode(buf.getvalue()).decode()
+
+
+def _measure(fn, repeats: int, memory: bool = True) -> dict:
+    fn()  # warm-up (numba JIT, FFT plans, worker start)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    row = {
+        "p50_ms": round(1000 * float(np.percentile(timings, 50)), 2),
+        "p95_ms": round(1000 * float(np.percentile(timings, 95)), 2),
+    }
+    if memory:
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        row["peak_alloc_mb"] = round(peak / 2**20, 2)
+    return row
+
+
+@contextlib.contextmanager
+def isolated_routes():
+    """Point the routes at a throwaway result cache and no feature store for the route stage."""
+    from app.api import routes
+    from app.services.result_cache import MemoryResultCache
+
+    saved = routes.result_cache, routes.feature_store
+    routes.result_cache = MemoryResultCache(max_entries=16, max_bytes=16 * 2**20, ttl_seconds=60)
+    routes.feature_store = None
+    try:
+        yield
+    finally:
+        routes.result_cache, routes.feature_store = saved
+
+
+def _stages(audio_base64: str, client):
+    from app.config import settings
+    from app.services.audio_decoder import decode_base64_audio
+    from app.services.feature_extractor import extract_voice_features
+    from app.services.integrated_service import classify_voice
+    from app.services.pitch_analyzer import track_pitch
+    from app.services.temporal_analyzer import pitch_temporal_consistency
+
+    y, sr = decode_base64_audio(audio_base64)
+    track = track_pitch(y, sr)
+    features = extract_voice_features(y, sr, pitch_track=track)
+    features["language"] = "English"
+
+    stages = {
+        "decode": lambda: decode_base64_audio(audio_base64),
+        "pitch": lambda: track_pitch(y, sr),
+        "features": lambda: extract_voice_features(y, sr, pitch_track=track),
+        "temporal": lambda: pitch_temporal_consistency(y, sr, pitch_track=track),
+        "classify": lambda: classify_voice(features),
+    }
+    if client is not None:
+        payload = {"language": "English", "audioFormat": "mp3", "audioBase64": audio_base64}
+
+        def route():
+            from app.api import routes
+            routes.result_cache.clear()
+            response = client.post("/api/voice-detection", json=payload, headers={"x-api-key": settings.API_KEY})
+            response.raise_for_status()
+
+        stages["route"] = route
+    return stages
+
+
+def run(durations, repeats: int, client=None) -> list:
+    rows = []
+    for signal_name, make in SIGNALS.items():
+        for seconds in durations:
+            y, _ = make(seconds)
+            audio_base64 = encode_mp3_base64(y)
+            for stage, fn in _stages(audio_base64, client).items():
+                rows.append({
+                    "signal": signal_name, "seconds": seconds, "stage": stage,
+                    **_measure(fn, repeats, memory=stage != "route")
+                })
+    return rows
+
+
+def compare(rows, baseline, tolerance: float) -> list:
+    """Regressions against a baseline run: one message per metric over budget."""
+    previous = {(r["signal"], r["seconds"], r["stage"]): r for r in baseline}
+    failures = []
+    for row in rows:
+        base = previous.get((row["signal"], row["seconds"], row["stage"]))
+        if base is None:
+            continue
+        for metric in ("p50_ms", "peak_alloc_mb"):
+            if metric not in row or metric not in base:
+                continue
+            # Sub-millisecond / sub-megabyte values are noise, not regressions
+            budget = max(base[metric] * (1 + tolerance), base[metric] + 1.0)
+            if row[metric] > budget:
+                failures.append(
+                    f"{row['signal']} {row['seconds']:g}s {row['stage']}: "
+                    f"{metric} {row[metric]} > {base[metric]} (+{tolerance:.0%})"
+                )
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--durations", type=float, nargs="+", default=[2.0, 10.0, 30.0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", dest="json_path")
+    parser.add_argument("--baseline", help="Compare against this baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Write this run to --baseline (default benchmarks/baseline.json)")
+    parser.add_argument("--no-route", action="store_true", help="Skip the end-to-end route stage")
+    args = parser.parse_args(argv)
+
+    if args.no_route:
+        rows = run(args.durations, args.repeats)
+    else:
+        from fastapi.testclient import TestClient
+        from app.main import app
+
+        # Context manager runs the lifespan: settings check, warm-up, worker start
+        with isolated_routes(), TestClient(app) as client:
+            rows = run(args.durations, args.repeats, client)
+
+    header = f"{'signal':<14}{'sec':>6}  {'stage':<10}{'p50 ms':>10}{'p95 ms':>10}{'peak MiB':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        peak = f"{r['peak_alloc_mb']:>10.1f}" if "peak_alloc_mb" in r else f"{'-':>10}"
+        print(f"{r['signal']:<14}{r['seconds']:>6g}  {r['stage']:<10}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{peak}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2)
+
+    baseline_path = args.baseline or DEFAULT_BASELINE
+    if args.update_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump(rows, f, indent=2)
+        print(f"baseline written to {baseline_path}")
+    elif args.baseline:
+        with open(args.baseline) as f:
+            failures = compare(rows, json.load(f), args.tolerance)
+        for message in failures:
+            print(f"FAIL: {message}")
+        if failures:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
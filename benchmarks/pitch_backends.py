@@ -0,0 +1,97 @@
+"""
+Accuracy vs latency comparison of the pitch estimator backends.
+
+    python -m benchmarks.pitch_backends [--durations 2 10 30] [--repeats 3] [--json out.json]
+
+Accuracy is measured against the synthetic ground-truth F0:
+  - gross_error: fraction of truly voiced frames estimated >20% off (or unvoiced)
+  - voicing_error: fraction of frames with the wrong voiced/unvoiced decision
+  - variance_diff: |pitch_variance - pitch_variance of the "pyin" backend| (Hz^2)
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from app.services.pitch_analyzer import PITCH_ESTIMATORS, PitchTrack
+from benchmarks.synthetic import SR, flat_pitch, speech_like, tone_sweep
+
+SIGNALS = {
+    "speech_like": speech_like,
+    "flat_pitch": flat_pitch,
+    "tone_sweep": tone_sweep,
+}
+
+
+def _accuracy(f0: np.ndarray, truth: np.ndarray) -> dict:
+    n = min(len(f0), len(truth))
+    f0, truth = f0[:n], truth[:n]
+    est_voiced = ~np.isnan(f0)
+    true_voiced = ~np.isnan(truth)
+
+    gross = 1.0
+    if true_voiced.any():
+        tv = true_voiced
+        ok = est_voiced[tv] & (np.abs(f0[tv] - truth[tv]) <= 0.2 * truth[tv])
+        gross = float(1.0 - ok.mean())
+
+    return {
+        "gross_error": round(gross, 4),
+        "voicing_error": round(float(np.mean(est_voiced != true_voiced)), 4),
+    }
+
+
+def run(durations, repeats):
+    rows = []
+    for signal_name, make in SIGNALS.items():
+        for seconds in durations:
+            y, truth = make(seconds)
+            reference_var = None
+            for name, estimator in PITCH_ESTIMATORS.items():
+                estimator.estimate(y[:SR], SR)  # warm-up (numba JIT, FFT plans)
+                timings = []
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    f0 = estimator.estimate(y, SR)
+                    timings.append(time.perf_counter() - start)
+
+                variance = PitchTrack(f0, SR).variance()
+                if name == "pyin":
+                    reference_var = variance
+                row = {
+                    "signal": signal_name,
+                    "seconds": seconds,
+                    "backend": name,
+                    "latency_ms": round(1000 * float(np.median(timings)), 2),
+                    "pitch_variance": round(variance, 4),
+                    **_accuracy(f0, truth),
+                }
+                row["variance_diff"] = round(abs(variance - reference_var), 4)
+                rows.append(row)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--durations", type=float, nargs="+", default=[2.0, 10.0, 30.0])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args()
+
+    rows = run(args.durations, args.repeats)
+
+    header = f"{'signal':<12}{'sec':>6}  {'backend':<12}{'ms':>10}{'gross':>8}{'voicing':>9}{'var_diff':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['signal']:<12}{r['seconds']:>6g}  {r['backend']:<12}{r['latency_ms']:>10.1f}"
+              f"{r['gross_error']:>8.3f}{r['voicing_error']:>9.3f}{r['variance_diff']:>10.2f}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Per-request cost of parsing one /api/voice-detection body, by payload size.
+
+    python -m benchmarks.request_parsing [--sizes-mb 0.1 1 5 10] [--requests 5] [--json out.json]
+
+Each body is parsed and prepared for the analysis pool the way the route
+does it, pickled and unpickled as the executor does, and decoded to the
+bytes the analysis starts from:
+
+  pydantic  VoiceAnalysisRequest validation, strip() emptiness check,
+            digest_base64 + sniff_mp3_base64, base64 str sent to the worker,
+            which decodes it again
+  raw       request_body.parse_voice_request (the one base64 decode),
+            digest and sniff over those bytes, decoded bytes sent to the worker
+
+Reports CPU milliseconds per request (process time; analysis not
+included) and the tracemalloc peak of one request, the raw body itself
+not counted.
+"""
+import argparse
+import base64
+import json
+import os
+import pickle
+import time
+import tracemalloc
+
+from app.models import VoiceAnalysisRequest
+from app.services.audio_decoder import b64decode_audio
+from app.services.mp3_header import sniff_mp3_base64, sniff_mp3_bytes
+from app.services.request_body import parse_voice_request
+from app.services.result_cache import audio_digest, digest_base64
+
+
+def _pydantic(raw: bytes):
+    body = VoiceAnalysisRequest.model_validate_json(raw)
+    assert len(body.audioBase64.strip()) > 0
+    digest_base64(body.audioBase64)
+    sniff_mp3_base64(body.audioBase64)
+    audio_base64, _, _ = pickle.loads(pickle.dumps((body.audioBase64, body.language, body.audioFormat)))
+    return b64decode_audio(audio_base64)
+
+
+def _raw(raw: bytes):
+    body = parse_voice_request(raw)
+    assert len(body["audio"]) > 0
+    audio_digest(body["audio"])
+    sniff_mp3_bytes(body["audio"])
+    audio, _, _ = pickle.loads(pickle.dumps((body["audio"], body["language"], body["audioFormat"])))
+    return audio
+
+
+CASES = {"pydantic": _pydantic, "raw": _raw}
+
+
+def make_body(size_mb: float) -> bytes:
+    # Random bytes: parsing cost doesn't depend on the audio being real
+    audio = os.urandom(int(size_mb * 2**20 * 3 / 4))
+    return json.dumps({
+        "language": "English",
+        "audioFormat": "mp3",
+        "audioBase64": base64.b64encode(audio).decode()
+    }).encode()
+
+
+def _measure(fn, raw: bytes, requests: int) -> dict:
+    fn(raw)  # warm-up
+    started = time.process_time()
+    for _ in range(requests):
+        fn(raw)
+    cpu_ms = (time.process_time() - started) * 1000 / requests
+
+    tracemalloc.start()
+    fn(raw)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"cpu_ms": round(cpu_ms, 2), "peak_alloc_mb": round(peak / 2**20, 2)}
+
+
+def run(sizes_mb, requests: int) -> list:
+    rows = []
+    for size_mb in sizes_mb:
+        raw = make_body(size_mb)
+        for name, fn in CASES.items():
+            rows.append({"body_mb": round(len(raw) / 2**20, 2), "case": name, **_measure(fn, raw, requests)})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[0.1, 1.0, 5.0, 10.0])
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args(argv)
+
+    rows = run(args.sizes_mb, args.requests)
+    header = f"{'body MiB':>9}  {'case':<10}{'cpu ms':>9}{'peak MiB':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(f"{r['body_mb']:>9.2f}  {r['case']:<10}{r['cpu_ms']:>9.2f}{r['peak_alloc_mb']:>10.2f}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Synthetic speech-like signals with known F0 ground truth.
+Generated offline so benchmarks never depend on recordings or the network.
+"""
+import numpy as np
+
+SR = 16000
+HOP_LENGTH = 512
+
+
+def _harmonic_voice(f0_curve: np.ndarray, sr: int, n_harmonics: int = 6) -> np.ndarray:
+    """Sum of decaying harmonics following a per-sample F0 curve."""
+    phase = 2 * np.pi * np.cumsum(f0_curve) / sr
+    y = np.zeros_like(f0_curve)
+    for k in range(1, n_harmonics + 1):
+        y += np.sin(k * phase) / k
+    return y
+
+
+def speech_like(seconds: float, sr: int = SR, base_f0: float = 140.0,
+                vibrato_hz: float = 0.8, vibrato_depth: float = 25.0,
+                pause_every: float = 1.2, pause_len: float = 0.25,
+                noise_db: float = -35.0, seed: int = 0):
+    """
+    Voiced segments with slow pitch movement separated by short pauses.
+    Returns (y, f0_truth) where f0_truth is sampled on the pyin frame grid
+    (NaN inside pauses).
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sr)
+    t = np.arange(n) / sr
+    f0 = base_f0 + vibrato_depth * np.sin(2 * np.pi * vibrato_hz * t)
+
+    voiced = np.ones(n, dtype=bool)
+    if pause_every > 0:
+        voiced &= (t % pause_every) < (pause_every - pause_len)
+
+    y = 0.3 * _harmonic_voice(f0, sr) * voiced
+    y += rng.normal(0, 10 ** (noise_db / 20), n)
+
+    frame_centres = np.arange(1 + n // HOP_LENGTH) * HOP_LENGTH
+    frame_centres = np.minimum(frame_centres, n - 1)
+    truth = np.where(voiced[frame_centres], f0[frame_centres], np.nan)
+    return y.astype(np.float32), truth
+
+
+def flat_pitch(seconds: float, sr: int = SR, f0: float = 160.0, seed: int = 0):
+    """TTS-like monotone voice: constant F0, no pauses."""
+    return speech_like(seconds, sr, base_f0=f0, vibrato_depth=0.0,
+                       pause_every=0.0, seed=seed)
+
+
+def tone_sweep(seconds: float, sr: int = SR, f_start: float = 90.0, f_end: float = 320.0):
+    """Linear pitch glide across the speech range."""
+    n = int(seconds * sr)
+    f0 = np.linspace(f_start, f_end, n)
+    y = 0.3 * _harmonic_voice(f0, sr)
+    frame_centres = np.minimum(np.arange(1 + n // HOP_LENGTH) * HOP_LENGTH, n - 1)
+    return y.astype(np.float32), f0[frame_centres]
+
+
+def noise_bursts(seconds: float, sr: int = SR, burst_len: float = 0.3, seed: int = 0):
+    """Unvoiced noise bursts separated by silence (no pitch anywhere)."""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sr)
+    t = np.arange(n) / sr
+    gate = (t % (2 * burst_len)) < burst_len
+    y = 0.2 * rng.normal(0, 1, n) * gate
+    return y.astype(np.float32), np.full(1 + n // HOP_LENGTH, np.nan)
+
+
+def silence_heavy(seconds: float, silence_ratio: float = 0.5, sr: int = SR,
+                  period: float = 3.0, seed: int = 0):
+    """
+    Call-recording-like: speech_like talk spurts, then room tone (-55 dB
+    noise) for `silence_ratio` of every `period` seconds. Returns (y, f0_truth)
+    like speech_like; f0_truth is NaN in the silences.
+    """
+    y, truth = speech_like(seconds, sr, noise_db=-55.0, seed=seed)
+    n = len(y)
+    talking = (np.arange(n) / sr) % period < (1.0 - silence_ratio) * period
+    rng = np.random.default_rng(seed + 1)
+    y = np.where(talking, y, rng.normal(0, 10 ** (-55.0 / 20), n)).astype(np.float32)
+
+    frame_centres = np.minimum(np.arange(1 + n // HOP_LENGTH) * HOP_LENGTH, n - 1)
+    truth = np.where(talking[frame_centres], truth, np.nan)
+    return y, truth
@@ -0,0 +1,100 @@
+"""
+Feature extraction with and without voice-activity gating on silence-heavy audio.
+
+    python -m benchmarks.vad [--seconds 30] [--silence 0 0.3 0.6] [--backends pyin yin]
+        [--repeats 3] [--json out.json]
+
+Clips are synthetic call recordings (benchmarks.synthetic.silence_heavy):
+talk spurts separated by room tone, `--silence` of the time. Each runs
+through what analyze_audio does after decoding (VAD mask, pitch track,
+extract_voice_features, temporal profile) with VAD_ENABLED on and off.
+Reports the median wall time, the speed-up and the feature values of both
+runs, so the effect of gating on each feature is visible next to its cost.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from app.config import settings
+from app.services.feature_extractor import extract_voice_features
+from app.services.pitch_analyzer import track_pitch
+from app.services.temporal_analyzer import pitch_temporal_profile
+from app.services.vad import voice_activity
+from benchmarks.synthetic import SR, silence_heavy
+
+FEATURES = ("pitch_variance", "rhythm_variance", "pause_ratio", "spectral_smoothness")
+
+
+def _analyze(y, backend: str) -> dict:
+    voiced = voice_activity(y, SR)
+    track = track_pitch(y, SR, backend=backend, voiced=voiced)
+    features = extract_voice_features(y, SR, pitch_track=track, voiced=voiced)
+    features["pitch_consistency"] = pitch_temporal_profile(y, SR, pitch_track=track)["verdict"]
+    return features
+
+
+def _measure(y, backend: str, repeats: int, vad: bool):
+    original = settings.VAD_ENABLED
+    settings.VAD_ENABLED = vad
+    try:
+        features = _analyze(y, backend)  # warm-up (numba JIT on first pyin)
+        times = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            _analyze(y, backend)
+            times.append(time.perf_counter() - started)
+    finally:
+        settings.VAD_ENABLED = original
+    return float(np.median(times)) * 1000, features
+
+
+def run(seconds: float, silence_ratios, backends, repeats: int) -> list:
+    rows = []
+    for ratio in silence_ratios:
+        y, _ = silence_heavy(seconds, ratio)
+        for backend in backends:
+            gated_ms, gated = _measure(y, backend, repeats, vad=True)
+            full_ms, full = _measure(y, backend, repeats, vad=False)
+            rows.append({
+                "silence": ratio,
+                "seconds": seconds,
+                "backend": backend,
+                "full_ms": round(full_ms, 1),
+                "gated_ms": round(gated_ms, 1),
+                "speedup": round(full_ms / gated_ms, 2),
+                "full": full,
+                "gated": gated,
+            })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--silence", type=float, nargs="+", default=[0.0, 0.3, 0.6])
+    parser.add_argument("--backends", nargs="+", default=["pyin", "yin"])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args(argv)
+
+    rows = run(args.seconds, args.silence, args.backends, args.repeats)
+    header = f"{'silence':>8}  {'backend':<8}{'full ms':>10}{'gated ms':>10}{'speedup':>9}  feature changes (full -> gated)"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        changes = ", ".join(
+            f"{name} {r['full'][name]:.4g}->{r['gated'][name]:.4g}"
+            for name in FEATURES if r["full"][name] != r["gated"][name]
+        )
+        print(f"{r['silence']:>8.0%}  {r['backend']:<8}{r['full_ms']:>10.1f}{r['gated_ms']:>10.1f}"
+              f"{r['speedup']:>8.2f}x  {changes or 'none'}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
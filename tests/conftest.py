@@ -0,0 +1,103 @@
+import asyncio
+import base64
+import copy
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.config import settings
+from app.main import app
+from app.services import audio_decoder
+from app.services.feature_store import FeatureStore
+from app.services.result_cache import result_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_result_cache():
+    """Cached answers (and hit / miss counts) must not leak between tests."""
+    result_cache.clear()
+    result_cache.hits = result_cache.misses = 0
+    yield
+    result_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def temporary_feature_store(monkeypatch, tmp_path):
+    """Routes write feature vectors to a per-test directory."""
+    store = FeatureStore(str(tmp_path / "features"))
+    monkeypatch.setattr(routes, "feature_store", store)
+    return store
+
+
+@pytest.fixture(scope="session")
+def sample_mp3():
+    """Path of the short voice clip shipped next to the decoder."""
+    return os.path.join(os.path.dirname(audio_decoder.__file__), "sample_voice_1.mp3")
+
+
+@pytest.fixture(scope="session")
+def sample_bytes(sample_mp3):
+    with open(sample_mp3, "rb") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="session")
+def sample_base64(sample_bytes):
+    return base64.b64encode(sample_bytes).decode()
+
+
+VOICE_RESULT = {
+    "status": "success",
+    "language": "English",
+    "classification": "HUMAN",
+    "confidenceScore": 0.8,
+    "explanation": "ok"
+}
+
+
+@pytest.fixture
+def stub_pool(monkeypatch):
+    """
+    Replace the analysis process pool. stub_pool(job) makes every submit
+    answer a copy of `job` (default: VOICE_RESULT without features), or
+    raise it when it is an exception; inline=True runs the submitted
+    function in-process instead; delay (seconds) is awaited first. Returns
+    the list of submitted (fn, args).
+    """
+    def install(job=None, inline=False, delay=0.0):
+        calls = []
+
+        async def submit(fn, *args):
+            calls.append((fn, args))
+            if delay:
+                await asyncio.sleep(delay)
+            if inline:
+                return fn(*args)
+            if isinstance(job, BaseException):
+                raise job
+            return copy.deepcopy(job if job is not None else {"result": VOICE_RESULT, "features": None})
+
+        monkeypatch.setattr(routes.analysis_executor, "submit", submit)
+        return calls
+    return install
+
+
+@pytest.fixture
+def post_voice():
+    """
+    post_voice(audio, **fields): POST /api/voice-detection with the API key,
+    `audio` base64-encoded (English mp3 unless fields override it).
+    """
+    client = TestClient(app)
+
+    def post(audio: bytes = b"clip", **fields):
+        payload = {
+            "language": "English",
+            "audioFormat": "mp3",
+            "audioBase64": base64.b64encode(audio).decode(),
+            **fields
+        }
+        return client.post("/api/voice-detection", json=payload, headers={"x-api-key": settings.API_KEY})
+    return post
@@ -0,0 +1,69 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.config import settings
+from app.services.analysis_executor import AnalysisExecutor, QueueFullError, WorkerCrashedError
+
+
+@pytest.fixture(autouse=True)
+def no_warmup(monkeypatch):
+    monkeypatch.setattr(settings, "ANALYSIS_WARMUP", False)
+
+
+def test_submit_runs_in_worker_process():
+    """Jobs run outside the event-loop process."""
+    executor = AnalysisExecutor(max_workers=1, max_queue=0)
+    try:
+        worker_pid = asyncio.run(executor.submit(os.getpid))
+    finally:
+        executor.shutdown()
+    assert worker_pid != os.getpid()
+    assert executor.in_flight == 0
+
+
+def test_submit_rejects_when_queue_full():
+    """Requests beyond workers + queue fail fast instead of waiting."""
+    executor = AnalysisExecutor(max_workers=1, max_queue=1)
+
+    async def flood():
+        jobs = [asyncio.ensure_future(executor.submit(time.sleep, 0.5)) for _ in range(3)]
+        return await asyncio.gather(*jobs, return_exceptions=True)
+
+    try:
+        results = asyncio.run(flood())
+    finally:
+        executor.shutdown()
+    assert sum(isinstance(r, QueueFullError) for r in results) == 1
+
+
+def test_crashed_worker_is_replaced():
+    executor = AnalysisExecutor(max_workers=1, max_queue=1)
+
+    async def crash_then_recover():
+        crashes = await asyncio.gather(executor.submit(os._exit, 1), executor.submit(time.sleep, 0.1),
+                                       return_exceptions=True)
+        return crashes, await executor.submit(os.getpid)
+
+    try:
+        crashes, worker_pid = asyncio.run(crash_then_recover())
+    finally:
+        executor.shutdown()
+    # Both jobs of the dead pool fail; the second failure leaves the new pool alone
+    assert all(isinstance(c, WorkerCrashedError) for c in crashes)
+    assert worker_pid != os.getpid()
+    assert executor.in_flight == 0
+
+
+def test_voice_detection_returns_503_when_busy(stub_pool, post_voice):
+    stub_pool(QueueFullError())
+    response = post_voice(b"\x00\x00\x00")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(settings.ANALYSIS_RETRY_AFTER)
+
+
+def test_voice_detection_returns_503_when_a_worker_crashed(stub_pool, post_voice):
+    stub_pool(WorkerCrashedError())
+    assert post_voice(b"\x00\x00\x00").status_code == 503
@@ -0,0 +1,115 @@
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.config import settings
+from app.main import app
+from app.services.analysis_tiers import FULL, LATENCY_MAX_AGE_SEC, MINIMAL, REDUCED, TierSelector
+from app.services.audio_analyzer import analyze_audio_bytes
+from app.services.audio_decoder import decode_audio
+from app.services.integrated_service import analyze_audio_bytes_job
+from app.services.metrics import metrics
+from app.services.result_cache import MemoryResultCache
+
+RESULT = {
+    "status": "success",
+    "language": "English",
+    "classification": "HUMAN",
+    "confidenceScore": 0.8,
+    "explanation": "test"
+}
+
+
+def test_selector_queue_thresholds():
+    selector = TierSelector(reduced_queue=2, minimal_queue=5, reduced_ms=0, minimal_ms=0)
+    assert [selector.choose(depth) for depth in (0, 1, 2, 4, 5, 9)] == [FULL, FULL, REDUCED, REDUCED, MINIMAL, MINIMAL]
+    assert selector.stats()["chosen"] == {FULL: 2, REDUCED: 2, MINIMAL: 2}
+
+
+def test_selector_latency_thresholds():
+    selector = TierSelector(reduced_queue=0, minimal_queue=0, reduced_ms=500, minimal_ms=2000, window=2)
+    assert selector.choose(100) == FULL  # queue triggers disabled, no latency yet
+    selector.observe(0.6)
+    selector.observe(0.6)
+    assert selector.choose(0) == REDUCED
+    selector.observe(3.0)
+    selector.observe(3.0)
+    assert selector.choose(0) == MINIMAL
+    # Only the last `window` analyses count
+    selector.observe(0.1)
+    selector.observe(0.1)
+    assert selector.choose(0) == FULL
+    assert selector.recent_latency_ms() == 100.0
+
+
+def test_stale_latency_samples_expire():
+    now = [0.0]
+    selector = TierSelector(reduced_queue=0, minimal_queue=0, reduced_ms=500, minimal_ms=0, clock=lambda: now[0])
+    selector.observe(2.0)
+    assert selector.choose(0) == REDUCED
+    # Every request is degraded, so no new full-tier samples: the old one ages out
+    now[0] = LATENCY_MAX_AGE_SEC + 1
+    assert selector.choose(0) == FULL
+    assert selector.recent_latency_ms() == 0.0
+
+
+def test_minimal_tier_skips_decoding(sample_bytes):
+    analysis = analyze_audio_bytes(sample_bytes, "English", tier=MINIMAL)
+    assert analysis["tier"] == MINIMAL
+    assert analysis["decoder"] == "lightweight"
+
+
+def test_reduced_tier_analyzes_the_start_of_the_clip(sample_bytes):
+    analysis = analyze_audio_bytes(sample_bytes, "English", tier=REDUCED)
+    assert analysis["tier"] == REDUCED
+    assert analysis["decoder"] != "lightweight"
+    assert "pitch_consistency" not in analysis["features"]
+
+
+def test_decode_stops_at_max_seconds(sample_bytes):
+    y, sr, _ = decode_audio(sample_bytes, max_seconds=5.0)
+    assert len(y) == int(5.0 * sr)
+
+
+def test_job_reports_the_tier_that_ran(sample_bytes):
+    job = analyze_audio_bytes_job(sample_bytes, "English", tier=MINIMAL)
+    assert job["analysis_tier"] == MINIMAL
+    assert job["result"]["status"] == "success"
+    # Safe fallback still reports the tier it was asked for
+    assert analyze_audio_bytes_job(b"", "English", tier=REDUCED)["analysis_tier"] == REDUCED
+
+
+def test_route_degrades_under_load_without_caching(monkeypatch, stub_pool, post_voice):
+    calls = stub_pool({"result": dict(RESULT), "features": {"pitch_variance": 1.0}, "decoder": "lightweight"})
+    monkeypatch.setattr(routes, "result_cache", MemoryResultCache(max_entries=16, max_bytes=2**20, ttl_seconds=60))
+    # Any recent latency at all counts as overload
+    monkeypatch.setattr(routes, "tier_selector", TierSelector(reduced_queue=0, minimal_queue=0, reduced_ms=1e-6, minimal_ms=0))
+    reduced_before = metrics.value("echotrace_analysis_tier_total", tier=REDUCED)
+
+    assert post_voice(b"first clip").headers["X-Analysis-Tier"] == FULL  # no latency observed yet
+    full_latency = routes.tier_selector.recent_latency_ms()
+    for _ in range(2):
+        assert post_voice(b"second clip").headers["X-Analysis-Tier"] == REDUCED
+    # Only full-tier analyses feed the latency window
+    assert routes.tier_selector.recent_latency_ms() == full_latency
+    # The full answer was cached, the reduced one was not
+    cached = post_voice(b"first clip")
+    assert cached.headers["X-Analysis-Tier"] == FULL
+    assert cached.json() == {**RESULT, "analysisTier": FULL}
+    stats = TestClient(app).get("/api/analysis/tiers", headers={"x-api-key": settings.API_KEY})
+    assert stats.json()["chosen"] == {FULL: 1, REDUCED: 2, MINIMAL: 0}
+    assert routes.result_cache.stats()["entries"] == 1
+
+    assert [getattr(fn, "keywords", {}).get("tier", FULL) for fn, _ in calls] == [FULL, REDUCED, REDUCED]
+    assert metrics.value("echotrace_analysis_tier_total", tier=REDUCED) == reduced_before + 2
+
+
+def test_minimal_tier_skips_the_pool_queue(monkeypatch, stub_pool, post_voice):
+    stub_pool(AssertionError("minimal tier waited for the process pool"))
+    monkeypatch.setattr(routes, "result_cache", MemoryResultCache(max_entries=16, max_bytes=2**20, ttl_seconds=60))
+    monkeypatch.setattr(routes, "tier_selector", TierSelector(reduced_queue=0, minimal_queue=1, reduced_ms=0, minimal_ms=0))
+    monkeypatch.setattr(routes.analysis_executor, "_in_flight", routes.analysis_executor.max_workers + 1)
+
+    response = post_voice(b"queued behind full jobs")
+    assert response.status_code == 200
+    assert response.headers["X-Analysis-Tier"] == MINIMAL
+    assert response.json()["analysisTier"] == MINIMAL
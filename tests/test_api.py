@@ -38,4 +38,12 @@ def test_root_endpoint():
     """Test root endpoint returns API info."""
     response = client.get("/")
     assert response.status_code == 200
-    assert "projwhitehat" in response.json()["message"]
\ No newline at end of file
+    assert "projwhitehat" in response.json()["message"]
+
+
+@pytest.mark.parametrize("path", ["/api/cache/stats", "/api/cascade/stats", "/api/analysis/tiers"])
+def test_stats_endpoints_require_api_key(path):
+    """Operational stats are behind the same x-api-key check as the analysis routes."""
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={"x-api-key": "wrong-key"}).status_code == 401
+    assert client.get(path, headers={"x-api-key": settings.API_KEY}).status_code == 200
@@ -0,0 +1,39 @@
+import base64
+
+import numpy as np
+import pytest
+
+from app.services import audio_decoder
+from app.services.audio_decoder import b64decode_audio, decode_audio, decode_base64_audio
+from tests.conftest import VOICE_RESULT
+
+
+def test_native_decoder_handles_mp3(sample_bytes):
+    y, sr, decoder = decode_audio(sample_bytes)
+    assert decoder == "soundfile"
+    assert sr == 16000
+    assert y.dtype == np.float32 and y.ndim == 1
+
+
+def test_native_decoder_matches_librosa_path(sample_bytes):
+    """Single soxr resample gives the same waveform as librosa.load."""
+    native, _ = audio_decoder._load_with_soundfile(sample_bytes, sr=16000)
+    reference, _ = audio_decoder._load_with_librosa_bytestream(sample_bytes, sr=16000)
+    assert native.shape == reference.shape
+    assert np.max(np.abs(native - reference)) < 1e-5
+
+
+def test_undecodable_bytes_degrade_gracefully():
+    assert decode_audio(b"definitely not audio") == (None, None, None)
+    assert decode_base64_audio(base64.b64encode(b"definitely not audio").decode()) == (None, None)
+
+
+def test_invalid_base64_raises_value_error():
+    with pytest.raises(ValueError):
+        b64decode_audio("broken")
+
+
+def test_voice_detection_reports_decoder(stub_pool, post_voice):
+    stub_pool({"result": VOICE_RESULT, "features": {"pitch_variance": 1.0}, "decoder": "soundfile"})
+    response = post_voice(b"clip")
+    assert response.headers["X-Audio-Decoder"] == "soundfile"
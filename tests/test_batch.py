@@ -0,0 +1,98 @@
+import base64
+import itertools
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.services import audio_analyzer
+from app.services.feature_extractor import (
+    bucket_by_length,
+    extract_voice_features,
+    extract_voice_features_batch,
+)
+from app.services.integrated_service import classify_voice, classify_voice_batch, FEATURE_COLUMNS
+from app.services.metrics import metrics
+from benchmarks.synthetic import SR, noise_bursts, speech_like
+
+
+def test_classify_voice_batch_matches_scalar_rules():
+    """Vectorized engine agrees with classify_voice on every rule combination."""
+    values = {
+        "pitch_variance": [0.1, 0.15, 0.2],
+        "rhythm_variance": [0.05, 0.2],
+        "pause_ratio": [0.01, 0.05],
+        "spectral_smoothness": [0.5, 0.9],
+    }
+    rows, languages = [], []
+    for combo in itertools.product(*values.values()):
+        for language in ["English", "Tamil"]:
+            rows.append(combo)
+            languages.append(language)
+
+    batch = classify_voice_batch(rows, languages)
+
+    for row, language, verdict in zip(rows, languages, batch):
+        features = dict(zip(FEATURE_COLUMNS, row), language=language)
+        assert verdict == classify_voice(features)
+
+
+def test_feature_batch_matches_single_clip():
+    """Padding and bucketing do not change feature values."""
+    ys = [speech_like(2.0, seed=1)[0], speech_like(2.4, seed=2)[0], noise_bursts(2.2)[0]]
+    batch = extract_voice_features_batch(ys, SR)
+    assert batch == [extract_voice_features(y, SR) for y in ys]
+
+
+def test_bucket_by_length_limits_padding():
+    buckets = bucket_by_length([100, 1000, 110, 1200, 120], slack=0.25)
+    assert buckets == [[0, 2, 4], [1, 3]]
+
+
+def test_batch_endpoint_keeps_order_and_reports_errors(monkeypatch, stub_pool):
+    clips = {b"A": speech_like(2.0, seed=3)[0], b"B": speech_like(2.2, seed=4)[0]}
+
+    def fake_decode(audio_bytes, audio_format="mp3", sr=16000, **kwargs):
+        return clips[audio_bytes], SR, "fake"
+
+    monkeypatch.setattr(audio_analyzer, "decode_audio", fake_decode)
+    stub_pool(inline=True)
+    decoded_before = metrics.value("echotrace_decoder_total", decoder="fake")
+    failed_before = metrics.value("echotrace_fallback_total", source="batch")
+    pitch_before = metrics.value("echotrace_stage_seconds", stage="pitch")
+
+    item = {"language": "English", "audioFormat": "mp3"}
+    response = TestClient(app).post(
+        "/api/voice-detection/batch",
+        json={"items": [
+            {**item, "audioBase64": base64.b64encode(b"A").decode()},
+            {**item, "language": "French", "audioBase64": base64.b64encode(b"A").decode()},
+            {**item, "audioBase64": "broken"},
+            {**item, "audioBase64": base64.b64encode(b"B").decode()},
+        ]},
+        headers={"x-api-key": settings.API_KEY}
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert [r["status"] for r in results] == ["success", "error", "error", "success"]
+    assert "Unsupported language" in results[1]["message"]
+    assert results[2]["message"] == "Invalid base64 audio data"
+    assert results[0]["classification"] in ("HUMAN", "AI_GENERATED")
+
+    # Batch clips are traced and counted like single requests
+    assert metrics.value("echotrace_decoder_total", decoder="fake") == decoded_before + 2
+    assert metrics.value("echotrace_fallback_total", source="batch") > failed_before
+    assert metrics.value("echotrace_stage_seconds", stage="pitch") > pitch_before
+
+
+def test_batch_endpoint_rejects_oversized_batch(monkeypatch):
+    monkeypatch.setattr(settings, "BATCH_MAX_ITEMS", 1)
+    item = {"language": "English", "audioFormat": "mp3", "audioBase64": "A"}
+    response = TestClient(app).post(
+        "/api/voice-detection/batch",
+        json={"items": [item, item]},
+        headers={"x-api-key": settings.API_KEY}
+    )
+    assert response.status_code == 400
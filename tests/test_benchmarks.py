@@ -0,0 +1,53 @@
+from app.services.audio_decoder import decode_base64_audio
+from benchmarks.pipeline import compare, encode_mp3_base64, run
+from benchmarks.synthetic import SR, flat_pitch
+
+
+def test_synthetic_corpus_round_trips_through_mp3():
+    y, _ = flat_pitch(1.0)
+    decoded, sr = decode_base64_audio(encode_mp3_base64(y))
+    assert sr == SR
+    assert abs(len(decoded) - len(y)) < SR // 10
+
+
+def test_run_reports_every_stage():
+    rows = run([1.0], repeats=1)
+    stages = {r["stage"] for r in rows if r["signal"] == "speech_like"}
+    assert stages == {"decode", "pitch", "features", "temporal", "classify"}
+    assert all(r["p95_ms"] >= r["p50_ms"] >= 0 for r in rows)
+
+
+def test_compare_flags_regressions_only():
+    baseline = [{"signal": "s", "seconds": 2.0, "stage": "pitch", "p50_ms": 100.0, "peak_alloc_mb": 10.0}]
+    ok = [{"signal": "s", "seconds": 2.0, "stage": "pitch", "p50_ms": 140.0, "peak_alloc_mb": 10.5}]
+    slow = [{"signal": "s", "seconds": 2.0, "stage": "pitch", "p50_ms": 160.0, "peak_alloc_mb": 10.0}]
+    unknown = [{"signal": "other", "seconds": 2.0, "stage": "pitch", "p50_ms": 999.0, "peak_alloc_mb": 99.0}]
+
+    assert compare(ok, baseline, tolerance=0.5) == []
+    assert len(compare(slow, baseline, tolerance=0.5)) == 1
+    assert compare(unknown, baseline, tolerance=0.5) == []
+
+
+def test_compare_skips_metrics_missing_from_either_side():
+    baseline = [{"signal": "s", "seconds": 2.0, "stage": "route", "p50_ms": 100.0, "peak_alloc_mb": 0.1}]
+    current = [{"signal": "s", "seconds": 2.0, "stage": "route", "p50_ms": 100.0}]
+    assert compare(current, baseline, tolerance=0.5) == []
+
+
+def test_route_stage_leaves_the_server_cache_alone(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.api import routes
+    from app.main import app
+    from benchmarks.pipeline import isolated_routes
+
+    served = routes.result_cache
+    served.set("sentinel", {"status": "success"})
+    entries = served.stats()["entries"]
+    with isolated_routes():
+        rows = run([1.0], repeats=1, client=TestClient(app))
+        assert routes.feature_store is None
+    assert routes.result_cache is served
+    assert served.stats()["entries"] == entries
+    route_rows = [r for r in rows if r["stage"] == "route"]
+    assert route_rows and all("peak_alloc_mb" not in r for r in route_rows)
@@ -0,0 +1,84 @@
+import base64
+import os
+
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services import audio_decoder
+from app.services.audio_decoder import BytesReader, decode_audio, pooled_b64decode
+from app.services.buffer_pool import BufferPool, process_budget, size_class
+
+def test_size_classes_bound_waste():
+    for n in (1, 4096, 5000, 70_000, 1_000_000, 12_345_678):
+        size = size_class(n)
+        assert size >= n
+        assert size <= max(4096, 1.125 * n + 4096)
+
+
+def test_pool_reuses_released_buffers_within_budget():
+    pool = BufferPool(max_bytes=1 << 20)
+    with pool.lease(100_000) as first:
+        pass
+    with pool.lease(99_000) as second:
+        assert second is first
+    assert pool.stats()["hits"] == 1
+
+    with pool.lease(2 << 20):
+        pass
+    assert pool.stats()["retained_bytes"] <= 1 << 20
+
+
+def test_lease_array_is_writable_view():
+    pool = BufferPool(max_bytes=1 << 20)
+    with pool.lease_array((1000, 2)) as a:
+        a[:] = 1.5
+        assert a.shape == (1000, 2) and a.dtype == np.float32
+        assert float(a.sum()) == 3000.0
+
+
+@pytest.mark.parametrize("payload", [b"", b"x", os.urandom(100_001), os.urandom(300_000)])
+def test_pooled_b64decode_matches_b64decode(payload, monkeypatch):
+    monkeypatch.setattr(audio_decoder, "B64_CHUNK_CHARS", 4 * 1024)
+    encoded = base64.b64encode(payload).decode() or "===="
+    with pooled_b64decode(encoded) as view:
+        assert view.readonly
+        assert bytes(view) == base64.b64decode(encoded)
+
+
+def test_pooled_b64decode_line_wrapped_and_invalid(monkeypatch):
+    monkeypatch.setattr(audio_decoder, "B64_CHUNK_CHARS", 4 * 10)
+    payload = os.urandom(5000)
+    wrapped = base64.encodebytes(payload).decode()  # newline every 76 chars
+    with pooled_b64decode(wrapped) as view:
+        assert bytes(view) == payload
+    with pytest.raises(ValueError):
+        with pooled_b64decode("abc"):
+            pass
+    with pytest.raises(ValueError):
+        with pooled_b64decode(""):
+            pass
+
+
+def test_bytes_reader_decode_is_stable_across_pool_reuse(monkeypatch, sample_bytes):
+    data = sample_bytes
+    reader = BytesReader(memoryview(data))
+    assert reader.read(3) == data[:3]
+    reader.seek(-2, 2)
+    assert reader.read() == data[-2:]
+
+    pool = BufferPool(max_bytes=1 << 28)
+    monkeypatch.setattr(audio_decoder, "buffer_pool", pool)
+    first, sr, decoder = decode_audio(memoryview(data))
+    hits = pool.stats()["hits"]
+    # The second decode reads into the scratch buffers the first one released
+    second, _, _ = decode_audio(data)
+    assert pool.stats()["hits"] > hits
+    assert decoder == "soundfile" and sr == 16000
+    np.testing.assert_array_equal(first, second)
+
+
+def test_budget_is_split_across_processes(monkeypatch):
+    monkeypatch.setattr(settings, "BUFFER_POOL_MAX_BYTES", 10 * 2**20)
+    monkeypatch.setattr(settings, "ANALYSIS_WORKERS", 4)
+    assert process_budget() == 2 * 2**20
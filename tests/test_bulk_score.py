@@ -0,0 +1,133 @@
+import csv
+import json
+import os
+import shutil
+
+import pytest
+
+from app import bulk_score
+from app.config import settings
+from app.services.integrated_service import integrated_service
+from app.services.result_cache import MemoryResultCache
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch, sample_mp3):
+    monkeypatch.setattr(settings, "ANALYSIS_WARMUP", False)
+    root = tmp_path / "audio"
+    (root / "sub").mkdir(parents=True)
+    shutil.copy(sample_mp3, root / "a.mp3")
+    shutil.copy(sample_mp3, root / "sub" / "b.mp3")
+    (root / "empty.mp3").write_bytes(b"")
+    (root / "notes.txt").write_text("not audio")
+    return root
+
+
+def _rows(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_iter_inputs_directory_and_manifest(corpus, tmp_path):
+    walked = [os.path.relpath(p, corpus) for p, _ in bulk_score.iter_inputs(str(corpus), "English")]
+    assert walked == ["a.mp3", "empty.mp3", os.path.join("sub", "b.mp3")]
+
+    manifest = tmp_path / "manifest.csv"
+    manifest.write_text("# archived calls\naudio/a.mp3,Tamil\naudio/sub/b.mp3\n")
+    items = list(bulk_score.iter_inputs(str(manifest), "English"))
+    assert items == [(str(corpus / "a.mp3"), "Tamil"), (str(corpus / "sub" / "b.mp3"), "English")]
+
+
+def test_score_file_uses_result_cache(monkeypatch, sample_mp3):
+    monkeypatch.setattr(bulk_score, "_cache", MemoryResultCache(100, 1 << 20, 60))
+    first = bulk_score.score_file(sample_mp3, "English")
+    second = bulk_score.score_file(sample_mp3, "English")
+
+    assert first["status"] == "success" and first["cached"] is False
+    assert first["duration_seconds"] > 20
+    assert second["cached"] is True
+    assert second["classification"] == first["classification"]
+
+
+def test_run_writes_jsonl_and_resumes(corpus, tmp_path):
+    output = tmp_path / "results.jsonl"
+    progress = bulk_score.run(str(corpus), str(output), workers=1, chunk_size=2)
+
+    rows = {os.path.basename(r["path"]): r for r in _rows(output)}
+    assert set(rows) == {"a.mp3", "b.mp3", "empty.mp3"}
+    assert rows["empty.mp3"]["status"] == "error"
+    assert rows["a.mp3"]["status"] == "success"
+    assert progress.files == 3 and progress.errors == 1
+
+    # Simulate an interrupted run: drop one row and leave a torn line behind
+    kept = [line for line in output.read_text().splitlines() if "b.mp3" not in line]
+    output.write_text("\n".join(kept) + '\n{"path": "tor')
+    progress = bulk_score.run(str(corpus), str(output), workers=1)
+    assert progress.files == 2  # b.mp3, and empty.mp3 again: error rows are retried
+    assert sorted(os.path.basename(r["path"]) for r in _rows_lenient(output)) == [
+        "a.mp3", "b.mp3", "empty.mp3", "empty.mp3"
+    ]
+
+
+def _rows_lenient(path):
+    rows = []
+    with open(path) as f:
+        for line in f:
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                pass
+    return rows
+
+
+def test_run_writes_csv(corpus, tmp_path):
+    output = tmp_path / "results.csv"
+    bulk_score.run(str(corpus), str(output), workers=1)
+    bulk_score.run(str(corpus), str(output), workers=1)  # only the empty file again
+
+    with open(output, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 4
+    assert list(rows[0]) == list(bulk_score.OUTPUT_FIELDS)
+
+
+def test_fallback_rows_are_retried(monkeypatch, tmp_path, sample_mp3):
+    monkeypatch.setattr(bulk_score, "_cache", MemoryResultCache(100, 1 << 20, 60))
+    fallback = integrated_service._get_safe_fallback("English", "test")
+    monkeypatch.setattr(
+        integrated_service, "analyze_audio_bytes_detailed",
+        lambda *args: {"result": fallback, "features": None, "decoder": None}
+    )
+
+    row = bulk_score.score_file(sample_mp3, "English")
+    assert row["status"] == "fallback"
+    assert bulk_score.score_file(sample_mp3, "English")["cached"] is False
+
+    output = tmp_path / "results.jsonl"
+    other = str(tmp_path / "other.mp3")
+    output.write_text(json.dumps(row) + "\n" + json.dumps({"path": other, "status": "success"}) + "\n")
+    assert bulk_score.completed_paths(str(output)) == {other}
+
+
+def test_unexpected_errors_become_error_rows(monkeypatch, sample_mp3):
+    monkeypatch.setattr(bulk_score, "_cache", MemoryResultCache(100, 1 << 20, 60))
+
+    def explode(*args):
+        raise RuntimeError("decoder crashed")
+    monkeypatch.setattr(integrated_service, "analyze_audio_bytes_detailed", explode)
+
+    row = bulk_score.score_file(sample_mp3, "English")
+    assert row["status"] == "error" and row["message"] == "decoder crashed"
+
+
+def test_local_verdicts_are_not_cached_as_cascade_answers(monkeypatch, sample_mp3, sample_bytes):
+    from app.services.result_cache import audio_digest, make_cache_key
+
+    cache = MemoryResultCache(100, 1 << 20, 60)
+    monkeypatch.setattr(bulk_score, "_cache", cache)
+    monkeypatch.setattr(settings, "DETECTION_MODE", "cascade")
+    bulk_score.score_file(sample_mp3, "English")
+
+    digest = audio_digest(sample_bytes)
+    assert cache.get(make_cache_key(digest, "English")) is None
+    assert cache.get(make_cache_key(digest, "English", mode="local")) is not None
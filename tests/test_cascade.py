@@ -0,0 +1,79 @@
+import asyncio
+
+from app.api import routes
+from app.config import settings
+from app.services.cascade_service import CascadeDetectionService
+from app.services.integrated_service import voice_ai_score
+
+GEMINI_ANSWER = {"status": "success", "language": "English", "classification": "HUMAN",
+                 "confidenceScore": 0.92, "explanation": "gemini"}
+
+# ai_score 0, 2 and 4 feature vectors
+HUMAN_LIKE = {"pitch_variance": 0.5, "rhythm_variance": 0.5, "pause_ratio": 0.2, "spectral_smoothness": 0.5}
+AMBIGUOUS = {"pitch_variance": 0.01, "rhythm_variance": 0.01, "pause_ratio": 0.2, "spectral_smoothness": 0.5}
+AI_LIKE = {"pitch_variance": 0.01, "rhythm_variance": 0.01, "pause_ratio": 0.0, "spectral_smoothness": 0.99}
+
+
+class StubGemini:
+    def __init__(self, answer=GEMINI_ANSWER, delay=0.0):
+        self.answer = answer
+        self.delay = delay
+        self.calls = 0
+
+    async def try_analyze_async(self, audio_base64, language, timeout=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.answer
+
+
+def _local_job(features):
+    result = {"status": "success", "language": "English", "classification": "AI_GENERATED",
+              "confidenceScore": 0.55, "explanation": "local"}
+    return {"result": result, "features": dict(features, language="English"), "decoder": "fake"}
+
+
+def test_voice_ai_score_counts_rules():
+    assert [voice_ai_score(f) for f in (HUMAN_LIKE, AMBIGUOUS, AI_LIKE)] == [0, 2, 4]
+
+
+def test_decisive_clips_stay_local(stub_pool):
+    gemini = StubGemini()
+    service = CascadeDetectionService(gemini=gemini)
+    for features in (HUMAN_LIKE, AI_LIKE):
+        stub_pool(_local_job(features))
+        job = asyncio.run(service.analyze("QQ==", "English"))
+        assert job["tier"] == "local"
+    assert gemini.calls == 0
+    assert service.stats.snapshot()["escalation_rate"] == 0.0
+
+
+def test_ambiguous_clips_escalate(stub_pool):
+    stub_pool(_local_job(AMBIGUOUS))
+    service = CascadeDetectionService(gemini=StubGemini())
+    job = asyncio.run(service.analyze("QQ==", "English"))
+    assert job["tier"] == "gemini"
+    assert job["result"] == GEMINI_ANSWER
+
+    stats = service.stats.snapshot()
+    assert stats["escalated"] == 1 and stats["gemini_answered"] == 1
+    assert set(stats["latency_ms"]) == {"local", "gemini"}
+
+
+def test_local_seconds_exclude_the_gemini_wait(stub_pool):
+    stub_pool(_local_job(AMBIGUOUS))
+    service = CascadeDetectionService(gemini=StubGemini(delay=0.2))
+    job = asyncio.run(service.analyze("QQ==", "English"))
+    assert job["tier"] == "gemini"
+    assert job["local_seconds"] < 0.1
+
+
+def test_unanswered_escalation_keeps_local_verdict_uncached(monkeypatch, stub_pool, post_voice):
+    stub_pool(_local_job(AMBIGUOUS))
+    monkeypatch.setattr(settings, "DETECTION_MODE", "cascade")
+    monkeypatch.setattr(routes, "cascade_service", CascadeDetectionService(gemini=StubGemini(answer=None)))
+
+    for _ in range(2):
+        response = post_voice(b"A")
+        assert response.headers["X-Detection-Tier"] == "local_fallback"
+        assert response.json()["explanation"] == "local"
+    assert routes.cascade_service.stats.snapshot()["escalated"] == 2
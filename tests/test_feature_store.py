@@ -0,0 +1,91 @@
+import csv
+
+from app.config import settings
+from app.services import feature_store as store_module
+from app.services.feature_store import FeatureStore
+from app.services.integrated_service import classify_voice
+from app.services.result_cache import audio_digest
+
+HUMAN_LIKE = {"pitch_variance": 5.0, "rhythm_variance": 0.5, "pause_ratio": 0.2,
+              "spectral_smoothness": 0.6, "duration_seconds": 3.0}
+BORDERLINE = {"pitch_variance": 0.1, "rhythm_variance": 0.05, "pause_ratio": 0.2,
+              "spectral_smoothness": 0.82, "duration_seconds": 4.0}
+
+
+def test_segments_round_trip_and_keep_latest(tmp_path):
+    store = FeatureStore(str(tmp_path), flush_rows=2)
+    store.append("d1", "English", HUMAN_LIKE)
+    store.append("d2", "Tamil", BORDERLINE)   # triggers a segment flush
+    store.append("d1", "English", BORDERLINE)  # newer vector for d1
+
+    data = FeatureStore(str(tmp_path)).load()  # flushes nothing; reads segments only
+    assert sorted(data["digest"]) == ["d1", "d2"]
+
+    data = store.load()
+    d1 = list(data["digest"]).index("d1")
+    assert data["spectral_smoothness"][d1] == BORDERLINE["spectral_smoothness"]
+
+
+def test_store_directory_tracks_feature_settings(tmp_path, monkeypatch):
+    FeatureStore(str(tmp_path), flush_rows=1).append("d1", "English", HUMAN_LIKE)
+    assert len(FeatureStore(str(tmp_path)).load()["digest"]) == 1
+    monkeypatch.setattr(settings, "VAD_ENABLED", False)
+    assert len(FeatureStore(str(tmp_path)).load()["digest"]) == 0
+
+
+def test_rescore_matches_classify_voice(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    store.append("h", "English", HUMAN_LIKE)
+    store.append("b", "Tamil", BORDERLINE)
+
+    scored = store.rescore()
+    for digest, language, classification, confidence in zip(
+        scored["digest"], scored["language"], scored["classification"], scored["confidenceScore"]
+    ):
+        features = {"h": HUMAN_LIKE, "b": BORDERLINE}[digest]
+        expected = classify_voice({**features, "language": language})
+        assert (classification, float(confidence)) == expected[:2]
+
+
+def test_rescore_with_new_threshold_and_csv(tmp_path):
+    directory = str(tmp_path / "store")
+    store = FeatureStore(directory)
+    store.append("b", "English", BORDERLINE)
+    store.flush()
+
+    assert store.rescore()["classification"][0] == "AI_GENERATED"
+    assert store.rescore({"smoothness": 0.8})["ai_score"][0] == 3
+
+    output = tmp_path / "verdicts.csv"
+    store_module.main(["rescore", "--dir", directory, "--threshold", "smoothness=0.8",
+                       "--output", str(output)])
+    rows = list(csv.DictReader(open(output)))
+    assert rows[0]["digest"] == "b"
+    assert rows[0]["ai_score"] == "3"
+
+
+def test_versions_are_isolated(tmp_path):
+    old = FeatureStore(str(tmp_path), version="1")
+    old.append("d", "English", HUMAN_LIKE)
+    old.flush()
+    assert len(FeatureStore(str(tmp_path), version="2").load()["digest"]) == 0
+
+
+HINDI_RESULT = {"status": "success", "language": "Hindi", "classification": "HUMAN",
+                "confidenceScore": 1.0, "explanation": "Normal voice characteristics detected"}
+
+
+def test_voice_detection_stores_features(stub_pool, post_voice, temporary_feature_store):
+    stub_pool({"result": HINDI_RESULT, "features": dict(HUMAN_LIKE)})
+    post_voice(b"clip", language="Hindi")
+
+    data = temporary_feature_store.load()
+    assert list(data["language"]) == ["Hindi"]
+    assert data["digest"][0] == audio_digest(b"clip")
+
+
+def test_lightweight_features_are_not_stored(stub_pool, post_voice, temporary_feature_store):
+    stub_pool({"result": HINDI_RESULT, "features": dict(HUMAN_LIKE), "decoder": "lightweight"})
+    post_voice(b"undecodable clip", language="Hindi")
+
+    assert len(temporary_feature_store.load()["digest"]) == 0
@@ -0,0 +1,152 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from app.services.gemini_service import CircuitBreaker, GeminiService
+
+ANSWER = json.dumps({
+    "classification": "HUMAN",
+    "confidenceScore": 0.9,
+    "language": "English",
+    "explanation": "Natural prosody"
+})
+LOCAL = {"status": "success", "language": "English", "classification": "AI_GENERATED",
+         "confidenceScore": 0.8, "explanation": "local"}
+
+
+class StubModel:
+    """Stands in for genai.GenerativeModel: fixed delay, optional failure."""
+
+    def __init__(self, delay=0.0, fail=False, text=ANSWER):
+        self.delay = delay
+        self.fail = fail
+        self.text = text
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+
+    async def generate_content_async(self, contents, request_options=None):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("upstream 500")
+            return SimpleNamespace(text=self.text)
+        finally:
+            self.active -= 1
+
+
+async def local_fallback(audio_base64, language):
+    return dict(LOCAL)
+
+
+def _service(model, **kwargs):
+    kwargs.setdefault("timeout", 1.0)
+    kwargs.setdefault("hedge_after", 0)
+    return GeminiService(model=model, local_fallback=local_fallback, **kwargs)
+
+
+def test_async_call_returns_parsed_answer():
+    result = asyncio.run(_service(StubModel()).analyze_audio_async("QQ==", "English"))
+    assert result["classification"] == "HUMAN"
+    assert result["confidenceScore"] == 0.9
+
+
+def test_deadline_falls_back_to_local_rules():
+    service = _service(StubModel(delay=5.0), timeout=0.05)
+    assert asyncio.run(service.analyze_audio_async("QQ==", "English")) == LOCAL
+
+
+def test_semaphore_caps_in_flight_calls():
+    model = StubModel(delay=0.02)
+    service = _service(model, max_concurrency=2)
+
+    async def run():
+        return await asyncio.gather(*(service.analyze_audio_async("QQ==", "English") for _ in range(6)))
+
+    results = asyncio.run(run())
+    assert model.peak == 2
+    assert all(r["classification"] == "HUMAN" for r in results)
+
+
+def test_hedged_request_takes_first_answer():
+    class SlowFirst(StubModel):
+        async def generate_content_async(self, contents, request_options=None):
+            self.delay = 5.0 if self.calls == 0 else 0.0
+            return await super().generate_content_async(contents, request_options)
+
+    model = SlowFirst()
+    service = _service(model, hedge_after=0.01, timeout=1.0)
+    result = asyncio.run(service.analyze_audio_async("QQ==", "English"))
+    assert result["classification"] == "HUMAN"
+    assert service.hedged == 1
+
+
+def test_deadline_before_hedge_cancels_the_upstream_call():
+    model = StubModel(delay=5.0)
+    service = _service(model, hedge_after=1.0, timeout=0.05)
+
+    async def run():
+        result = await service.analyze_audio_async("QQ==", "English")
+        await asyncio.sleep(0)
+        return result, model.active  # before asyncio.run cancels leftovers
+
+    assert asyncio.run(run()) == (LOCAL, 0)
+    assert model.calls == 1
+    assert service.hedged == 0
+
+
+def test_breaker_opens_on_errors_and_recovers():
+    now = [0.0]
+    breaker = CircuitBreaker(window=4, error_rate=0.5, min_calls=4, cooldown=10, clock=lambda: now[0])
+    model = StubModel(fail=True)
+    service = _service(model, breaker=breaker)
+
+    async def call():
+        return await service.analyze_audio_async("QQ==", "English")
+
+    for _ in range(4):
+        assert asyncio.run(call()) == LOCAL
+    assert breaker.state == "open"
+
+    # Open: fails fast without calling upstream
+    asyncio.run(call())
+    assert model.calls == 4
+
+    # After the cooldown one probe goes through and closes the breaker
+    now[0] = 11
+    model.fail = False
+    assert asyncio.run(call())["classification"] == "HUMAN"
+    assert breaker.state == "closed"
+
+
+def test_cancelled_probe_releases_half_open_breaker():
+    now = [0.0]
+    breaker = CircuitBreaker(window=2, error_rate=0.5, min_calls=2, cooldown=10, clock=lambda: now[0])
+    breaker.record(False)
+    breaker.record(False)
+    now[0] = 11
+    service = _service(StubModel(delay=5.0), breaker=breaker)
+
+    async def cancel_probe():
+        probe = asyncio.ensure_future(service.try_analyze_async("QQ==", "English"))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        try:
+            await probe
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(cancel_probe())
+    assert breaker.state == "half_open"
+    assert breaker.allow()  # the next call may probe
+
+
+def test_invalid_json_counts_as_failure():
+    breaker = CircuitBreaker(window=2, error_rate=0.5, min_calls=2)
+    service = _service(StubModel(text="not json"), breaker=breaker)
+    for _ in range(2):
+        assert asyncio.run(service.analyze_audio_async("QQ==", "English")) == LOCAL
+    assert breaker.state == "open"
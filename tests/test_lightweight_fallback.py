@@ -0,0 +1,51 @@
+import base64
+import math
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from app.services.lightweight_fallback import (
+    BLOCK_BYTES,
+    lightweight_audio_features,
+    lightweight_audio_features_batch,
+)
+
+CLASSIFY_KEYS = ("pitch_variance", "rhythm_variance", "pause_ratio", "spectral_smoothness")
+
+
+def _counter_reference(raw: bytes) -> dict:
+    """The original Counter-based implementation."""
+    size = len(raw)
+    entropy = -sum((c / size) * math.log2(c / size) for c in Counter(raw).values())
+    return {
+        "pitch_variance": min(0.3, entropy / 10),
+        "rhythm_variance": min(0.3, size / 1_000_000),
+        "pause_ratio": max(0.02, entropy / 12),
+        "spectral_smoothness": min(0.95, 1 - entropy / 15)
+    }
+
+
+@pytest.mark.parametrize("size", [1, 1000, 3 * BLOCK_BYTES + 17])
+def test_matches_counter_implementation(size):
+    raw = np.random.default_rng(size).integers(0, 60, size, dtype=np.uint8).tobytes()
+    expected = _counter_reference(raw)
+    for payload in (raw, base64.b64encode(raw).decode()):
+        features = lightweight_audio_features(payload)
+        for key in CLASSIFY_KEYS:
+            assert features[key] == pytest.approx(expected[key], abs=1e-12)
+
+
+def test_block_entropy_profile():
+    # Constant first block, random second block: entropies 0 and ~8 bits
+    raw = bytes(BLOCK_BYTES) + np.random.default_rng(0).integers(0, 256, BLOCK_BYTES, dtype=np.uint8).tobytes()
+    features = lightweight_audio_features(raw)
+    assert features["block_entropy_mean"] == pytest.approx(4.0, abs=0.01)
+    assert features["block_entropy_variance"] == pytest.approx(16.0, abs=0.1)
+
+
+def test_batch_matches_single_payloads():
+    rng = np.random.default_rng(1)
+    payloads = [rng.integers(0, 256, n, dtype=np.uint8).tobytes() for n in (10, 5000, 2 * BLOCK_BYTES)]
+    assert lightweight_audio_features_batch(payloads) == [lightweight_audio_features(p) for p in payloads]
+    assert lightweight_audio_features_batch([]) == []
@@ -0,0 +1,72 @@
+import numpy as np
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.services.integrated_service import classify_voice
+from app.services.live_scorer import LiveVoiceScorer
+from app.services.stream_extractor import StreamingFeatureExtractor
+from benchmarks.synthetic import SR, speech_like
+
+
+def _pcm16(y):
+    return (np.clip(y, -1, 1) * 32767).astype("<i2").tobytes()
+
+
+def test_live_scorer_emits_periodic_and_final_verdicts():
+    pcm = _pcm16(speech_like(7.0, seed=7)[0])
+    scorer = LiveVoiceScorer("English", verdict_every_sec=2.0, pitch_backend="yin")
+
+    verdicts = []
+    # 20 ms frames of odd byte length: samples split across messages
+    for start in range(0, len(pcm), 641):
+        verdicts.extend(scorer.feed(pcm[start:start + 641]))
+    final = scorer.finish()
+
+    assert [v["final"] for v in verdicts] == [False] * len(verdicts)
+    assert len(verdicts) == 3
+    assert [v["secondsAnalyzed"] >= 2.0 * (i + 1) for i, v in enumerate(verdicts)] == [True] * 3
+    assert final["final"] is True
+
+    # The final verdict is the one for the complete clip
+    extractor = StreamingFeatureExtractor(SR, pitch_backend="yin")
+    extractor.push(np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0)
+    classification, confidence, _ = classify_voice(dict(extractor.finalize(), language="English"))
+    assert (final["classification"], final["confidenceScore"]) == (classification, confidence)
+
+
+def test_live_scorer_resamples_other_rates():
+    y = speech_like(3.0, seed=8)[0]
+    pcm = _pcm16(np.interp(np.arange(0, len(y), SR / 8000), np.arange(len(y)), y))
+    scorer = LiveVoiceScorer("Hindi", sample_rate=8000, pitch_backend="yin")
+    scorer.feed(pcm)
+    final = scorer.finish()
+    assert abs(final["secondsAnalyzed"] - 3.0) < 0.05
+
+
+def test_live_websocket_streams_verdicts(monkeypatch):
+    monkeypatch.setattr(settings, "LIVE_VERDICT_SECONDS", 1.0)
+    pcm = _pcm16(speech_like(3.0, seed=9)[0])
+
+    client = TestClient(app)
+    with client.websocket_connect(
+        f"/api/voice-detection/live?language=Tamil&apiKey={settings.API_KEY}"
+    ) as ws:
+        ws.send_bytes(pcm)
+        first = ws.receive_json()
+        ws.send_text("end")
+        messages = [first]
+        while not messages[-1]["final"]:
+            messages.append(ws.receive_json())
+
+    assert first["status"] == "success" and first["language"] == "Tamil"
+    assert messages[-1]["classification"] in ("HUMAN", "AI_GENERATED")
+
+
+def test_live_websocket_rejects_bad_language():
+    client = TestClient(app)
+    with client.websocket_connect(
+        "/api/voice-detection/live?language=French",
+        headers={"x-api-key": settings.API_KEY}
+    ) as ws:
+        assert ws.receive_json()["status"] == "error"
@@ -0,0 +1,118 @@
+import base64
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.services import audio_analyzer
+from app.services.audio_analyzer import analyze_audio, analyze_audio_file
+from app.services.feature_extractor import HOP_LENGTH
+from app.services.integrated_service import integrated_service
+from app.services.long_audio import select_segments
+from app.services.spectral import SILENCE_RMS
+from benchmarks.pipeline import encode_mp3_base64
+
+SR = 16000
+
+
+@pytest.fixture
+def long_mode(monkeypatch):
+    """Treat the ~24 s sample as a long recording: three 3 s segments."""
+    monkeypatch.setattr(settings, "LONG_AUDIO_MIN_SEC", 5.0)
+    monkeypatch.setattr(settings, "LONG_AUDIO_SEGMENT_SEC", 3.0)
+    monkeypatch.setattr(settings, "LONG_AUDIO_MAX_SEGMENTS", 3)
+
+
+def test_select_segments_one_per_stratum_and_skips_silence():
+    frames_per_segment = int(1.0 * SR / HOP_LENGTH)
+    energies = np.zeros(12 * frames_per_segment)
+    for window in (1, 5, 6, 11):  # speech in these one-second windows
+        energies[window * frames_per_segment:(window + 1) * frames_per_segment] = 10 * SILENCE_RMS
+
+    bounds = select_segments(energies, segment_sec=1.0, max_segments=4, sr=SR)
+
+    starts = [round(start / (frames_per_segment * HOP_LENGTH / SR)) for start, _ in bounds]
+    # Strata are windows 0-2, 3-5, 6-8, 9-11: the densest speech window of each
+    assert starts == [1, 5, 6, 11]
+    assert all(end > start for start, end in bounds)
+
+
+def test_select_segments_all_silence():
+    assert select_segments(np.zeros(2000), segment_sec=1.0, max_segments=4, sr=SR) == []
+
+
+def test_short_clip_uses_full_decode(sample_base64):
+    analysis = analyze_audio(sample_base64, "English")
+    assert analysis["decoder"] != "soundfile-long"
+    assert "segments" not in analysis
+
+
+def test_long_recording_is_sampled(long_mode, sample_base64):
+    analysis = analyze_audio(sample_base64, "English")
+
+    assert analysis["decoder"] == "soundfile-long"
+    assert 1 <= len(analysis["segments"]) <= 3
+    for segment in analysis["segments"]:
+        assert 0 <= segment["start"] < segment["end"] <= analysis["features"]["duration_seconds"]
+        assert segment["features"]["duration_seconds"] == pytest.approx(3.0, abs=0.05)
+    assert analysis["features"]["analyzed_seconds"] <= 9.05
+    assert analysis["features"]["pitch_consistency"] in ("CONSISTENT", "INCONSISTENT", "INCONCLUSIVE")
+
+
+def test_long_recording_file_matches_base64(long_mode, sample_mp3, sample_base64):
+    from_file = analyze_audio_file(sample_mp3, "English")
+    from_base64 = analyze_audio(sample_base64, "English")
+    assert from_file["features"] == from_base64["features"]
+
+
+def test_long_recording_has_segment_verdicts(long_mode, sample_base64):
+    result = integrated_service.analyze_audio_integrated(sample_base64, "English")
+
+    assert result["status"] == "success"
+    assert result["segments"]
+    for segment in result["segments"]:
+        assert segment["classification"] in ("AI_GENERATED", "HUMAN")
+        assert 0.0 <= segment["confidenceScore"] <= 1.0
+
+
+def test_long_silent_recording_is_never_fully_decoded(long_mode, monkeypatch):
+    def full_decode(*args, **kwargs):
+        raise AssertionError("long recording went through decode_audio")
+
+    monkeypatch.setattr(audio_analyzer, "decode_audio", full_decode)
+    quiet = 0.001 * np.random.default_rng(0).standard_normal(12 * SR).astype(np.float32)
+
+    analysis = analyze_audio(encode_mp3_base64(quiet, SR), "English")
+
+    # No speech anywhere: the first segment stands in for the sample
+    assert analysis["decoder"] == "soundfile-long"
+    assert [(s["start"], s["end"]) for s in analysis["segments"]] == [(0.0, 3.0)]
+    assert analysis["features"]["analyzed_seconds"] <= 3.05
+
+
+def test_undecodable_long_recording_gets_safe_fallback(long_mode, monkeypatch, sample_base64):
+    def broken(*args, **kwargs):
+        raise RuntimeError("decoder crashed")
+
+    monkeypatch.setattr(audio_analyzer, "analyze_long_audio", broken)
+    monkeypatch.setattr(audio_analyzer, "decode_audio", broken)
+    job = integrated_service.analyze_audio_detailed(sample_base64, "English")
+    assert job["features"] is None
+    assert job["result"]["status"] == "success"
+
+
+def test_batch_sends_long_recordings_to_their_own_job(long_mode, stub_pool, sample_base64):
+    calls = stub_pool(inline=True)
+    short = {"language": "English", "audioFormat": "mp3", "audioBase64": base64.b64encode(b"short clip").decode()}
+    response = TestClient(app).post(
+        "/api/voice-detection/batch",
+        json={"items": [{**short, "audioBase64": sample_base64}, short]},
+        headers={"x-api-key": settings.API_KEY}
+    )
+
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["success", "success"]
+    assert results[0]["segments"] and "segments" not in results[1]
+    assert sorted(fn.__name__ for fn, _ in calls) == ["analyze_audio_job", "analyze_batch_job"]
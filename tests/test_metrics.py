@@ -0,0 +1,88 @@
+import logging
+import time
+
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.config import settings
+from app.main import app
+from app.services import metrics as metrics_module
+from app.services.integrated_service import analyze_audio_job
+from app.services.metrics import Metrics, slow_request_profile, stage, trace
+from tests.conftest import VOICE_RESULT
+
+
+def test_stage_records_only_inside_a_trace():
+    with stage("outside"):
+        pass
+    with trace() as timings:
+        with stage("decode"):
+            time.sleep(0.01)
+        with stage("decode"):
+            pass
+    assert list(timings) == ["decode"]
+    assert timings["decode"] >= 0.01
+
+
+def test_render_prometheus_histogram_and_counter():
+    registry = Metrics(buckets=(0.1, 1.0))
+    registry.observe("echotrace_stage_seconds", 0.5, stage="pitch")
+    registry.observe("echotrace_stage_seconds", 2.0, stage="pitch")
+    registry.inc("echotrace_fallback_total", source="gemini")
+
+    text = registry.render()
+    assert "# TYPE echotrace_stage_seconds histogram" in text
+    assert 'echotrace_stage_seconds_bucket{stage="pitch",le="0.1"} 0' in text
+    assert 'echotrace_stage_seconds_bucket{stage="pitch",le="1.0"} 1' in text
+    assert 'echotrace_stage_seconds_bucket{stage="pitch",le="+Inf"} 2' in text
+    assert 'echotrace_stage_seconds_count{stage="pitch"} 2' in text
+    assert 'echotrace_fallback_total{source="gemini"} 1' in text
+
+
+def test_job_carries_stage_timings(sample_base64):
+    job = analyze_audio_job(sample_base64, "English")
+    assert {"decode", "pitch", "features", "temporal", "classify"} <= set(job["timings"])
+
+    registry = Metrics()
+    registry.record_job(job)
+    assert registry.value("echotrace_stage_seconds", stage="pitch") == 1
+    assert registry.value("echotrace_decoder_total", decoder=job["decoder"]) == 1
+
+
+def test_record_job_counts_fallbacks():
+    registry = Metrics()
+    registry.record_job({"result": {}, "features": None, "decoder": None})
+    registry.record_job({"result": {}, "features": {}, "decoder": "lightweight"})
+    assert registry.value("echotrace_fallback_total", source="integrated") == 1
+    assert registry.value("echotrace_decoder_total", decoder="lightweight") == 1
+
+
+def test_metrics_endpoint(monkeypatch, stub_pool, post_voice):
+    registry = Metrics()
+    monkeypatch.setattr(routes, "metrics", registry)
+    monkeypatch.setattr(metrics_module, "metrics", registry)
+    stub_pool({"result": VOICE_RESULT, "features": None, "decoder": "soundfile", "timings": {"pitch": 0.2}})
+
+    assert post_voice(b"ID3").status_code == 200
+    assert registry.value("echotrace_stage_seconds", stage="pitch") == 1
+    assert registry.value("echotrace_fallback_total", source="integrated") == 1
+
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+
+def test_slow_request_profile_logs_hot_stacks(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "PROFILE_SLOW_MS", 10.0)
+    monkeypatch.setattr(settings, "PROFILE_INTERVAL_MS", 1.0)
+
+    def busy_wait():
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+
+    with caplog.at_level(logging.WARNING, logger="app.services.metrics"):
+        with slow_request_profile("test"):
+            busy_wait()
+    assert "[Slow request profile] test" in caplog.text
+    assert "busy_wait" in caplog.text
@@ -0,0 +1,107 @@
+import base64
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.services.audio_decoder import decode_audio
+from app.services.metrics import metrics
+from app.services.mp3_header import sniff_mp3_base64, sniff_mp3_bytes, sniff_mp3_file
+from benchmarks.pipeline import encode_mp3_base64
+from benchmarks.synthetic import speech_like
+
+
+def test_cbr_file_with_id3v2_tag(sample_mp3):
+    header = sniff_mp3_file(sample_mp3)
+    assert header["sample_rate"] == 44100
+    assert header["channels"] == 1
+    assert header["bitrate"] == 128000
+    assert not header["vbr"]
+    assert header["audio_offset"] > 10  # after the ID3v2 tag
+    # decoded length of this file is 23.59 s
+    assert header["duration_us"] == pytest.approx(23_590_000, rel=0.01)
+
+
+def test_id3v1_tag_is_not_counted_as_audio(sample_bytes):
+    data = sample_bytes
+    tagged = data + b"TAG" + bytes(125)
+    assert sniff_mp3_bytes(tagged)["duration_us"] == sniff_mp3_bytes(data)["duration_us"]
+
+
+@pytest.mark.parametrize("sr", [16000, 44100])
+def test_vbr_frame_count_header(sr):
+    y, _ = speech_like(6.0, sr=sr)
+    header = sniff_mp3_base64(encode_mp3_base64(y, sr))
+    assert header["vbr"]
+    assert header["sample_rate"] == sr
+    assert header["duration_us"] == pytest.approx(6_000_000, abs=100_000)
+
+
+def test_base64_sniff_matches_bytes_and_rejects_wrapped(sample_bytes):
+    data = sample_bytes
+    assert sniff_mp3_base64(base64.b64encode(data).decode()) == sniff_mp3_bytes(data)
+    wrapped = base64.encodebytes(data).decode()
+    with pytest.raises(ValueError):
+        sniff_mp3_base64(wrapped[:len(wrapped) // 4 * 4])
+
+
+@pytest.mark.parametrize("payload", [b"", b"hello world" * 100, os.urandom(50_000), b"\xff\xfb" * 10])
+def test_non_mp3_payloads(payload):
+    assert sniff_mp3_bytes(payload) is None
+
+
+def test_decode_audio_decoder_subset(sample_bytes):
+    y, _, decoder = decode_audio(sample_bytes, decoders=("soundfile",))
+    assert decoder == "soundfile" and len(y) > 0
+    assert decode_audio(b"not audio at all", decoders=("soundfile",)) == (None, None, None)
+
+
+def test_admission_rejects_long_and_large_clips(monkeypatch, stub_pool, post_voice, sample_bytes):
+    calls = stub_pool()
+    monkeypatch.setattr(settings, "MAX_AUDIO_SECONDS", 10.0)
+    assert post_voice(sample_bytes).status_code == 413
+
+    monkeypatch.setattr(settings, "MAX_AUDIO_SECONDS", 0.0)
+    monkeypatch.setattr(settings, "MAX_AUDIO_BYTES", 1000)
+    assert post_voice(sample_bytes).status_code == 413
+    assert calls == []
+
+
+def test_admission_non_mp3(monkeypatch, stub_pool, post_voice, sample_bytes):
+    calls = stub_pool()
+    assert post_voice(b"definitely not audio").status_code == 200  # byte-level fallback by default
+
+    monkeypatch.setattr(settings, "REJECT_NON_MP3", True)
+    response = post_voice(b"definitely not audio")
+    assert response.status_code == 415
+    assert response.json()["status"] == "error"
+    assert post_voice(sample_bytes).status_code == 200
+    assert len(calls) == 2
+
+
+def test_batch_items_get_the_same_admission(monkeypatch, stub_pool, sample_base64):
+    calls = stub_pool()
+    monkeypatch.setattr(settings, "MAX_AUDIO_SECONDS", 10.0)
+    monkeypatch.setattr(settings, "REJECT_NON_MP3", True)
+    rejected_before = metrics.value("echotrace_admission_rejected_total", reason="duration")
+    encoded = sample_base64
+    wrapped = "\n".join(encoded[i:i + 76] for i in range(0, len(encoded), 76))
+    item = {"language": "English", "audioFormat": "mp3"}
+
+    response = TestClient(app).post(
+        "/api/voice-detection/batch",
+        json={"items": [
+            {**item, "audioBase64": encoded},
+            {**item, "audioBase64": wrapped},
+            {**item, "audioBase64": base64.b64encode(b"definitely not audio").decode()},
+        ]},
+        headers={"x-api-key": settings.API_KEY}
+    )
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["error"] * 3
+    assert "seconds" in results[0]["message"] and "seconds" in results[1]["message"]
+    assert "not MPEG" in results[2]["message"]
+    assert metrics.value("echotrace_admission_rejected_total", reason="duration") == rejected_before + 2
+    assert calls == []
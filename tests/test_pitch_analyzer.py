@@ -0,0 +1,160 @@
+import numpy as np
+import librosa
+import pytest
+
+from app.services import audio_analyzer, pitch_analyzer
+from app.services.feature_extractor import extract_voice_features
+from app.services.pitch_analyzer import PitchTrack, get_pitch_estimator, track_pitch
+from app.services import temporal_analyzer
+from app.services.temporal_analyzer import (
+    chunk_bounds,
+    consistency_verdict,
+    pitch_temporal_consistency,
+    pitch_temporal_profile,
+)
+
+SR = 16000
+
+
+def _vibrato_tone(seconds=3.5, f=180.0):
+    """Voiced test signal with slow pitch modulation."""
+    t = np.arange(int(seconds * SR)) / SR
+    phase = 2 * np.pi * (f * t + 4.0 * np.sin(2 * np.pi * 0.7 * t))
+    return (0.3 * np.sin(phase)).astype(np.float32)
+
+
+def test_pitch_variance_matches_direct_pyin():
+    """Shared track gives the same pitch_variance as the original pyin call."""
+    y = _vibrato_tone()
+    f0, _, _ = librosa.pyin(
+        y, fmin=librosa.note_to_hz("C2"), fmax=librosa.note_to_hz("C7"), sr=SR
+    )
+    vals = f0[~np.isnan(f0)]
+    expected = round(float(np.var(vals)), 6)
+
+    features = extract_voice_features(y, SR, pitch_track=track_pitch(y, SR))
+    assert features["pitch_variance"] == expected
+
+
+def test_slice_samples_uses_frame_centres():
+    """Frames are assigned to the chunk containing their centre sample."""
+    track = PitchTrack(np.arange(10, dtype=float), SR, hop_length=100)
+    assert list(track.slice_samples(0, 300)) == [0, 1, 2]
+    assert list(track.slice_samples(250, 500)) == [3, 4]
+
+
+def test_analyze_audio_runs_pyin_once(monkeypatch):
+    """Features and temporal consistency share one pyin pass."""
+    y = _vibrato_tone()
+    calls = []
+    real_pyin = librosa.pyin
+
+    def counting_pyin(*args, **kwargs):
+        calls.append(1)
+        return real_pyin(*args, **kwargs)
+
+    monkeypatch.setattr(pitch_analyzer.librosa, "pyin", counting_pyin)
+    monkeypatch.setattr(audio_analyzer, "decode_audio", lambda *a, **k: (y, SR, "fake"))
+
+    result = audio_analyzer.analyze_audio("AAAA", "English")
+
+    assert len(calls) == 1
+    assert result["features"]["pitch_consistency"] in ("CONSISTENT", "INCONSISTENT")
+
+
+def test_consistency_inconclusive_for_short_clip():
+    assert pitch_temporal_consistency(_vibrato_tone(seconds=1.0), SR) == "INCONCLUSIVE"
+
+
+def test_chunk_bounds_overlap():
+    # The 200-sample tail is not longer than half a chunk, so it is dropped
+    assert chunk_bounds(1000, 100, chunk_sec=4) == [(0, 400), (400, 800)]
+    assert chunk_bounds(1000, 100, chunk_sec=4, overlap=0.5) == [(0, 400), (200, 600), (400, 800), (600, 1000)]
+    with pytest.raises(ValueError):
+        chunk_bounds(1000, 100, chunk_sec=4, overlap=1.0)
+
+
+def test_consistency_verdict():
+    assert consistency_verdict([0.01]) == "INCONCLUSIVE"
+    assert consistency_verdict([0.01, 0.01, 0.01, None]) == "CONSISTENT"
+    assert consistency_verdict([0.01, 0.01, 5.0, None]) == "INCONSISTENT"
+    assert consistency_verdict([None, None]) == "INCONSISTENT"
+
+
+def test_profile_agrees_with_verdict():
+    y = _vibrato_tone(seconds=6.0)
+    track = track_pitch(y, SR, backend="yin")
+    for overlap in (0.0, 0.5):
+        profile = pitch_temporal_profile(y, SR, pitch_track=track, overlap=overlap)
+        assert profile["verdict"] == pitch_temporal_consistency(y, SR, pitch_track=track, overlap=overlap)
+        assert len(profile["chunks"]) == len(chunk_bounds(len(y), SR, overlap=overlap))
+        assert profile["chunks"][0]["start"] == 0.0
+
+
+def test_consistency_stops_once_verdict_is_settled(monkeypatch):
+    # Flat pitch everywhere: CONSISTENT is certain after 3 of 4 chunks
+    track = PitchTrack(np.full(1 + 6 * SR // 512, 150.0), SR, hop_length=512)
+    seen = []
+    real = temporal_analyzer._chunk_variance
+
+    def counting(*args):
+        seen.append(1)
+        return real(*args)
+
+    monkeypatch.setattr(temporal_analyzer, "_chunk_variance", counting)
+    assert pitch_temporal_consistency(np.zeros(6 * SR), SR, chunk_sec=1.5, pitch_track=track) == "CONSISTENT"
+    assert len(seen) == 3
+
+
+def test_analysis_uses_the_early_exit_unless_the_profile_is_enabled(monkeypatch):
+    track = PitchTrack(np.full(1 + 6 * SR // 512, 150.0), SR, hop_length=512)
+    seen = []
+    real = temporal_analyzer._chunk_variance
+    monkeypatch.setattr(temporal_analyzer, "_chunk_variance", lambda *args: seen.append(1) or real(*args))
+    monkeypatch.setattr(audio_analyzer.settings, "TEMPORAL_CHUNK_SEC", 1.5)
+    monkeypatch.setattr(audio_analyzer.settings, "TEMPORAL_CHUNK_OVERLAP", 0.0)
+
+    features = {}
+    audio_analyzer._add_temporal_profile(features, np.zeros(6 * SR), SR, track)
+    assert features == {"pitch_consistency": "CONSISTENT"}
+    assert len(seen) == 3
+
+    monkeypatch.setattr(audio_analyzer.settings, "PITCH_PROFILE_ENABLED", True)
+    seen.clear()
+    audio_analyzer._add_temporal_profile(features, np.zeros(6 * SR), SR, track)
+    assert features["pitch_consistency"] == "CONSISTENT"
+    assert len(features["pitch_profile"]) == len(seen) == 4
+
+
+@pytest.mark.parametrize("backend", ["pyin", "pyin_speech", "yin"])
+def test_backends_share_pyin_frame_grid(backend):
+    """Every backend returns one F0 per pyin frame and tracks a steady tone."""
+    t = np.arange(int(1.0 * SR)) / SR
+    y = (0.3 * np.sin(2 * np.pi * 200.0 * t)).astype(np.float32)
+
+    f0 = get_pitch_estimator(backend).estimate(y, SR)
+    assert len(f0) == 1 + len(y) // pitch_analyzer.PYIN_HOP_LENGTH
+
+    voiced = f0[~np.isnan(f0)]
+    assert voiced.size > 0.8 * len(f0)
+    assert np.median(voiced) == pytest.approx(200.0, rel=0.02)
+
+
+def test_yin_marks_silence_unvoiced():
+    f0 = get_pitch_estimator("yin").estimate(np.zeros(SR, dtype=np.float32), SR)
+    assert np.isnan(f0).all()
+
+
+def test_backend_selected_from_settings(monkeypatch):
+    monkeypatch.setattr(pitch_analyzer.settings, "PITCH_BACKEND", "yin")
+    assert get_pitch_estimator().name == "yin"
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        get_pitch_estimator("crepe")
+
+
+def test_estimator_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        pitch_analyzer.PitchEstimator()
@@ -0,0 +1,97 @@
+import base64
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.config import settings
+from app.main import app
+from app.services import request_body
+from app.services.request_body import RequestBodyError, parse_voice_request
+from benchmarks.request_parsing import CASES, make_body
+
+AUDIO = bytes(range(256)) * 40
+AUDIO_BASE64 = base64.b64encode(AUDIO).decode()
+
+
+def _body(**fields):
+    return json.dumps({"language": "English", "audioFormat": "mp3", "audioBase64": AUDIO_BASE64, **fields}).encode()
+
+
+def test_fast_path_decodes_in_place():
+    raw = b'{ "audioBase64" : "' + AUDIO_BASE64.encode() + b'", "language": "Tamil", "audioFormat": "MP3"}'
+    doc, view = request_body._parse_fast(raw)
+    assert isinstance(view, memoryview) and view.obj is raw
+    assert parse_voice_request(raw) == {"language": "Tamil", "audioFormat": "MP3", "audio": AUDIO}
+
+
+@pytest.mark.parametrize("raw", [
+    # Escaped characters in the value: JSON-escaped slashes, line-wrapped base64
+    _body(audioBase64=AUDIO_BASE64).replace(b"/", b"\\/"),
+    _body(audioBase64=base64.encodebytes(AUDIO).decode()),
+    # Nested or repeated keys: the top-level, last value wins like json.loads
+    _body(meta={"audioBase64": "QUJD"}),
+    json.dumps({"audioBase64": "QUJD", "language": "English", "audioFormat": "mp3"})[:-1].encode()
+    + b', "audioBase64": "' + AUDIO_BASE64.encode() + b'"}',
+])
+def test_unusual_bodies_fall_back_to_full_parse(raw):
+    assert request_body._parse_fast(raw) == (None, None)
+    assert parse_voice_request(raw)["audio"] == AUDIO
+
+
+@pytest.mark.parametrize("raw, message", [
+    (b'{"language": "English", "audioFormat": "mp3", "audioBase64": "QUJD"', "Malformed JSON"),
+    (b'["QUJD"]', "JSON object"),
+    (json.dumps({"audioFormat": "mp3", "audioBase64": "QUJD"}).encode(), "language"),
+    (_body(audioFormat=3), "audioFormat"),
+    (_body(audioBase64=None), "audioBase64"),
+    (_body(audioBase64="QUJDR"), "not valid base64"),
+    # a2b_base64 would skip the "!!" and return b"Hello"
+    (_body(audioBase64="SGVs!!bG8="), "not valid base64"),
+])
+def test_malformed_bodies(raw, message):
+    with pytest.raises(RequestBodyError, match=message):
+        parse_voice_request(raw)
+
+
+def test_route_sends_decoded_bytes_to_the_pool(stub_pool, post_voice):
+    calls = stub_pool()
+    assert post_voice(AUDIO).status_code == 200
+    assert [(fn.__name__, args) for fn, args in calls] == [("analyze_audio_bytes_job", (AUDIO, "English", "mp3"))]
+
+    client = TestClient(app)
+    headers = {"x-api-key": settings.API_KEY, "content-type": "application/json"}
+    response = client.post("/api/voice-detection", content=b'{"language": "English"', headers=headers)
+    assert response.status_code == 422 and response.json()["status"] == "error"
+    assert client.post("/api/voice-detection", content=_body(audioBase64="  "), headers=headers).status_code == 400
+    # API key is checked before the body is read
+    assert client.post("/api/voice-detection", content=b"not json").status_code == 401
+
+
+def test_request_parsing_benchmark_cases_agree():
+    raw = make_body(0.05)
+    expected = base64.b64decode(json.loads(raw)["audioBase64"])
+    assert [fn(raw) for fn in CASES.values()] == [expected, expected]
+
+
+def test_oversized_body_is_refused_before_parsing(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_AUDIO_BYTES", 1000)
+    monkeypatch.setattr(routes, "read_voice_request", lambda raw: pytest.fail("body was parsed"))
+    client = TestClient(app)
+    headers = {"x-api-key": settings.API_KEY, "content-type": "application/json"}
+    big = _body(audioBase64=base64.b64encode(AUDIO * 10).decode())
+    assert client.post("/api/voice-detection", content=big, headers=headers).status_code == 413
+
+    # Without a Content-Length the streamed body is cut off at the cap
+    def chunked():
+        for start in range(0, len(big), 8192):
+            yield big[start:start + 8192]
+    assert client.post("/api/voice-detection", content=chunked(), headers=headers).status_code == 413
+
+
+def test_admission_runs_before_the_decode(monkeypatch, post_voice):
+    monkeypatch.setattr(settings, "MAX_AUDIO_BYTES", len(AUDIO) - 1)
+    monkeypatch.setattr(routes, "decode_audio_base64", lambda audio: pytest.fail("audio was decoded"))
+    # Within the body cap, over the audio limit: refused from the base64 length alone
+    assert post_voice(AUDIO).status_code == 413
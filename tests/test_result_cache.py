@@ -0,0 +1,104 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.config import settings
+from app.main import app
+from app.services import result_cache as cache_module
+from app.services.result_cache import (
+    MemoryResultCache,
+    SqliteResultCache,
+    audio_digest,
+    make_cache_key,
+)
+
+RESULT = {
+    "status": "success",
+    "language": "English",
+    "classification": "HUMAN",
+    "confidenceScore": 0.8,
+    "explanation": "uniform speech rhythm"
+}
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryResultCache(max_entries=2, max_bytes=10_000, ttl_seconds=60)
+    cache.set("a", RESULT)
+    cache.set("b", RESULT)
+    cache.get("a")
+    cache.set("c", RESULT)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == RESULT
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_memory_cache_respects_ttl_and_size_limit():
+    cache = MemoryResultCache(max_entries=10, max_bytes=300, ttl_seconds=0.01)
+    cache.set("a", RESULT)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+    cache.ttl_seconds = 60
+    for key in "abcd":
+        cache.set(key, RESULT)
+    assert cache.stats()["bytes"] <= 300
+    assert cache.get("d") == RESULT
+
+
+def test_sqlite_cache_survives_restart(tmp_path):
+    path = str(tmp_path / "results.sqlite3")
+    SqliteResultCache(path, max_entries=10, max_bytes=10_000, ttl_seconds=60).set("k", RESULT)
+
+    reopened = SqliteResultCache(path, max_entries=10, max_bytes=10_000, ttl_seconds=60)
+    assert reopened.get("k") == RESULT
+    assert reopened.stats()["entries"] == 1
+
+
+def test_sqlite_cache_evicts_to_entry_limit(tmp_path):
+    cache = SqliteResultCache(str(tmp_path / "r.sqlite3"), max_entries=3, max_bytes=10_000, ttl_seconds=60)
+    for i in range(5):
+        cache.set(f"k{i}", RESULT)
+    assert cache.stats()["entries"] <= 3
+    assert cache.get("k4") == RESULT
+
+
+def test_cache_key_tracks_language_and_version(monkeypatch):
+    digest = audio_digest(b"audio")
+    key = make_cache_key(digest, "english")
+    assert key == make_cache_key(digest, "English")
+    assert key != make_cache_key(digest, "Tamil")
+    assert key != make_cache_key(audio_digest(b"other audio"), "English")
+
+    monkeypatch.setattr(cache_module, "FEATURE_PIPELINE_VERSION", "next")
+    assert key != make_cache_key(digest, "English")
+
+
+def test_cache_key_tracks_feature_settings(monkeypatch):
+    digest = audio_digest(b"audio")
+    keys = {make_cache_key(digest, "English")}
+    for name, value in (("VAD_RMS_THRESHOLD", 0.02), ("VAD_HANGOVER_MS", 100.0), ("VAD_ZCR_MAX", 0.3),
+                        ("PITCH_BACKEND", "yin"), ("VAD_ENABLED", False)):
+        monkeypatch.setattr(settings, name, value)
+        keys.add(make_cache_key(digest, "English"))
+    assert len(keys) == 6
+
+
+def test_voice_detection_serves_repeat_from_cache(stub_pool, post_voice):
+    calls = stub_pool({"result": RESULT, "features": {"pitch_variance": 1.0}})
+
+    first = post_voice(b"same clip")
+    second = post_voice(b"same clip")
+
+    assert first.json() == second.json() == {**RESULT, "analysisTier": "full"}
+    assert len(calls) == 1
+    stats = TestClient(app).get("/api/cache/stats", headers={"x-api-key": settings.API_KEY})
+    assert stats.json()["hits"] == 1
+
+
+def test_fallback_results_are_not_cached(stub_pool, post_voice):
+    stub_pool({"result": RESULT, "features": None})
+    post_voice(b"undecodable")
+    assert routes.result_cache.stats()["entries"] == 0
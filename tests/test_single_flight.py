@@ -0,0 +1,102 @@
+import asyncio
+import base64
+
+import httpx
+import pytest
+
+from app.api import routes
+from app.config import settings
+from app.main import app
+from app.services.single_flight import SingleFlight
+from tests.conftest import VOICE_RESULT
+
+
+def test_concurrent_calls_share_one_computation():
+    flight = SingleFlight()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"n": len(calls)}
+
+    async def main():
+        results = await asyncio.gather(*(flight.run("k", compute) for _ in range(5)))
+        other = await flight.run("other", compute)
+        return results, other
+
+    results, other = asyncio.run(main())
+    assert results == [{"n": 1}] * 5
+    assert other == {"n": 2}
+    assert flight.stats() == {"in_flight": 0, "leaders": 2, "coalesced": 4}
+
+
+def test_none_key_is_never_coalesced():
+    flight = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        return 1
+
+    async def main():
+        return await asyncio.gather(flight.run(None, compute), flight.run(None, compute))
+
+    assert asyncio.run(main()) == [1, 1]
+    assert flight.stats()["coalesced"] == 0
+
+
+def test_errors_reach_every_caller():
+    flight = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(*(flight.run("k", compute) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in asyncio.run(main()))
+    assert flight.in_flight == 0
+
+
+def test_cancelled_caller_does_not_cancel_shared_work():
+    flight = SingleFlight()
+    finished = []
+
+    async def compute():
+        await asyncio.sleep(0.05)
+        finished.append(1)
+        return "done"
+
+    async def main():
+        leader = asyncio.ensure_future(flight.run("k", compute))
+        follower = asyncio.ensure_future(flight.run("k", compute))
+        await asyncio.sleep(0.01)
+        leader.cancel()  # the original client disconnects
+        result = await follower
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return result
+
+    assert asyncio.run(main()) == "done"
+    assert finished == [1]
+
+
+def test_route_coalesces_retries(monkeypatch, stub_pool):
+    calls = stub_pool({"result": VOICE_RESULT, "features": {"pitch_variance": 1.0}}, delay=0.1)
+    monkeypatch.setattr(routes, "single_flight", SingleFlight())
+    payload = {"language": "English", "audioFormat": "mp3",
+               "audioBase64": base64.b64encode(b"retried clip").decode()}
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(
+                client.post("/api/voice-detection", json=payload, headers={"x-api-key": settings.API_KEY})
+                for _ in range(4)
+            ))
+
+    responses = asyncio.run(main())
+    assert [r.json() for r in responses] == [{**VOICE_RESULT, "analysisTier": "full"}] * 4
+    assert len(calls) == 1
+    assert routes.single_flight.stats()["coalesced"] == 3
@@ -0,0 +1,34 @@
+import librosa
+import numpy as np
+import pytest
+
+from app.services.spectral import SpectralContext, dct_matrix, mel_basis
+from benchmarks.synthetic import SR, noise_bursts, speech_like
+
+
+@pytest.mark.parametrize("y", [speech_like(3.1, seed=11)[0], noise_bursts(2.7)[0]])
+def test_shared_spectrum_matches_librosa(y):
+    spectral = SpectralContext(y, SR)
+
+    np.testing.assert_allclose(spectral.rms, librosa.feature.rms(y=y)[0], atol=1e-6)
+    np.testing.assert_allclose(
+        spectral.onset_envelope, librosa.onset.onset_strength(y=y, sr=SR), rtol=1e-4, atol=1e-4
+    )
+    np.testing.assert_allclose(
+        spectral.mfcc, librosa.feature.mfcc(y=y, sr=SR, n_mfcc=13), rtol=1e-4, atol=1e-3
+    )
+    assert spectral.mel.dtype == np.float32
+
+
+def test_filterbanks_are_cached_and_read_only():
+    assert mel_basis(SR) is mel_basis(SR)
+    assert dct_matrix() is dct_matrix()
+    with pytest.raises(ValueError):
+        mel_basis(SR)[0, 0] = 1.0
+
+
+def test_batch_context_matches_single_clips():
+    ys = np.stack([speech_like(1.0, seed=s)[0] for s in (1, 2)])
+    batch = SpectralContext(ys, SR)
+    for i, y in enumerate(ys):
+        np.testing.assert_allclose(batch.mel[i], SpectralContext(y, SR).mel, rtol=1e-5)
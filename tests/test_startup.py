@@ -0,0 +1,59 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import warmup
+from app.services.warmup import Readiness
+from benchmarks.import_time import measure
+
+
+def test_importing_app_defers_heavy_modules():
+    _, loaded, _ = measure("app.main")
+    assert loaded == []
+
+
+def test_ready_turns_200_after_warm_up(monkeypatch):
+    state = Readiness()
+    monkeypatch.setattr(warmup.settings, "ANALYSIS_WARMUP", False)
+    monkeypatch.setattr("app.main.readiness", state)
+    client = TestClient(app)
+
+    assert client.get("/health").status_code == 200
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+    class FakeExecutor:
+        async def start_workers(self):
+            pass
+
+    asyncio.run(state.warm_up(FakeExecutor()))
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert set(response.json()["steps"]) == {"imports", "workers"}
+
+
+def test_prejit_runs_the_pipeline(monkeypatch):
+    import librosa.sequence
+    from app.services import feature_extractor, pitch_analyzer, stream_extractor
+
+    monkeypatch.setattr(pitch_analyzer.settings, "PITCH_BACKEND", "pyin")
+    ran = []
+
+    def spy(name, fn):
+        def wrapper(*args, **kwargs):
+            ran.append(name)
+            return fn(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(pitch_analyzer, "track_pitch", spy("pitch", pitch_analyzer.track_pitch))
+    monkeypatch.setattr(feature_extractor, "extract_voice_features",
+                        spy("features", feature_extractor.extract_voice_features))
+    finalize = stream_extractor.StreamingFeatureExtractor.finalize
+    monkeypatch.setattr(stream_extractor.StreamingFeatureExtractor, "finalize", spy("stream", finalize))
+
+    warmup.prejit()
+    assert ran == ["pitch", "features", "stream"]
+    # pyin's Viterbi decoder has a compiled specialization afterwards
+    assert librosa.sequence._viterbi.signatures
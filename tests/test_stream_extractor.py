@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.services.audio_decoder import decode_audio, iter_decoded_blocks
+from app.services.feature_extractor import extract_voice_features
+from app.services.pitch_analyzer import track_pitch
+from app.services.result_cache import audio_digest, make_cache_key, result_cache
+from app.services.stream_extractor import RunningStats, StreamingFeatureExtractor
+from app.services.temporal_analyzer import pitch_temporal_consistency
+from benchmarks.synthetic import SR, noise_bursts, speech_like
+
+def test_running_stats_matches_numpy():
+    values = np.random.default_rng(0).normal(3.0, 2.0, 1000)
+    stats = RunningStats()
+    for part in np.array_split(values, 7):
+        stats.push(part)
+    assert stats.count == 1000
+    assert stats.variance == pytest.approx(np.var(values))
+
+
+@pytest.mark.parametrize("y", [speech_like(7.3, seed=5)[0], noise_bursts(5.1)[0]])
+def test_streaming_matches_whole_clip(y):
+    """Block-by-block extraction reproduces the whole-clip features."""
+    track = track_pitch(y, SR, backend="yin")
+    expected = extract_voice_features(y, SR, pitch_track=track)
+    expected["pitch_consistency"] = pitch_temporal_consistency(y, SR, pitch_track=track)
+
+    extractor = StreamingFeatureExtractor(SR, block_frames=64, pitch_backend="yin")
+    for start in range(0, len(y), 7000):
+        extractor.push(y[start:start + 7000])
+    streamed = extractor.finalize()
+
+    assert streamed.keys() == expected.keys()
+    for name, value in expected.items():
+        if name == "pitch_consistency":
+            assert streamed[name] == value
+        else:
+            assert streamed[name] == pytest.approx(value, abs=1e-3)
+
+
+def test_iter_decoded_blocks_matches_whole_decode(sample_mp3, sample_bytes):
+    y, _, _ = decode_audio(sample_bytes)
+    streamed = np.concatenate(list(iter_decoded_blocks(sample_mp3, block_frames=4096)))
+    assert len(streamed) == pytest.approx(len(y), abs=2)
+    n = min(len(y), len(streamed))
+    assert np.max(np.abs(streamed[:n] - y[:n])) < 1e-3
+
+
+def test_stream_endpoint_accepts_raw_mp3(stub_pool, sample_bytes):
+    stub_pool(inline=True)
+    response = TestClient(app).post(
+        "/api/voice-detection/stream?language=English",
+        content=sample_bytes,
+        headers={"x-api-key": settings.API_KEY, "content-type": "audio/mpeg"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["X-Audio-Decoder"] == "soundfile-stream"
+    assert response.headers["X-Analysis-Tier"] == "full" and response.json()["analysisTier"] == "full"
+    assert response.json()["classification"] in ("HUMAN", "AI_GENERATED")
+    # Same digest as the base64 route, so both share cache entries
+    assert result_cache.get(make_cache_key(audio_digest(sample_bytes), "English")) is not None
+
+
+def test_stream_endpoint_accepts_multipart(stub_pool, sample_bytes):
+    stub_pool(inline=True)
+    response = TestClient(app).post(
+        "/api/voice-detection/stream",
+        data={"language": "Tamil", "audioFormat": "mp3"},
+        files={"audio": ("clip.mp3", sample_bytes, "audio/mpeg")},
+        headers={"x-api-key": settings.API_KEY}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["language"] == "Tamil"
+
+
+def test_stream_endpoint_rejects_oversized_and_unsupported(monkeypatch):
+    monkeypatch.setattr(settings, "STREAM_MAX_BYTES", 10)
+    client = TestClient(app)
+    headers = {"x-api-key": settings.API_KEY}
+
+    response = client.post(
+        "/api/voice-detection/stream?language=English",
+        content=b"x" * 11,
+        headers={**headers, "content-type": "audio/mpeg"}
+    )
+    assert response.status_code == 413
+
+    response = client.post(
+        "/api/voice-detection/stream?language=English",
+        json={"audio": "x"},
+        headers=headers
+    )
+    assert response.status_code == 415
+
+
+def test_stream_endpoint_limits_multipart_while_streaming(monkeypatch):
+    monkeypatch.setattr(settings, "STREAM_MAX_BYTES", 10)
+    client = TestClient(app)
+    headers = {"x-api-key": settings.API_KEY}
+
+    response = client.post(
+        "/api/voice-detection/stream",
+        data={"language": "English", "audioFormat": "mp3"},
+        files={"audio": ("clip.mp3", b"x" * 11, "audio/mpeg")},
+        headers=headers
+    )
+    assert response.status_code == 413
+
+    response = client.post(
+        "/api/voice-detection/stream",
+        data={"language": "English", "audioFormat": "mp3"},
+        files={"other": ("clip.mp3", b"x" * 5, "audio/mpeg")},
+        headers=headers
+    )
+    assert response.status_code == 400
+    assert "audio" in response.json()["message"]
+
+    response = client.post(
+        "/api/voice-detection/stream",
+        data={"language": "Klingon", "audioFormat": "mp3"},
+        files={"audio": ("clip.mp3", b"x" * 5, "audio/mpeg")},
+        headers=headers
+    )
+    assert response.status_code == 400
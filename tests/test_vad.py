@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services.feature_extractor import extract_voice_features, extract_voice_features_batch
+from app.services.pitch_analyzer import track_pitch
+from app.services.stream_extractor import StreamingFeatureExtractor
+from app.services.vad import apply_hangover, voice_activity, voiced_runs
+from benchmarks.synthetic import HOP_LENGTH, SR, silence_heavy, speech_like
+
+
+def test_hangover_is_causal():
+    active = np.array([0, 1, 0, 0, 0, 0, 1, 0], dtype=bool)
+    assert apply_hangover(active, 2).astype(int).tolist() == [0, 1, 1, 1, 0, 0, 1, 1]
+    assert apply_hangover(active, 0).tolist() == active.tolist()
+
+
+def test_voiced_runs():
+    voiced = np.array([1, 1, 0, 0, 1, 0, 1], dtype=bool)
+    assert voiced_runs(voiced) == [(0, 2), (4, 5), (6, 7)]
+    assert voiced_runs(np.zeros(4, dtype=bool)) == []
+    assert voiced_runs(voiced, min_gap=2) == [(0, 2), (4, 7)]
+    assert voiced_runs(voiced, min_gap=3) == [(0, 7)]
+
+
+def test_silence_is_not_voiced(monkeypatch):
+    y, truth = silence_heavy(6.0, 0.5)
+    voiced = voice_activity(y, SR)
+    assert voiced[~np.isnan(truth)].all()
+    # Room tone past the hangover, away from the frames that reach into speech
+    t = np.arange(len(voiced)) * HOP_LENGTH / SR % 3.0
+    assert not voiced[(t > 1.5 + settings.VAD_HANGOVER_MS / 1000 + 0.1) & (t < 2.9)].any()
+
+    monkeypatch.setattr(settings, "VAD_ENABLED", False)
+    assert voice_activity(y, SR) is None
+
+
+def test_zero_crossing_cap_drops_hiss(monkeypatch):
+    hiss = np.random.default_rng(0).normal(0, 0.1, SR).astype(np.float32)
+    assert voice_activity(hiss, SR).all()
+    monkeypatch.setattr(settings, "VAD_ZCR_MAX", 0.3)
+    # Edge frames are half zero padding (fewer crossings); hangover follows them
+    assert not voice_activity(hiss, SR)[12:-4].any()
+    assert voice_activity(speech_like(1.0, pause_every=0.0)[0], SR).all()
+
+
+def test_gated_pitch_track_matches_whole_clip_on_voiced_frames(monkeypatch):
+    y = silence_heavy(6.0, 0.5)[0]
+    gated = track_pitch(y, SR, backend="yin")
+    voiced = voice_activity(y, SR)
+    monkeypatch.setattr(settings, "VAD_ENABLED", False)
+    full = track_pitch(y, SR, backend="yin")
+
+    np.testing.assert_array_equal(gated.f0[voiced], full.f0[voiced])
+    assert np.isnan(gated.f0[~voiced]).all()
+
+
+def test_pause_ratio_keeps_the_full_timeline(monkeypatch):
+    y = silence_heavy(6.0, 0.5)[0]
+    gated = extract_voice_features(y, SR)
+    monkeypatch.setattr(settings, "VAD_ENABLED", False)
+    ungated = extract_voice_features(y, SR)
+
+    assert gated["pause_ratio"] == ungated["pause_ratio"] > 0.4
+    # Silence no longer dilutes the onset envelope or smooths the MFCC track
+    assert gated["rhythm_variance"] > ungated["rhythm_variance"]
+    assert gated["spectral_smoothness"] < ungated["spectral_smoothness"]
+
+
+def test_all_silent_clip():
+    y = np.zeros(SR * 2, dtype=np.float32)
+    features = extract_voice_features(y, SR)
+    assert features["pause_ratio"] == 1.0
+    assert features["pitch_variance"] == features["rhythm_variance"] == features["spectral_smoothness"] == 0.0
+    assert extract_voice_features_batch([y], SR) == [features]
+
+
+def test_batch_and_streaming_match_gated_whole_clip():
+    ys = [silence_heavy(4.0, 0.6)[0], silence_heavy(4.5, 0.3, seed=3)[0]]
+    expected = [extract_voice_features(y, SR, pitch_track=track_pitch(y, SR, backend="yin")) for y in ys]
+    tracks = [track_pitch(y, SR, backend="yin") for y in ys]
+    assert extract_voice_features_batch(ys, SR, pitch_tracks=tracks) == expected
+
+    for y, features in zip(ys, expected):
+        extractor = StreamingFeatureExtractor(SR, block_frames=32, pitch_backend="yin")
+        for start in range(0, len(y), 5000):
+            extractor.push(y[start:start + 5000])
+        streamed = extractor.finalize()
+        for name, value in features.items():
+            assert streamed[name] == pytest.approx(value, abs=1e-3)
+
+
+def test_analysis_frames_the_clip_once(monkeypatch):
+    from app.services import audio_analyzer, spectral
+
+    y, _ = silence_heavy(4.0)
+    monkeypatch.setattr(audio_analyzer, "decode_audio", lambda *args, **kwargs: (y, SR, "soundfile"))
+    calls = []
+    frame_signal = spectral.frame_signal
+    monkeypatch.setattr(spectral, "frame_signal", lambda *args: calls.append(1) or frame_signal(*args))
+
+    analysis = audio_analyzer.analyze_audio_bytes(b"not sniffed", "English")
+    assert len(calls) == 1
+    assert analysis["features"] == pytest.approx({
+        **extract_voice_features(y, SR, pitch_track=track_pitch(y, SR, voiced=voice_activity(y, SR))),
+        "pitch_consistency": analysis["features"]["pitch_consistency"],
+    })